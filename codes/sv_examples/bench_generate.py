@@ -0,0 +1,167 @@
+"""
+Benchmark generate_pptx.build() across output writers, build profiles and
+the HTML preview backend
+
+Each configuration runs in a fresh process so peak RSS is measured per
+build. --repeat concatenates copies of the deck to model large decks, and
+--sweep reports peak RSS against slide count with and without chunking.
+--bullets times the outline parser on every bullet of the deck against
+the per-bullet re.match classification it replaced.
+
+Usage:
+    python bench_generate.py
+    python bench_generate.py --repeat 10
+    python bench_generate.py --sweep 1,2,4,8 --chunk-size 20
+    python bench_generate.py --bullets
+"""
+
+import os
+import re
+import time
+import resource
+import argparse
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# (writer, profile, pipeline); writer "html" is the html_preview backend
+CONFIGS = [
+    ("python-pptx", "default", False),
+    ("stream", "draft", False),
+    ("stream", "default", False),
+    ("stream", "default", True),
+    ("stream", "release", False),
+    ("html", "default", False),
+]
+
+
+def _measure(writer, profile, repeat, chunk_size, pipeline, out):
+    import generate_pptx
+
+    t0 = time.perf_counter()
+    if writer == "html":
+        import html_preview
+        slides = html_preview.build(out, profile=profile, repeat=repeat)
+    else:
+        slides = generate_pptx.build(out, profile=profile, writer=writer,
+                                     repeat=repeat, chunk_size=chunk_size,
+                                     pipeline=pipeline)
+    elapsed = time.perf_counter() - t0
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return slides, elapsed, peak_kb, os.path.getsize(out)
+
+
+def run(writer, profile, repeat, chunk_size=None, pipeline=False):
+    """Build once in a fresh process; return (slides, seconds, peak KB, bytes)."""
+    ctx = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        out = os.path.join(tmp, "bench.pptx")
+        with ProcessPoolExecutor(1, mp_context=ctx) as pool:
+            return pool.submit(_measure, writer, profile, repeat, chunk_size,
+                               pipeline, out).result()
+
+
+def sweep(repeats, chunk_size):
+    """Print peak RSS against slide count, whole-deck vs chunked."""
+    print(f"{'slides':>6} {'RSS full (MB)':>14} "
+          f"{f'RSS chunk={chunk_size} (MB)':>22} {'time full (s)':>14} "
+          f"{'time chunked (s)':>17}")
+    for repeat in repeats:
+        slides, t_full, full_kb, _ = run("stream", "default", repeat)
+        _, t_chunk, chunk_kb, _ = run("stream", "default", repeat, chunk_size)
+        print(f"{slides:>6} {full_kb / 1024:>14.1f} {chunk_kb / 1024:>22.1f} "
+              f"{t_full:>14.3f} {t_chunk:>17.3f}")
+
+
+def _legacy_bullet(text):
+    """The pre-outline bullet path: re.match classification plus indent check."""
+    stripped = text.lstrip()
+    indent = len(text) - len(stripped)
+    if stripped == "":
+        return None
+    is_numbered = bool(re.match(r'^\d+\.', stripped))
+    is_section_num = bool(re.match(r'^\d+\.\d+', stripped))
+    is_sub = indent >= 4
+    style = ("numbered" if is_numbered else "section" if is_section_num
+             else "sub" if is_sub else "plain")
+    is_sub = stripped != text and (len(text) - len(text.lstrip())) >= 4
+    return stripped, style, is_sub
+
+
+class _BulletCollector:
+    def __init__(self):
+        self.slides = []
+
+    def add_bullet_slide(self, title, bullets, slide_num, code_spans=False):
+        self.slides.append((bullets, code_spans))
+
+    def __getattr__(self, name):
+        if name.startswith("add_"):
+            return lambda *args, **kwargs: None
+        raise AttributeError(name)
+
+
+def bench_bullets(rounds=200):
+    """Print per-bullet parse times: legacy path, outline cold and warm cache."""
+    import generate_pptx
+
+    deck = _BulletCollector()
+    generate_pptx.build_deck(deck)
+    bullets = [b for slide, _ in deck.slides for b in slide]
+    n = len(bullets) * rounds
+
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        for b in bullets:
+            _legacy_bullet(b)
+    legacy = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        generate_pptx.parse_bullet.cache_clear()
+        for slide, code_spans in deck.slides:
+            generate_pptx.parse_outline(slide, code_spans=code_spans)
+    cold = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        for slide, code_spans in deck.slides:
+            generate_pptx.parse_outline(slide, code_spans=code_spans)
+    warm = time.perf_counter() - t0
+
+    print(f"{len(bullets)} bullets x {rounds} rounds")
+    for label, seconds in (("legacy re.match", legacy), ("outline (cold)", cold),
+                           ("outline (cached)", warm)):
+        print(f"{label:<18} {seconds * 1e9 / n:>8.0f} ns/bullet")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="copies of the deck to concatenate")
+    parser.add_argument("--sweep", default=None,
+                        help="comma-separated --repeat values for a memory sweep")
+    parser.add_argument("--chunk-size", type=int, default=20)
+    parser.add_argument("--bullets", action="store_true",
+                        help="benchmark bullet parsing instead of whole builds")
+    args = parser.parse_args()
+
+    if args.bullets:
+        bench_bullets()
+        return
+
+    if args.sweep:
+        sweep([int(r) for r in args.sweep.split(",")], args.chunk_size)
+        return
+
+    print(f"{'writer':<12} {'profile':<8} {'pipeline':<8} {'slides':>6} "
+          f"{'time (s)':>9} {'peak RSS (MB)':>14} {'size (KB)':>10}")
+    for writer, profile, pipeline in CONFIGS:
+        slides, elapsed, peak_kb, size = run(writer, profile, args.repeat,
+                                             pipeline=pipeline)
+        print(f"{writer:<12} {profile:<8} {str(pipeline):<8} {slides:>6} "
+              f"{elapsed:>9.3f} {peak_kb / 1024:>14.1f} {size / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
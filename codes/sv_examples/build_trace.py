@@ -0,0 +1,165 @@
+"""
+Span tracing across build processes, merged into one Chrome trace
+
+With tracing started, span() records a complete event (name, category,
+start, duration, pid, thread) into a per-process buffer; with it off,
+span() costs one global check. Worker processes (slide_pipeline layout,
+verify_outputs simulations, grade_decks renders) inherit the spool
+directory through SV_TRACE_DIR and append their buffer to their own
+<pid>.jsonl file there after each task. finish() merges the spool with
+the parent's buffer into one Chrome trace JSON, which chrome://tracing
+and https://ui.perfetto.dev open directly: one track per process and
+thread, so idle workers, queue stalls ("wait" spans) and the critical
+path of the main process show up on a shared timeline.
+
+Timestamps come from time.perf_counter_ns(), a system-wide monotonic
+clock on Linux, Windows and macOS, so spans from different processes
+line up without any clock exchange.
+
+Usage:
+    python generate_pptx.py --pipeline --verify model --trace build.trace.json
+
+    build_trace.start()
+    with build_trace.span("layout", cat="worker", slide=12):
+        ...
+    build_trace.finish("build.trace.json")
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import functools
+import threading
+from contextlib import contextmanager
+
+ENV_VAR = "SV_TRACE_DIR"
+
+# Spool directory while tracing; a worker started during a traced build
+# gets it from the environment.
+_SPOOL = os.environ.get(ENV_VAR)
+_EVENTS = []
+_THREADS = {}
+
+# A forked worker must not re-emit the events its parent had buffered.
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=lambda: (_EVENTS.clear(), _THREADS.clear()))
+
+
+def enabled():
+    return _SPOOL is not None
+
+
+def _now():
+    return time.perf_counter_ns() // 1000
+
+
+def _tid():
+    tid = threading.get_native_id()
+    if tid not in _THREADS:
+        _THREADS[tid] = threading.current_thread().name
+    return tid
+
+
+@contextmanager
+def span(name, cat="build", **args):
+    """Record the enclosed block as one complete ("X") event with `args`."""
+    if _SPOOL is None:
+        yield
+        return
+    start = _now()
+    try:
+        yield
+    finally:
+        _EVENTS.append({"name": name, "cat": cat, "ph": "X", "ts": start,
+                        "dur": _now() - start, "pid": os.getpid(), "tid": _tid(),
+                        "args": args})
+
+
+def counter(name, **values):
+    """Record a counter ("C") sample, e.g. a queue depth."""
+    if _SPOOL is not None:
+        _EVENTS.append({"name": name, "ph": "C", "ts": _now(), "pid": os.getpid(),
+                        "tid": _tid(), "args": values})
+
+
+def traced(name, cat="build"):
+    """Decorator form of span() for functions called once per unit of work."""
+    def wrap(fn):
+        @functools.wraps(fn)
+        def call(*args, **kwargs):
+            if _SPOOL is None:
+                return fn(*args, **kwargs)
+            with span(name, cat):
+                return fn(*args, **kwargs)
+        return call
+    return wrap
+
+
+def _metadata(pid, label):
+    events = [{"name": "process_name", "ph": "M", "pid": pid, "args": {"name": label}}]
+    for tid, thread in _THREADS.items():
+        events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                       "args": {"name": thread}})
+    return events
+
+
+def flush(label=None):
+    """Append this process's buffered events to its spool file.
+
+    Workers call this after each task; `label` names the process track
+    (default "worker <pid>").
+    """
+    if _SPOOL is None or not _EVENTS:
+        return
+    pid = os.getpid()
+    events = _EVENTS[:]
+    del _EVENTS[:len(events)]
+    events += _metadata(pid, label or f"worker {pid}")
+    with open(os.path.join(_SPOOL, f"{pid}.jsonl"), "a", encoding="utf-8") as f:
+        f.write("".join(json.dumps(e, separators=(",", ":")) + "\n" for e in events))
+
+
+def start():
+    """Start tracing this process and any worker it starts from now on."""
+    global _SPOOL
+    _SPOOL = tempfile.mkdtemp(prefix="sv_trace_")
+    os.environ[ENV_VAR] = _SPOOL
+    _EVENTS.clear()
+    _THREADS.clear()
+
+
+def finish(path):
+    """Stop tracing and write every process's spans to the Chrome trace at `path`.
+
+    Returns (event count, process count).
+    """
+    global _SPOOL
+    if _SPOOL is None:
+        return 0, 0
+    flush(os.path.basename(sys.argv[0]) or "main")
+    events, seen = [], {}
+    for name in sorted(os.listdir(_SPOOL)):
+        with open(os.path.join(_SPOOL, name), encoding="utf-8") as f:
+            for line in f:
+                event = json.loads(line)
+                if event["ph"] == "M":
+                    key = (event["name"], event["pid"], event.get("tid"))
+                    if key in seen:
+                        continue
+                    seen[key] = True
+                events.append(event)
+    shutil.rmtree(_SPOOL, ignore_errors=True)
+    os.environ.pop(ENV_VAR, None)
+    _SPOOL = None
+
+    events.sort(key=lambda e: e.get("ts", 0))
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f,
+                  separators=(",", ":"))
+    os.replace(path + ".tmp", path)
+    return (sum(e["ph"] != "M" for e in events),
+            len({e["pid"] for e in events}))
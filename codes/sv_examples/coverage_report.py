@@ -0,0 +1,518 @@
+"""
+Coverage summary slides from a Questa HTML coverage report
+
+Reads the `vcover report -html` output (../coverage/cov_html_report by
+default) without a browser:
+    global.json         field layout of the covergroup bin arrays
+    pages/gbins*.json   every coverpoint and cross with its bins
+    covsummary.html     tests, coverage by type and by design scope
+    dulist.html         coverage per design unit
+
+The .json pages are JavaScript literals. They are tokenized line by line,
+and each coverpoint is reduced to rows of a compact NumPy table (hits,
+at_least, coverpoint) as soon as it is parsed, so a report with thousands
+of bins never sits in memory as nested lists. The HTML pages go through
+an incremental HTMLParser. Parsed reports are cached by the SHA-256 of
+their files, so rebuilding the slides for an unchanged report skips the
+parse.
+
+Usage:
+    python coverage_report.py
+    python coverage_report.py ../coverage/cov_html_report --bin-charts -o Coverage.pptx
+"""
+
+import os
+import re
+import sys
+import glob
+import json
+import hashlib
+import argparse
+from html.parser import HTMLParser
+
+import numpy as np
+
+import generate_pptx as gp
+
+EXAMPLES_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_REPORT = os.path.join(EXAMPLES_DIR, "..", "coverage", "cov_html_report")
+OUTPUT_FILE = os.path.join(gp.OUTPUT_DIR, "Coverage.pptx")
+CACHE_DIR = os.path.join(gp.OUTPUT_DIR, ".coverage_cache")
+CACHE_VERSION = 1
+
+# Layout of the bin arrays when global.json does not say otherwise.
+BIN_OBJ_IDX = {"type": 0, "name": 1, "cvps": 2, "parentName": 7, "hdlPath": 9,
+               "binArr": 10, "autoBinArr": 11}
+BIN_ARR_IDX = {"type": 0, "atLeast": 1, "h": 2, "isRed": 3, "name": 4}
+POINT_KINDS = {4: "coverpoint", 5: "cross"}
+
+_JS_TOKEN_RE = re.compile(r"""
+    '(?P<sq>(?:[^'\\]|\\.)*)'
+   |"(?P<dq>(?:[^"\\]|\\.)*)"
+   |(?P<num>-?\d+(?:\.\d+)?)
+   |(?P<name>[A-Za-z_$][\w$]*)
+   |(?P<punct>[\[\]{},:=;()])
+""", re.X)
+_JS_ESCAPE_RE = re.compile(r"\\(.)")
+_JS_CONSTANTS = {"true": True, "false": False, "null": None, "undefined": None}
+
+
+def _js_tokens(lines):
+    for line in lines:
+        for m in _JS_TOKEN_RE.finditer(line):
+            kind = m.lastgroup
+            if kind in ("sq", "dq"):
+                text = m.group(kind)
+                yield "s", _JS_ESCAPE_RE.sub(r"\1", text) if "\\" in text else text
+            elif kind == "num":
+                text = m.group(kind)
+                yield "n", float(text) if "." in text else int(text)
+            elif kind == "name":
+                yield "i", m.group(kind)
+            else:
+                yield "p", m.group(kind)
+
+
+class _JsReader:
+    """Recursive-descent reader for the JavaScript literals vcover writes."""
+
+    def __init__(self, lines):
+        self._tokens = _js_tokens(lines)
+        self._peek = next(self._tokens, None)
+
+    def next(self):
+        tok = self._peek
+        self._peek = next(self._tokens, None)
+        return tok
+
+    def value(self):
+        kind, text = self.next()
+        if kind == "p" and text == "[":
+            out, expect = [], True
+            while True:
+                if self._peek == ("p", "]"):
+                    self.next()
+                    return out
+                if self._peek == ("p", ","):
+                    self.next()
+                    if expect:
+                        out.append(None)      # elision: [a,,b]
+                    expect = True
+                    continue
+                out.append(self.value())
+                expect = False
+        if kind == "p" and text == "{":
+            return dict(self.members())
+        if kind == "i":
+            return _JS_CONSTANTS.get(text, text)
+        return text
+
+    def members(self):
+        """Yield (key, value) up to the closing brace of an object."""
+        while True:
+            kind, key = self.next()
+            if (kind, key) == ("p", "}"):
+                return
+            if (kind, key) == ("p", ","):
+                continue
+            self.next()                        # ':'
+            yield key, self.value()
+
+    def assignments(self):
+        """Yield (target, key, value) for each `target = value;` statement.
+
+        Object values are yielded member by member (key is the member name),
+        so one member at a time is held in memory; other values have key None.
+        """
+        while self._peek is not None:
+            target = []
+            while self._peek is not None and self._peek[1] not in ("=", ";"):
+                target.append(str(self.next()[1]))
+            if self._peek is None:
+                return
+            if self.next()[1] == ";":
+                continue
+            target = "".join(t for t in target if t != "var")
+            if self._peek == ("p", "{"):
+                self.next()
+                for key, value in self.members():
+                    yield target, key, value
+            else:
+                yield target, None, self.value()
+
+
+def read_js(path):
+    """Return (target, key, value) for every assignment in a vcover script file."""
+    with open(path, encoding="utf-8", errors="replace") as f:
+        yield from _JsReader(f).assignments()
+
+
+def _clean(name):
+    """Drop the escaped-identifier backslash and trailing space Questa keeps."""
+    return name[1:].rstrip() if name.startswith("\\") else name
+
+
+def _percent(text):
+    text = (text or "").strip().rstrip("%")
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+class _TableScraper(HTMLParser):
+    """Collect table rows (grouped under the preceding <h3>) and script text."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.rows = []          # (heading, [(text, class), ...])
+        self.scripts = []
+        self._heading = ""
+        self._row_stack = []
+        self._cell = None
+        self._in = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "tr":
+            self._row_stack.append([])
+        elif tag in ("td", "th") and self._row_stack:
+            self._cell = ([], dict(attrs).get("class", ""), tag)
+        elif tag in ("h3", "script"):
+            self._in = (tag, [])
+
+    def handle_endtag(self, tag):
+        if tag in ("td", "th") and self._cell is not None and self._row_stack:
+            parts, cls, kind = self._cell
+            self._row_stack[-1].append(("".join(parts).strip(), cls, kind))
+            self._cell = None
+        elif tag == "tr" and self._row_stack:
+            row = self._row_stack.pop()
+            if row:
+                self.rows.append((self._heading, row))
+        elif self._in and tag == self._in[0]:
+            text = "".join(self._in[1])
+            if tag == "h3":
+                self._heading = text.strip().rstrip(":")
+            else:
+                self.scripts.append(text)
+            self._in = None
+
+    def handle_data(self, data):
+        if self._in:
+            self._in[1].append(data)
+        if self._cell is not None:
+            self._cell[0].append(data)
+
+
+def _scrape(path):
+    scraper = _TableScraper()
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for chunk in iter(lambda: f.read(1 << 16), ""):
+            scraper.feed(chunk)
+    scraper.close()
+    return scraper
+
+
+def parse_summary(path):
+    """Return (tests, types, scopes) from covsummary.html."""
+    tests, types, scopes = {}, [], []
+    for heading, row in _scrape(path).rows:
+        if any(kind == "th" for _, _, kind in row):
+            continue
+        texts = [text for text, _, _ in row]
+        if heading == "" and len(texts) >= 2 and texts[-2].endswith(":"):
+            tests[texts[-2].rstrip(":")] = int(texts[-1])
+        elif heading == "Coverage Summary by Structure" and len(row) >= 3:
+            depth = sum(1 for _, cls, _ in row if cls == "invisible")
+            scopes.append({"name": texts[depth], "depth": depth,
+                           "hits": _percent(texts[-2]),
+                           "coverage": _percent(texts[-1])})
+        elif heading == "Coverage Summary by Type" and len(row) >= 3:
+            if texts[0] == "Total Coverage:":
+                types.append({"type": "Total", "hits": _percent(texts[-2]),
+                              "coverage": _percent(texts[-1])})
+            elif len(row) >= 7 and texts[1].isdigit():
+                types.append({"type": texts[0], "bins": int(texts[1]),
+                              "hit_bins": int(texts[2]), "misses": int(texts[3]),
+                              "hits": _percent(texts[5]),
+                              "coverage": _percent(texts[6])})
+    return tests, types, scopes
+
+
+def parse_dulist(path):
+    """Return [{"unit", metric: percent or None, ...}] from dulist.html."""
+    rows, titles = [], []
+    for script in _scrape(path).scripts:
+        for target, _, value in _JsReader(script.splitlines()).assignments():
+            if target == "dulist":
+                rows = value
+            elif target == "titlelist":
+                titles = value
+    units = []
+    for row in rows:
+        unit = {"unit": row[0][0]}
+        for title, idx in titles[1:]:
+            unit[title] = _percent(row[idx][1]) if idx < len(row) else None
+        units.append(unit)
+    return units
+
+
+class CoverageTable:
+    """Covergroup bins of a report as parallel arrays, one row per bin."""
+
+    def __init__(self, points, bin_names, point, hits, at_least, auto, meta):
+        self.points = points          # [{"group", "name", "kind", "cross", "scope"}]
+        self.bin_names = bin_names
+        self.point = point            # int32: index into points
+        self.hits = hits              # int64
+        self.at_least = at_least      # int64
+        self.auto = auto              # bool: auto cross bin listed as a miss
+        self.meta = meta              # {"tests", "types", "scopes", "units"}
+
+    @property
+    def covered(self):
+        return self.hits >= self.at_least
+
+    def point_coverage(self):
+        """Return (bins, covered bins, percent) arrays per coverpoint/cross."""
+        n = len(self.points)
+        bins = np.bincount(self.point, minlength=n)
+        covered = np.bincount(self.point, weights=self.covered, minlength=n)
+        percent = np.divide(100.0 * covered, bins, out=np.zeros(n), where=bins > 0)
+        return bins, covered.astype(np.int64), percent
+
+    def missing(self):
+        """Return [(coverpoint, bin)] for every bin below its at_least."""
+        rows = np.flatnonzero(~self.covered)
+        return [(self.points[self.point[i]]["name"], self.bin_names[i]) for i in rows]
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp.npz"
+        np.savez_compressed(
+            tmp, point=self.point, hits=self.hits, at_least=self.at_least,
+            auto=self.auto, bin_names=np.array(self.bin_names, dtype=str),
+            info=np.array(json.dumps({"version": CACHE_VERSION,
+                                      "points": self.points, "meta": self.meta})))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            info = json.loads(str(data["info"]))
+            if info.get("version") != CACHE_VERSION:
+                raise ValueError("stale cache")
+            return cls(info["points"], data["bin_names"].tolist(), data["point"],
+                       data["hits"], data["at_least"], data["auto"], info["meta"])
+
+
+def _layout(report):
+    obj, arr = dict(BIN_OBJ_IDX), dict(BIN_ARR_IDX)
+    path = os.path.join(report, "global.json")
+    if os.path.exists(path):
+        for target, key, value in read_js(path):
+            if target.endswith("[gBinObjIdx]"):
+                obj[key] = value
+            elif target.endswith("[gBinArrIdx]"):
+                arr[key] = value
+    return obj, arr
+
+
+def parse_bins(report):
+    """Stream pages/gbins*.json into (points, names, point, hits, at_least, auto).
+
+    A covergroup appears once per instance and once per design unit; only
+    its first appearance is kept.
+    """
+    obj, arr = _layout(report)
+    points, seen, names = [], set(), []
+    point, hits, at_least, auto = [], [], [], []
+    name_at = arr["name"]
+    for path in sorted(glob.glob(os.path.join(report, "pages", "gbins*.json"))):
+        for _, key, entry in read_js(path):
+            if not isinstance(entry, list) or entry[obj["type"]] not in POINT_KINDS:
+                continue
+            group = _clean(entry[obj["parentName"]] or "")
+            ident = (group, entry[obj["name"]])
+            if ident in seen:
+                continue
+            seen.add(ident)
+            idx = len(points)
+            points.append({
+                "group": group, "name": entry[obj["name"]],
+                "kind": POINT_KINDS[entry[obj["type"]]],
+                "cross": entry[obj["cvps"]] or [],
+                "scope": entry[obj["hdlPath"]],
+            })
+            for field, is_auto in (("binArr", False), ("autoBinArr", True)):
+                slot = obj.get(field)
+                for b in (entry[slot] if slot is not None and slot < len(entry) else None) or []:
+                    if not b:
+                        continue
+                    names.append(",".join(str(n) for n in b[name_at:] if n is not None))
+                    point.append(idx)
+                    hits.append(int(b[arr["h"]]))
+                    at_least.append(int(b[arr["atLeast"]] or 1))
+                    auto.append(is_auto)
+    return (points, names, np.array(point, dtype=np.int32),
+            np.array(hits, dtype=np.int64), np.array(at_least, dtype=np.int64),
+            np.array(auto, dtype=bool))
+
+
+def report_hash(report):
+    """SHA-256 over the report files this module reads."""
+    h = hashlib.sha256()
+    paths = [os.path.join(report, n) for n in ("global.json", "covsummary.html",
+                                               "dulist.html")]
+    paths += sorted(glob.glob(os.path.join(report, "pages", "gbins*.json")))
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        h.update(os.path.relpath(path, report).encode() + b"\0")
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+    return h.hexdigest()
+
+
+def load_report(report=DEFAULT_REPORT, cache_dir=CACHE_DIR):
+    """Return (CoverageTable, cache hit) for the HTML report directory `report`."""
+    if not os.path.exists(os.path.join(report, "covsummary.html")):
+        raise FileNotFoundError(f"{report}: no covsummary.html (not a vcover HTML report)")
+    cache = os.path.join(cache_dir, report_hash(report) + ".npz") if cache_dir else None
+    if cache and os.path.exists(cache):
+        try:
+            return CoverageTable.load(cache), True
+        except (ValueError, KeyError, OSError):
+            pass
+    tests, types, scopes = parse_summary(os.path.join(report, "covsummary.html"))
+    dulist = os.path.join(report, "dulist.html")
+    units = parse_dulist(dulist) if os.path.exists(dulist) else []
+    points, names, point, hits, at_least, auto = parse_bins(report)
+    table = CoverageTable(points, names, point, hits, at_least, auto,
+                          {"tests": tests, "types": types, "scopes": scopes,
+                           "units": units})
+    if cache:
+        table.save(cache)
+    return table, False
+
+
+def build_slides(prs, table, start=0, bin_charts=False, max_missing=12,
+                 max_points=24):
+    """Add the summary, chart and missing-bin slides; return the last slide number."""
+    meta = table.meta
+    sn = start
+    top = meta["scopes"][0]["name"] if meta["scopes"] else "design"
+    total = next((t for t in meta["types"] if t["type"] == "Total"), None)
+    bullets = []
+    if total:
+        bullets.append(f"Total coverage: {total['coverage']:.2f}%  "
+                       f"(bins hit: {total['hits']:.2f}%)")
+    if meta["tests"]:
+        bullets.append("Tests: " + ", ".join(
+            f"{n} {k.lower().replace('number of tests run', 'run')}"
+            for k, n in meta["tests"].items()))
+    bullets.append("")
+    for t in meta["types"]:
+        if t["type"] != "Total":
+            bullets.append(f"{t['type']}: {t['coverage']:.2f}%  "
+                           f"({t['hit_bins']}/{t['bins']} bins)")
+    if meta["units"]:
+        bullets.append("")
+        bullets.append("Design units:")
+        for u in meta["units"]:
+            bullets.append(f"    {u['unit']}: {u.get('Total') or 0:.2f}% total")
+    sn += 1
+    gp.add_bullet_slide(prs, f"Coverage Summary - {top}", bullets, sn)
+
+    kinds = [t for t in meta["types"] if t["type"] != "Total"]
+    if kinds:
+        sn += 1
+        gp.add_histogram_slide(
+            prs, "Coverage by Type", [t["type"] for t in kinds],
+            {"Coverage": [t["coverage"] for t in kinds]}, sn,
+            f"Total {total['coverage']:.2f}%" if total else None)
+
+    if meta["units"]:
+        metrics = [m for m in meta["units"][0] if m not in ("unit", "Total")]
+        sn += 1
+        gp.add_histogram_slide(
+            prs, "Coverage by Design Unit", [u["unit"] for u in meta["units"]],
+            {m: [u.get(m) for u in meta["units"]] for m in metrics[:4]}, sn,
+            "Blank bars: metric not collected for that unit")
+
+    if table.points:
+        bins, covered, percent = table.point_coverage()
+        groups = {p["group"] for p in table.points}
+        shown = np.arange(len(table.points))
+        caption = (f"{int(covered.sum())}/{int(bins.sum())} bins covered in "
+                   f"{len(table.points)} coverpoints and crosses")
+        if len(shown) > max_points:
+            # Too many bars to read: keep the least covered, in report order.
+            shown = np.sort(np.argsort(percent, kind="stable")[:max_points])
+            caption += f" (lowest {max_points} shown)"
+        labels = [table.points[i]["name"] if len(groups) == 1
+                  else f"{table.points[i]['group']}.{table.points[i]['name']}"
+                  for i in shown]
+        sn += 1
+        gp.add_histogram_slide(prs, "Covergroup Coverage", labels,
+                               {"Coverage": percent[shown].tolist()}, sn, caption)
+
+        missing = table.missing()
+        lines = [f"{name}:  <{bin_name}>" for name, bin_name in missing[:max_missing]]
+        if len(missing) > max_missing:
+            lines.append(f"    ... and {len(missing) - max_missing} more")
+        sn += 1
+        gp.add_bullet_slide(prs, f"Uncovered Bins ({len(missing)})",
+                            lines or ["All covergroup bins are covered"], sn)
+
+        if bin_charts:
+            for i, p in enumerate(table.points):
+                if p["kind"] != "coverpoint":
+                    continue
+                rows = np.flatnonzero(table.point == i)
+                sn += 1
+                gp.add_histogram_slide(
+                    prs, f"{p['name']} - Bin Hits",
+                    [table.bin_names[r] for r in rows],
+                    {"Hits": table.hits[rows].tolist()}, sn,
+                    f"{p['group']}: {int(covered[i])}/{int(bins[i])} bins covered",
+                    unit="")
+    return sn
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("report", nargs="?", default=DEFAULT_REPORT,
+                        help="vcover HTML report directory")
+    parser.add_argument("-o", "--output", default=OUTPUT_FILE)
+    parser.add_argument("--bin-charts", action="store_true",
+                        help="add one hits-per-bin chart per coverpoint")
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--json", action="store_true",
+                        help="print the parsed summary instead of building slides")
+    args = parser.parse_args()
+
+    try:
+        table, cached = load_report(args.report, None if args.no_cache else CACHE_DIR)
+    except FileNotFoundError as exc:
+        print(exc, file=sys.stderr)
+        sys.exit(1)
+    if args.json:
+        bins, covered, percent = table.point_coverage()
+        print(json.dumps({**table.meta, "points": [
+            {**p, "bins": int(b), "covered": int(c), "coverage": round(float(pc), 2)}
+            for p, b, c, pc in zip(table.points, bins, covered, percent)]}, indent=1))
+        return
+
+    prs = gp.new_presentation()
+    sn = build_slides(prs, table, bin_charts=args.bin_charts)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    prs.save(args.output)
+    print(f"{'Cached' if cached else 'Parsed'} report: {len(table.points)} coverpoints, "
+          f"{len(table.hits)} bins")
+    print(f"Presentation saved to: {args.output} ({sn} slides)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Per-slide size and element-count report for a generated .pptx
+
+Reads the package straight from the zip (no python-pptx) and reports, for
+every slide in presentation order: XML bytes, compressed bytes, shapes,
+paragraphs and runs, plus deck totals and the heaviest slides. Per-slide
+budgets can be enforced so generate_pptx.py fails when a slide bloats.
+
+Usage:
+    python deck_report.py ../../Presentations/Section2.pptx
+    python deck_report.py Section2.pptx --budgets budgets.json --top 10
+"""
+
+import sys
+import json
+import zipfile
+import argparse
+import posixpath
+import xml.etree.ElementTree as ET
+
+NS_P = "{http://schemas.openxmlformats.org/presentationml/2006/main}"
+NS_A = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+NS_R = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+NS_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+SHAPE_TAGS = {NS_P + t for t in ("sp", "pic", "graphicFrame", "grpSp", "cxnSp")}
+
+METRICS = ("xml_bytes", "compressed_bytes", "shapes", "paragraphs", "runs")
+
+# Per-slide limits; a budgets JSON file overrides any of these keys and may
+# set one to null to disable it.
+DEFAULT_BUDGETS = {
+    "xml_bytes": 64 * 1024,
+    "compressed_bytes": 16 * 1024,
+    "shapes": 40,
+    "paragraphs": 60,
+    "runs": 400,
+}
+
+
+def slide_members(zf):
+    """Return the slide part names of `zf` in presentation order."""
+    rels = ET.fromstring(zf.read("ppt/_rels/presentation.xml.rels"))
+    targets = {r.get("Id"): r.get("Target") for r in rels.iter(NS_REL + "Relationship")}
+    prs = ET.fromstring(zf.read("ppt/presentation.xml"))
+    return [
+        posixpath.normpath(posixpath.join("ppt", targets[s.get(NS_R + "id")]))
+        for s in prs.iter(NS_P + "sldId")
+    ]
+
+
+def _measure(zf, member):
+    info = zf.getinfo(member)
+    row = {
+        "part": member, "title": "",
+        "xml_bytes": info.file_size, "compressed_bytes": info.compress_size,
+        "shapes": 0, "paragraphs": 0, "runs": 0,
+    }
+    with zf.open(member) as f:
+        for _, elem in ET.iterparse(f):
+            tag = elem.tag
+            if tag in SHAPE_TAGS:
+                row["shapes"] += 1
+            elif tag == NS_A + "p":
+                row["paragraphs"] += 1
+            elif tag == NS_A + "r":
+                row["runs"] += 1
+            elif tag == NS_A + "t" and not row["title"] and elem.text:
+                row["title"] = elem.text.strip()
+    return row
+
+
+def analyze(path):
+    """Return one metrics dict per slide of the deck at `path`."""
+    with zipfile.ZipFile(path) as zf:
+        rows = [_measure(zf, m) for m in slide_members(zf)]
+    for num, row in enumerate(rows, 1):
+        row["slide"] = num
+    return rows
+
+
+def totals(rows):
+    return {m: sum(r[m] for r in rows) for m in METRICS}
+
+
+def load_budgets(path=None):
+    """Return DEFAULT_BUDGETS updated from the JSON file at `path`."""
+    budgets = dict(DEFAULT_BUDGETS)
+    if path:
+        with open(path, encoding="utf-8") as f:
+            budgets.update(json.load(f))
+    unknown = set(budgets) - set(METRICS)
+    if unknown:
+        raise ValueError(f"unknown budget keys: {', '.join(sorted(unknown))}")
+    return budgets
+
+
+def check_budgets(rows, budgets):
+    """Return a message for every slide metric over its budget."""
+    problems = []
+    for row in rows:
+        for metric, limit in budgets.items():
+            if limit is not None and row[metric] > limit:
+                problems.append(
+                    f"slide {row['slide']} ({row['title']}): "
+                    f"{metric} {row[metric]} > budget {limit}")
+    return problems
+
+
+def format_report(rows, top=5):
+    lines = [f"{'#':>4} {'xml':>8} {'zip':>7} {'shapes':>6} {'paras':>6} "
+             f"{'runs':>6}  title"]
+    for r in rows:
+        lines.append(f"{r['slide']:>4} {r['xml_bytes']:>8} {r['compressed_bytes']:>7} "
+                     f"{r['shapes']:>6} {r['paragraphs']:>6} {r['runs']:>6}  {r['title']}")
+    t = totals(rows)
+    lines.append(f"{'all':>4} {t['xml_bytes']:>8} {t['compressed_bytes']:>7} "
+                 f"{t['shapes']:>6} {t['paragraphs']:>6} {t['runs']:>6}  "
+                 f"{len(rows)} slides")
+    if top:
+        lines.append("")
+        lines.append(f"Heaviest {top} slides by XML bytes:")
+        for r in sorted(rows, key=lambda r: r["xml_bytes"], reverse=True)[:top]:
+            lines.append(f"  {r['slide']:>4}  {r['xml_bytes']:>8} B  "
+                         f"{r['runs']:>4} runs  {r['title']}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("deck")
+    parser.add_argument("--budgets", default=None,
+                        help="JSON file overriding DEFAULT_BUDGETS")
+    parser.add_argument("--top", type=int, default=5)
+    parser.add_argument("--json", action="store_true",
+                        help="print the per-slide rows as JSON")
+    args = parser.parse_args()
+
+    rows = analyze(args.deck)
+    if args.json:
+        print(json.dumps({"slides": rows, "totals": totals(rows)}, indent=1))
+    else:
+        print(format_report(rows, args.top))
+
+    problems = check_budgets(rows, load_budgets(args.budgets))
+    for problem in problems:
+        print(f"BUDGET EXCEEDED: {problem}", file=sys.stderr)
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
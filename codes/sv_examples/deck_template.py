@@ -0,0 +1,187 @@
+"""
+Branding from a template .pptx, prepared once and cached by content hash
+
+A university template brings its theme, slide masters and layouts. The
+first time a template is seen it is opened with python-pptx, its sample
+slides are dropped, and the remaining package (masters, layouts, theme,
+media) is saved as a snapshot next to a JSON style sheet derived from it:
+
+  - header, accent and text colours from the theme colour scheme
+  - title and body fonts from the theme font scheme
+  - the footer text of the master's footer placeholder, if it has one
+  - the index of the blank layout the slide builders add slides to
+
+Both files live in Presentations/.template_cache under the SHA-256 of the
+template, so later builds load the JSON and the ready-made snapshot
+instead of re-parsing the template, and a batch build (grade_decks.py)
+hashes the file once per process. Editing the template changes the hash
+and prepares it again.
+
+Usage (see generate_pptx.use_template):
+    python generate_pptx.py --template university.pptx
+    python deck_template.py university.pptx      # show the derived style
+"""
+
+import io
+import os
+import sys
+import json
+import hashlib
+import argparse
+import xml.etree.ElementTree as ET
+
+from pptx import Presentation
+from pptx.enum.shapes import PP_PLACEHOLDER
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         "..", "..", "Presentations", ".template_cache")
+VERSION = 1
+
+NS_A = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+
+# generate_pptx colour constant -> theme colour scheme slot
+THEME_COLORS = {
+    "BLUE": "accent1",
+    "ACCENT_ORANGE": "accent2",
+    "DARK_BLUE": "dk2",
+    "LIGHT_GRAY": "lt2",
+    "WHITE": "lt1",
+}
+
+# Placeholders a layout may keep and still count as blank.
+_FURNITURE = {PP_PLACEHOLDER.DATE, PP_PLACEHOLDER.FOOTER, PP_PLACEHOLDER.SLIDE_NUMBER}
+
+_LOADED = {}
+
+
+class Template:
+    """A prepared template: `package` bytes of the snapshot and its `style` dict."""
+
+    def __init__(self, path, sha256, package, style):
+        self.path = path
+        self.sha256 = sha256
+        self.package = package
+        self.style = style
+
+    def presentation(self):
+        """Return a new, slide-less Presentation on the template's masters."""
+        return Presentation(io.BytesIO(self.package))
+
+
+def file_hash(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _scheme_color(elem):
+    """Return the RRGGBB of a colour scheme slot (srgbClr, or sysClr's lastClr)."""
+    for child in elem:
+        if child.tag == NS_A + "srgbClr":
+            return child.get("val").upper()
+        if child.tag == NS_A + "sysClr" and child.get("lastClr"):
+            return child.get("lastClr").upper()
+    return None
+
+
+def theme_style(theme_xml):
+    """Return {"colors": {constant: RRGGBB}, "fonts": {...}} from a theme part."""
+    root = ET.fromstring(theme_xml)
+    scheme = root.find(f".//{NS_A}clrScheme")
+    slots = {}
+    if scheme is not None:
+        slots = {child.tag[len(NS_A):]: _scheme_color(child) for child in scheme}
+    colors = {name: slots[slot] for name, slot in THEME_COLORS.items() if slots.get(slot)}
+    fonts = {}
+    for key, tag in (("TITLE_FONT", "majorFont"), ("FONT", "minorFont")):
+        latin = root.find(f".//{NS_A}fontScheme/{NS_A}{tag}/{NS_A}latin")
+        if latin is not None and latin.get("typeface"):
+            fonts[key] = latin.get("typeface")
+    return {"colors": colors, "fonts": fonts}
+
+
+def blank_layout(prs):
+    """Return the index of the layout named Blank, else the one with fewest placeholders."""
+    layouts = list(prs.slide_layouts)
+    for i, layout in enumerate(layouts):
+        if layout.name.strip().lower() == "blank":
+            return i
+    return min(range(len(layouts)), key=lambda i: sum(
+        ph.placeholder_format.type not in _FURNITURE for ph in layouts[i].placeholders))
+
+
+def prepare(path):
+    """Open the template at `path`; return (snapshot bytes, style dict)."""
+    prs = Presentation(path)
+    slide_ids = prs.slides._sldIdLst
+    for sld_id in list(slide_ids):
+        prs.part.drop_rel(sld_id.rId)
+        slide_ids.remove(sld_id)
+
+    master = prs.slide_master
+    style = theme_style(master.part.part_related_by(RT.THEME).blob)
+    style["version"] = VERSION
+    style["slide_size"] = [prs.slide_width, prs.slide_height]
+    style["blank_layout"] = blank_layout(prs)
+    style["footer"] = None
+    for ph in master.placeholders:
+        if ph.placeholder_format.type == PP_PLACEHOLDER.FOOTER and ph.text_frame.text.strip():
+            style["footer"] = ph.text_frame.text.strip()
+
+    out = io.BytesIO()
+    prs.save(out)
+    return out.getvalue(), style
+
+
+def load(path, cache_dir=CACHE_DIR):
+    """Return the Template for `path`, preparing and caching it on first use."""
+    st = os.stat(path)
+    memo = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    if memo in _LOADED:
+        return _LOADED[memo]
+
+    digest = file_hash(path)
+    package_file = os.path.join(cache_dir, digest + ".pptx")
+    style_file = os.path.join(cache_dir, digest + ".json")
+    style = None
+    if os.path.exists(package_file) and os.path.exists(style_file):
+        with open(style_file, encoding="utf-8") as f:
+            style = json.load(f)
+    if style is not None and style.get("version") == VERSION:
+        with open(package_file, "rb") as f:
+            package = f.read()
+    else:
+        package, style = prepare(path)
+        os.makedirs(cache_dir, exist_ok=True)
+        for name, data, mode in ((package_file, package, "wb"),
+                                 (style_file, json.dumps(style, indent=1), "w")):
+            with open(name + ".tmp", mode) as f:
+                f.write(data)
+            os.replace(name + ".tmp", name)
+
+    template = Template(path, digest, package, style)
+    _LOADED[memo] = template
+    return template
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("template")
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    args = parser.parse_args()
+
+    try:
+        template = load(args.template, args.cache_dir)
+    except (OSError, KeyError, ValueError) as exc:
+        print(f"{args.template}: {exc}", file=sys.stderr)
+        sys.exit(1)
+    print(f"{args.template} ({template.sha256[:12]}), snapshot "
+          f"{len(template.package)} bytes")
+    print(json.dumps(template.style, indent=1))
+
+
+if __name__ == "__main__":
+    main()
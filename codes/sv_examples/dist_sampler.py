@@ -0,0 +1,634 @@
+"""
+Vectorized sampler for SystemVerilog dist/inside/bit constraints
+
+Parses the rand variables and constraint blocks of a class and draws
+millions of randomize() results at once with NumPy, so randomization
+slides can show the distribution a simulator would produce without one.
+Supported: bit/logic/reg/byte/shortint/int/longint/integer variables up to
+62 bits; `dist` with `:=` and `:/` weights over values, ranges and other
+variables; `inside`; `cond -> ...` and if/else; `solve a before b`; and
+expressions with the usual operators, bit/part selects, $onehot,
+$onehot0 and $countones.
+
+Values are built variable by variable: a dist or inside picks from its
+items, `x == expr` and `x[k] == c` are assigned directly, everything else
+starts uniform (guarded inside/equalities only when the guard is solved
+first, so they do not skew the guard). Samples that break any constraint
+are drawn again, which keeps plain constraints uniform over their
+solutions, as in the LRM.
+Variables named on the left of `solve ... before` keep their value
+through the first redraws, so they are chosen before the others.
+
+Usage:
+    python dist_sampler.py ../classes/dist_constraint.sv --hist "len % 2"
+    python dist_sampler.py --examples -n 1000000 -o dist_examples.pptx
+"""
+
+import re
+import sys
+import time
+import argparse
+
+import numpy as np
+
+TYPES = {
+    # type: (bits, signed) when no packed range is given
+    "bit": (1, False), "logic": (1, False), "reg": (1, False),
+    "byte": (8, True), "shortint": (16, True), "int": (32, True),
+    "integer": (32, True), "longint": (64, True),
+}
+MAX_BITS = 62
+RETRIES = 32
+MAX_ROUNDS = 200
+
+_COMMENT_RE = re.compile(r"//[^\n]*|/\*.*?\*/", re.S)
+_DECL_RE = re.compile(
+    r"\brandc?\s+(bit|logic|reg|byte|shortint|int|integer|longint)\b"
+    r"\s*(signed|unsigned)?\s*(?:\[\s*(\d+)\s*:\s*(\d+)\s*\])?\s*([\w\s,]+);")
+_CLASS_RE = re.compile(r"\bclass\s+(\w+)\s*;(.*?)\bendclass\b", re.S)
+_CONSTRAINT_RE = re.compile(r"\bconstraint\s+(\w+)\s*\{")
+_TOKEN_RE = re.compile(r"""\s*(?:
+    (?P<num>\d*\s*'[sS]?[bBoOdDhH]\s*[0-9a-fA-F_]+|\d[\d_]*)
+   |(?P<name>\$?[A-Za-z_]\w*)
+   |(?P<op>->|<<|>>|<=|>=|==|!=|&&|\|\||:=|:/|[-+*/%&|^~!<>()\[\]{}:,;?])
+   )""", re.X)
+
+# Binary operators by precedence, lowest first.
+_PRECEDENCE = [
+    ("||",), ("&&",), ("|",), ("^",), ("&",), ("==", "!="),
+    ("<", "<=", ">", ">=", "inside"), ("<<", ">>"), ("+", "-"), ("*", "/", "%"),
+]
+_LEVEL = {op: i for i, ops in enumerate(_PRECEDENCE) for op in ops}
+
+
+def _truth(a):
+    return np.asarray(a) != 0
+
+
+_BINOPS = {
+    "*": np.multiply, "/": np.floor_divide, "%": np.fmod,
+    "+": np.add, "-": np.subtract, "<<": np.left_shift, ">>": np.right_shift,
+    "<": np.less, "<=": np.less_equal, ">": np.greater, ">=": np.greater_equal,
+    "==": np.equal, "!=": np.not_equal,
+    "&": np.bitwise_and, "^": np.bitwise_xor, "|": np.bitwise_or,
+    "&&": lambda a, b: _truth(a) & _truth(b),
+    "||": lambda a, b: _truth(a) | _truth(b),
+}
+
+
+def _countones(x):
+    x = np.asarray(x, dtype=np.int64)
+    return sum((x >> k) & 1 for k in range(64))
+
+
+_FUNCS = {
+    "$onehot": lambda x: (np.asarray(x) != 0) & ((x & (x - 1)) == 0),
+    "$onehot0": lambda x: (x & (x - 1)) == 0,
+    "$countones": _countones,
+}
+
+
+def _literal(text):
+    text = text.replace("_", "").replace(" ", "")
+    if "'" not in text:
+        return int(text)
+    base = text.split("'", 1)[1].lstrip("sS")
+    return int(base[1:], {"b": 2, "o": 8, "d": 10, "h": 16}[base[0].lower()])
+
+
+def tokenize(text):
+    tokens, pos = [], 0
+    text = text.rstrip()
+    while pos < len(text):
+        m = _TOKEN_RE.match(text, pos)
+        if not m or m.end() == pos:
+            raise ValueError(f"cannot parse constraint near {text[pos:pos + 20]!r}")
+        pos = m.end()
+        if m.group("num"):
+            tokens.append(("num", _literal(m.group("num"))))
+        elif m.group("name"):
+            tokens.append(("name", m.group("name")))
+        else:
+            tokens.append(("op", m.group("op")))
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser for constraint block bodies."""
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self, value=None):
+        tok = self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+        return tok if value is None else tok[1] == value
+
+    def next(self, value=None):
+        tok = self.peek()
+        if value is not None and tok[1] != value:
+            raise ValueError(f"expected {value!r}, found {tok[1]!r}")
+        self.pos += 1
+        return tok
+
+    # -- expressions ------------------------------------------------------
+
+    def expr(self, level=0):
+        left = self.unary()
+        while True:
+            op = self.peek()[1]
+            if _LEVEL.get(op, -1) < level:
+                return left
+            self.next()
+            if op == "inside":
+                left = ("inside", left, self.items(weighted=False))
+            else:
+                left = ("bin", op, left, self.expr(_LEVEL[op] + 1))
+
+    def unary(self):
+        kind, value = self.peek()
+        if kind == "op" and value in ("!", "~", "-", "+"):
+            self.next()
+            return ("un", value, self.unary())
+        return self.postfix(self.primary())
+
+    def primary(self):
+        kind, value = self.next()
+        if kind == "num":
+            return ("num", value)
+        if value == "(":
+            node = self.expr()
+            self.next(")")
+            return node
+        if kind == "name" and value.startswith("$"):
+            self.next("(")
+            arg = self.expr()
+            self.next(")")
+            if value not in _FUNCS:
+                raise ValueError(f"unsupported system function {value}")
+            return ("call", value, arg)
+        if kind == "name":
+            return ("var", value)
+        raise ValueError(f"unexpected {value!r}")
+
+    def postfix(self, node):
+        while self.peek("["):
+            self.next()
+            hi = self.expr()
+            if self.peek(":"):
+                self.next()
+                lo = self.expr()
+                node = ("part", node, hi, lo)
+            else:
+                node = ("bit", node, hi)
+            self.next("]")
+        return node
+
+    def items(self, weighted=True):
+        """Parse {item, ...}; each item is (lo, hi or None, weight, per_value)."""
+        self.next("{")
+        items = []
+        while True:
+            if self.peek("["):
+                self.next()
+                lo = self.expr()
+                self.next(":")
+                hi = self.expr()
+                self.next("]")
+            else:
+                lo, hi = self.expr(), None
+            weight, per_value = ("num", 1), True
+            if weighted and self.peek()[1] in (":=", ":/"):
+                per_value = self.next()[1] == ":="
+                weight = self.expr()
+            items.append((lo, hi, weight, per_value))
+            if not self.peek(","):
+                break
+            self.next()
+        self.next("}")
+        return items
+
+    # -- statements -------------------------------------------------------
+
+    def block(self, guards):
+        if self.peek("{"):
+            self.next()
+            out = []
+            while not self.peek("}"):
+                out += self.statement(guards)
+            self.next("}")
+            return out
+        return self.statement(guards)
+
+    def statement(self, guards=()):
+        """Return a list of ("expr"|"dist", guards, ...) and ("solve", before, after)."""
+        if self.peek("solve"):
+            self.next()
+            before, after = [], []
+            while not self.peek("before"):
+                before.append(self.next()[1])
+                if self.peek(","):
+                    self.next()
+            self.next()
+            while not self.peek(";"):
+                after.append(self.next()[1])
+                if self.peek(","):
+                    self.next()
+            self.next(";")
+            return [("solve", before, after)]
+        if self.peek("if"):
+            self.next()
+            self.next("(")
+            cond = self.expr()
+            self.next(")")
+            out = self.block(guards + (cond,))
+            if self.peek("else"):
+                self.next()
+                out += self.block(guards + (("un", "!", cond),))
+            return out
+        node = self.expr()
+        if self.peek("->"):
+            self.next()
+            return self.block(guards + (node,))
+        if self.peek("dist"):
+            self.next()
+            items = self.items()
+            self.next(";")
+            return [("dist", guards, node, items)]
+        self.next(";")
+        return [("expr", guards, node)]
+
+
+def _evaluate(node, env):
+    kind = node[0]
+    if kind == "num":
+        return node[1]
+    if kind == "var":
+        return env[node[1]]
+    if kind == "un":
+        a = _evaluate(node[2], env)
+        return {"!": lambda: ~_truth(a), "~": lambda: ~np.asarray(a, dtype=np.int64),
+                "-": lambda: -a, "+": lambda: a}[node[1]]()
+    if kind == "bin":
+        return _BINOPS[node[1]](_evaluate(node[2], env), _evaluate(node[3], env))
+    if kind == "bit":
+        return (_evaluate(node[1], env) >> _evaluate(node[2], env)) & 1
+    if kind == "part":
+        hi, lo = _evaluate(node[2], env), _evaluate(node[3], env)
+        return (_evaluate(node[1], env) >> lo) & ((1 << (hi - lo + 1)) - 1)
+    if kind == "call":
+        return _FUNCS[node[1]](_evaluate(node[2], env))
+    if kind == "inside":
+        return _member(_evaluate(node[1], env), node[2], env)
+    raise ValueError(f"cannot evaluate {kind}")
+
+
+def _member(x, items, env):
+    hit = np.zeros(np.shape(x), dtype=bool)
+    for lo, hi, _, _ in items:
+        if hi is None:
+            hit |= x == _evaluate(lo, env)
+        else:
+            hit |= (x >= _evaluate(lo, env)) & (x <= _evaluate(hi, env))
+    return hit
+
+
+def _names(node):
+    if not isinstance(node, tuple):
+        return set()
+    if node[0] == "var":
+        return {node[1]}
+    out = set()
+    for child in node[1:]:
+        if isinstance(child, list):
+            for item in child:
+                for part in item:
+                    out |= _names(part)
+        else:
+            out |= _names(child)
+    return out
+
+
+class RandClass:
+    """The rand variables and constraints of one SystemVerilog class."""
+
+    def __init__(self, name, variables, constraints):
+        self.name = name
+        self.variables = variables          # name -> (bits, signed)
+        self.constraints = [c for c in constraints if c[0] != "solve"]
+        self.before = set()
+        edges = set()
+        for c in constraints:
+            if c[0] == "solve":
+                self.before.update(c[1])
+                edges.update((a, b) for a in c[1] for b in c[2])
+            elif c[0] == "dist" and c[2][0] == "var" and not c[1]:
+                for item in c[3]:
+                    edges.update((v, c[2][1]) for part in item[:2]
+                                 for v in _names(part))
+        self.order = self._order(edges)
+
+    def _order(self, edges):
+        """Declaration order, moved as little as needed to respect `edges`."""
+        order, left = [], list(self.variables)
+        while left:
+            ready = [v for v in left
+                     if not any(b == v and a in left for a, b in edges)]
+            pick = ready[0] if ready else left[0]
+            order.append(pick)
+            left.remove(pick)
+        return order
+
+    def _uniform(self, name, n, rng):
+        bits, signed = self.variables[name]
+        lo = -(1 << (bits - 1)) if signed else 0
+        return rng.integers(lo, lo + (1 << bits), n, dtype=np.int64)
+
+    def _pick(self, items, env, n, rng):
+        """Draw from dist/inside items: := weighs each value, :/ the whole item."""
+        los, his, weights = [], [], []
+        for lo, hi, weight, per_value in items:
+            lo_v = _evaluate(lo, env)
+            hi_v = lo_v if hi is None else _evaluate(hi, env)
+            w = _evaluate(weight, env)
+            los.append(lo_v)
+            his.append(hi_v)
+            weights.append(w * (hi_v - lo_v + 1) if per_value else w)
+        if all(np.ndim(v) == 0 for v in los + his + weights):
+            # Constant items: one table lookup per sample.
+            cum = np.cumsum(np.array(weights, dtype=np.float64))
+            idx = np.minimum(np.searchsorted(cum, rng.random(n) * cum[-1], "right"),
+                             len(items) - 1)
+            lo_s = np.array(los, dtype=np.int64)[idx]
+            span = np.array(his, dtype=np.int64)[idx] - lo_s + 1
+            return lo_s + (rng.random(n) * span).astype(np.int64)
+        cum = np.cumsum(np.stack([np.broadcast_to(w, n) for w in weights])
+                        .astype(np.float64), axis=0)
+        u = rng.random(n) * cum[-1]
+        idx = np.minimum((cum <= u).sum(axis=0), len(items) - 1)
+        rows = np.arange(n)
+        lo_s = np.stack([np.broadcast_to(v, n) for v in los]).astype(np.int64)[idx, rows]
+        hi_s = np.stack([np.broadcast_to(v, n) for v in his]).astype(np.int64)[idx, rows]
+        return rng.integers(lo_s, hi_s + 1, dtype=np.int64)
+
+    def _draw(self, names, env, n, rng):
+        """Draw `names` in solve order into env, given the values already there.
+
+        dist and inside pick from their items and equalities with values
+        already drawn are assigned, each where its guards hold; inside and
+        equalities only under guards on `solve ... before` variables.
+        """
+        done = set(env) - set(names)
+        for name in self.order:
+            if name not in names:
+                continue
+            x = self._uniform(name, n, rng)
+            for c in self.constraints:
+                guards = c[1]
+                if any(_names(g) - done for g in guards):
+                    continue
+                guard = np.ones(n, dtype=bool)
+                for g in guards:
+                    guard &= _truth(_evaluate(g, env))
+                if c[0] == "dist" and c[2] == ("var", name):
+                    if not set().union(*(_names(p) for i in c[3] for p in i[:2])) - done:
+                        x = np.where(guard, self._pick(c[3], env, n, rng), x)
+                    continue
+                if any(_names(g) - self.before for g in guards):
+                    # Assigning under a guard would favour the guard's true
+                    # side; that is only wanted when it is solved first.
+                    continue
+                node = c[2]
+                if c[0] == "expr" and node[0] == "inside" and node[1] == ("var", name):
+                    if not _names(node) - done - {name}:
+                        x = np.where(guard, self._pick(node[2], env, n, rng), x)
+                elif c[0] == "expr" and node[:2] == ("bin", "=="):
+                    for lhs, rhs in ((node[2], node[3]), (node[3], node[2])):
+                        if lhs == ("var", name) and not _names(rhs) - done:
+                            x = np.where(guard, _evaluate(rhs, env), x)
+                        elif (lhs[0] in ("bit", "part") and lhs[1] == ("var", name)
+                              and all(i[0] == "num" for i in lhs[2:])
+                              and rhs[0] == "num"):
+                            hi, lo = lhs[2][1], lhs[-1][1]
+                            mask = ((1 << (hi - lo + 1)) - 1) << lo
+                            x = np.where(guard, (x & ~mask) | ((rhs[1] << lo) & mask), x)
+            env[name] = x
+            done.add(name)
+
+    def check(self, env, n):
+        """Return a bool array: which samples meet every constraint."""
+        ok = np.ones(n, dtype=bool)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for c in self.constraints:
+                guard = np.ones(n, dtype=bool)
+                for g in c[1]:
+                    guard &= _truth(_evaluate(g, env))
+                if c[0] == "dist":
+                    hold = _member(_evaluate(c[2], env), c[3], env)
+                else:
+                    hold = _truth(_evaluate(c[2], env))
+                ok &= ~guard | hold
+        return ok
+
+    def sample(self, n, seed=None):
+        """Return ({variable: int64 array}, stats) for `n` randomize() calls."""
+        t0 = time.perf_counter()
+        rng = np.random.default_rng(seed)
+        env = {}
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self._draw(self.order, env, n, rng)
+        ok = self.check(env, n)
+        fails = np.zeros(n, dtype=np.int32)
+        rounds = 0
+        while not ok.all() and rounds < MAX_ROUNDS:
+            rounds += 1
+            bad = np.flatnonzero(~ok)
+            fails[bad] += 1
+            for keep_before in (True, False):
+                rows = bad[(fails[bad] < RETRIES) == keep_before]
+                if not len(rows):
+                    continue
+                if not keep_before:
+                    fails[rows] = 0
+                redraw = [v for v in self.order
+                          if not (keep_before and v in self.before)]
+                sub = {v: env[v][rows] for v in self.order if v not in redraw}
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    self._draw(redraw, sub, len(rows), rng)
+                for v in redraw:
+                    env[v][rows] = sub[v]
+                ok[rows] = self.check(sub, len(rows))
+        if not ok.any():
+            raise ValueError(f"class {self.name}: constraints look unsatisfiable")
+        stats = {"samples": int(ok.sum()), "requested": n, "rounds": rounds,
+                 "seconds": time.perf_counter() - t0}
+        return {v: a[ok] for v, a in env.items()}, stats
+
+
+def parse_classes(source):
+    """Return {class name: RandClass} for the classes in SystemVerilog `source`."""
+    source = _COMMENT_RE.sub("", source)
+    classes = {}
+    for name, body in _CLASS_RE.findall(source):
+        variables = {}
+        for kind, sign, msb, lsb, names in _DECL_RE.findall(body):
+            bits, signed = TYPES[kind]
+            if msb:
+                bits = abs(int(msb) - int(lsb)) + 1
+            signed = sign == "signed" or (signed and sign != "unsigned")
+            if bits > MAX_BITS:
+                raise ValueError(f"{name}: {bits}-bit variables are not supported")
+            for var in names.split(","):
+                variables[var.strip()] = (bits, signed)
+        constraints = []
+        for m in _CONSTRAINT_RE.finditer(body):
+            depth, pos = 1, m.end()
+            while depth:
+                depth += {"{": 1, "}": -1}.get(body[pos], 0)
+                pos += 1
+            parser = _Parser(tokenize(body[m.end():pos - 1]))
+            while parser.pos < len(parser.tokens):
+                constraints += parser.statement()
+        classes[name] = RandClass(name, variables, constraints)
+    return classes
+
+
+def evaluate(expr, samples):
+    """Evaluate a SystemVerilog expression over sampled variables."""
+    parser = _Parser(tokenize(expr))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        value = _evaluate(parser.expr(), samples)
+    return np.broadcast_to(np.asarray(value, dtype=np.int64),
+                           len(next(iter(samples.values()))))
+
+
+def histogram(series, bins=16):
+    """Bucket each value array in `series`; return (labels, [percent list])."""
+    values = np.unique(np.concatenate(series))
+    if len(values) <= bins:
+        labels = [str(v) for v in values]
+        percents = [[100.0 * np.count_nonzero(s == v) / len(s) for v in values]
+                    for s in series]
+        return labels, percents
+    edges = np.unique(np.linspace(values[0], values[-1] + 1, bins + 1).astype(np.int64))
+    labels = [f"{lo}-{hi - 1}" if hi - 1 > lo else str(lo)
+              for lo, hi in zip(edges[:-1], edges[1:])]
+    percents = [(100.0 * np.histogram(s, edges)[0] / len(s)).tolist() for s in series]
+    return labels, percents
+
+
+# Classic demos for the randomization slides: (title, code, [(class, expr)]).
+EXAMPLES = [
+    ("dist: := vs :/ over a range", """
+class weights;
+  rand bit [3:0] a, b;
+  // := gives EACH value in [1:3] weight 60
+  constraint c_a { a dist {0 := 40, [1:3] := 60}; }
+  // :/ splits 60 ACROSS the range (20 each)
+  constraint c_b { b dist {0 :/ 40, [1:3] :/ 60}; }
+endclass
+""", [("weights", "a"), ("weights", "b")]),
+    ("solve ... before", """
+class no_order;
+  rand bit       s;
+  rand bit [3:0] d;
+  constraint c { s -> d == 0; }
+endclass
+
+class s_first;
+  rand bit       s;
+  rand bit [3:0] d;
+  constraint c { s -> d == 0; solve s before d; }
+endclass
+""", [("no_order", "s"), ("s_first", "s")]),
+    ("inside with bit constraints", """
+class aligned;
+  rand bit [7:0] addr;
+  constraint c_range { addr inside {[8'h00:8'h3F], [8'hC0:8'hFF]}; }
+  constraint c_align { addr[1:0] == 0; }
+endclass
+""", [("aligned", "addr")]),
+]
+
+
+def distribution(code, series, n=1_000_000, bins=16, seed=None):
+    """Sample `series` [(class, expr)] of `code`; return (labels, percents, names, stats)."""
+    classes = parse_classes(code)
+    drawn, values, names, stats = {}, [], [], []
+    for cls, expr in series:
+        if cls not in drawn:
+            drawn[cls] = classes[cls].sample(n, seed)
+            stats.append(drawn[cls][1])
+        values.append(evaluate(expr, drawn[cls][0]))
+        names.append(f"{cls}.{expr}" if len(classes) > 1 else expr)
+    labels, percents = histogram(values, bins)
+    return labels, percents, names, stats
+
+
+def _summary(labels, percents, names, stats):
+    lines = []
+    if len(labels) <= 8:
+        for name, pct in zip(names, percents):
+            lines.append(f"{name}: " + "  ".join(
+                f"{label}={p:.1f}%" for label, p in zip(labels, pct)))
+    seconds = sum(s["seconds"] for s in stats)
+    samples = min(s["samples"] for s in stats)
+    lines.append(f"{samples:,} samples per class in {seconds * 1000:.0f} ms")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("source", nargs="?", help="SystemVerilog file with rand classes")
+    parser.add_argument("--class", dest="cls", default=None,
+                        help="class to sample (default: the first)")
+    parser.add_argument("--hist", action="append", default=None,
+                        help="expression to histogram (repeatable; default: dist targets)")
+    parser.add_argument("--examples", action="store_true",
+                        help="build slides for the built-in := / :/ / solve-before demos")
+    parser.add_argument("-n", "--samples", type=int, default=1_000_000)
+    parser.add_argument("--bins", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("-o", "--output", default="dist.pptx")
+    args = parser.parse_args()
+
+    if args.examples:
+        jobs = [(title, code.strip("\n"), series) for title, code, series in EXAMPLES]
+    elif args.source:
+        with open(args.source, encoding="utf-8") as f:
+            code = f.read()
+        classes = parse_classes(code)
+        if not classes:
+            parser.error(f"no class with rand variables in {args.source}")
+        cls = args.cls or next(iter(classes))
+        exprs = args.hist or [
+            c[2][1] for c in classes[cls].constraints
+            if c[0] == "dist" and c[2][0] == "var"] or classes[cls].order[:1]
+        jobs = [(cls, code.strip("\n"), [(cls, e) for e in exprs])]
+    else:
+        parser.error("give a source file or --examples")
+
+    import generate_pptx as gp
+
+    prs = gp.new_presentation()
+    sn = 0
+    for title, code, series in jobs:
+        try:
+            labels, percents, names, stats = distribution(
+                code, series, args.samples, args.bins, args.seed)
+        except (ValueError, KeyError) as exc:
+            print(f"{title}: {exc}", file=sys.stderr)
+            sys.exit(1)
+        summary = _summary(labels, percents, names, stats)
+        print(f"{title}\n{summary}\n")
+        sn += 1
+        sn = gp.add_code_slide(prs, title, code, summary, sn)
+        sn += 1
+        gp.add_histogram_slide(prs, f"{title} - distribution", labels,
+                               dict(zip(names, percents)), sn, summary.splitlines()[-1])
+    prs.save(args.output)
+    print(f"Presentation saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
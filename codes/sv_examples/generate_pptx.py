@@ -8,19 +8,44 @@ Matches Ain Shams University template style:
 Usage:
     pip install python-pptx
     python generate_pptx.py
+    python generate_pptx.py --profile draft      # fast, unhighlighted preview
+    python generate_pptx.py --profile release    # maximum compression
+    python generate_pptx.py --chunk-size 20      # low memory for huge decks
+    python generate_pptx.py --pipeline           # experimental; no faster than the default
+    python generate_pptx.py --backend html       # instant browser preview
+    python generate_pptx.py --pdf                # also export PDF (LibreOffice)
+    python generate_pptx.py --verify icarus      # check slide outputs (verify_outputs.py)
+    python generate_pptx.py --preprocess         # check every .sv preprocesses (sv_preprocess.py)
+    python generate_pptx.py --template asu.pptx  # theme, masters and colours from a template
+    python generate_pptx.py --pipeline --trace build.json  # Chrome trace (build_trace.py)
 """
 
 import os
 import re
+import sys
+import atexit
+import hashlib
+import argparse
 import datetime
 import textwrap
+import functools
+from collections import OrderedDict
+from contextlib import contextmanager
 from pptx import Presentation
 from pptx.util import Inches, Pt, Emu
 from pptx.dml.color import RGBColor
 from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
 from pptx.enum.shapes import MSO_SHAPE
+from pptx.chart.data import CategoryChartData
+from pptx.enum.chart import XL_CHART_TYPE, XL_LEGEND_POSITION
 from pptx.oxml.ns import qn
 
+import slide_deps
+import build_trace
+import deck_report
+import pptx_writer
+import slide_pipeline
+
 BLUE = RGBColor(0x1F, 0x4E, 0x79)
 DARK_BLUE = RGBColor(0x0D, 0x2E, 0x4E)
 WHITE = RGBColor(0xFF, 0xFF, 0xFF)
@@ -38,6 +63,12 @@ ACCENT_ORANGE = RGBColor(0xC0, 0x50, 0x20)
 MEDIUM_GRAY = RGBColor(0x55, 0x55, 0x55)
 SECTION_TEAL = RGBColor(0x00, 0x6B, 0x6B)
 STRING_BROWN = RGBColor(0xA3, 0x11, 0x15)
+TYPE_CYAN = RGBColor(0x2B, 0x91, 0xAF)
+FOOTER_GRAY = RGBColor(0x80, 0x80, 0x80)
+
+FONT = "Calibri"
+TITLE_FONT = "Calibri"
+FOOTER_TEXT = "Ain Shams University - Faculty of Engineering"
 
 SV_KEYWORDS = {
     "module", "endmodule", "struct", "typedef", "packed", "signed",
@@ -68,8 +99,91 @@ _TOKEN_RE = re.compile(
 )
 
 
-def tokenize_sv_line(line):
-    """Split a SystemVerilog line into (text, category) tokens."""
+# One scan over a whole snippet for declared_sv_names(); comments, strings
+# and based literals are matched only so that they are skipped.
+_DECL_TOKEN_RE = re.compile(
+    r'//[^\n]*|/\*.*?\*/|"(?:[^"\\\n]|\\.)*"|\d+\'[bBhHdDoO]\w+'
+    r"|([a-zA-Z_]\w*)|(\S)",
+    re.S,
+)
+_DECLARED_CACHE = OrderedDict()
+DECLARED_CACHE_SIZE = 4096
+
+
+def declared_sv_names(code_text):
+    """Return the typedef, class, enum member and parameter names a snippet declares.
+
+    A single pass over the snippet's tokens, kept in a bounded LRU keyed by
+    the SHA-1 of the snippet, so each code box is scanned once per process.
+    """
+    key = hashlib.sha1(code_text.encode()).digest()
+    names = _DECLARED_CACHE.get(key)
+    if names is not None:
+        _DECLARED_CACHE.move_to_end(key)
+        return names
+    names = set()
+    depth = 0
+    typedef = None        # brace depth of the open typedef
+    last = None           # last identifier at the typedef's own depth
+    enum = None           # depth of an enum whose member list has not opened
+    members = None        # depth inside an enum's member list
+    params = None         # depth of an open parameter declaration
+    expect_member = False
+    prev = None
+    tokens = [(m.group(1), m.group(2)) for m in _DECL_TOKEN_RE.finditer(code_text)
+              if m.group(1) or m.group(2)]
+    for i, (ident, punct) in enumerate(tokens):
+        if ident:
+            if ident == "typedef":
+                typedef, last = depth, None
+            elif ident == "enum":
+                enum = depth
+            elif ident in ("parameter", "localparam"):
+                params = depth
+            elif ident not in SV_KEYWORDS:
+                if prev == "class" or expect_member:
+                    names.add(ident)
+                elif (params is not None and tokens[i + 1:i + 2] == [(None, "=")]
+                        and tokens[i + 2:i + 3] != [(None, "=")]):
+                    names.add(ident)
+                if typedef is not None and depth == typedef:
+                    last = ident
+            expect_member = False
+            prev = ident
+            continue
+        if punct in "({[":
+            if punct == "{" and enum == depth:
+                members, enum = depth + 1, None
+                expect_member = True
+            depth += 1
+        elif punct in ")}]":
+            if members == depth:
+                members = None
+            depth -= 1
+            if params is not None and depth < params:
+                params = None
+        elif punct == "," and members == depth:
+            expect_member = True
+        elif punct == ";":
+            if typedef is not None and depth == typedef:
+                if last:
+                    names.add(last)
+                typedef = None
+            if params == depth:
+                params = None
+        prev = punct
+    names = frozenset(names)
+    _DECLARED_CACHE[key] = names
+    if len(_DECLARED_CACHE) > DECLARED_CACHE_SIZE:
+        _DECLARED_CACHE.popitem(last=False)
+    return names
+
+
+def tokenize_sv_line(line, declared=()):
+    """Split a SystemVerilog line into (text, category) tokens.
+
+    Identifiers in `declared` (see declared_sv_names()) are "declared".
+    """
     tokens = []
     pos = 0
     for m in _TOKEN_RE.finditer(line):
@@ -87,6 +201,8 @@ def tokenize_sv_line(line):
         elif ident is not None:
             if ident in SV_KEYWORDS:
                 tokens.append((ident, "keyword"))
+            elif ident in declared:
+                tokens.append((ident, "declared"))
             else:
                 tokens.append((ident, "default"))
         elif punct is not None:
@@ -152,11 +268,25 @@ TOKEN_STYLES = {
     "comment": (COMMENT_GREEN, False, True),
     "literal": (LITERAL_PURPLE, False, False),
     "string":  (STRING_BROWN, False, False),
+    "declared": (TYPE_CYAN, False, False),
     "default": (BLACK, False, False),
 }
 
 SLIDE_WIDTH = Inches(10)
 SLIDE_HEIGHT = Inches(7.5)
+HEADER_HEIGHT = Inches(1.0)
+FOOTER_HEIGHT = Inches(0.5)     # band above the bottom edge for the footer
+
+# Layout every slide is added on; use_template() points it at the
+# template's blank layout.
+BLANK_LAYOUT = 6
+
+# Lines (code, "// Simulation Output:" header and output) that fit in one
+# code box; longer snippets continue on "(cont.)" slides.
+CODE_PAGE_LINES = 30
+
+# Body rows in one table slide.
+TABLE_PAGE_ROWS = 12
 
 TODAY = datetime.date.today().strftime("%m/%d/%Y")
 
@@ -164,26 +294,88 @@ OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
                           "..", "..", "Presentations")
 OUTPUT_FILE = os.path.join(OUTPUT_DIR, "Section2.pptx")
 
+# compresslevel: zlib level for every package part (0 = stored)
+# highlight:     syntax-highlight code boxes (one run per token)
+BUILD_PROFILES = {
+    "draft":   {"compresslevel": 1, "highlight": False},
+    "default": {"compresslevel": 6, "highlight": True},
+    "release": {"compresslevel": 9, "highlight": True},
+}
+
+HIGHLIGHT = True
+
+# Callables invoked as hook(slide, info) once each slide is fully built.
+SLIDE_HOOKS = []
+
+
+# Set to a slide_pipeline.SlidePipeline to build slides through it.
+PIPELINE = None
+
+# deck_template.Template the deck is built on (see use_template), or None
+# for python-pptx's default template and the constants above.
+TEMPLATE = None
+
+# Besides a python-pptx Presentation, the add_*_slide functions accept any
+# deck that implements them as methods without the `prs` argument, such as
+# html_preview.HtmlDeck; those decks render the slide themselves.
+
+
+# Source files of modules that compute slide content (see computed_by).
+_COMPUTED_BY = []
+
+
+@contextmanager
+def computed_by(*modules):
+    """Record `modules` as sources of every slide added inside the block.
+
+    For slides whose text a module computes (e.g. sched_model output), so
+    slide_deps links them to that module's file.
+    """
+    paths = [os.path.abspath(m.__file__) for m in modules]
+    _COMPUTED_BY.extend(paths)
+    try:
+        yield
+    finally:
+        del _COMPUTED_BY[len(_COMPUTED_BY) - len(paths):]
+
+
+def _caller():
+    """Return (file, line, computed_by files) of the call to an add_*_slide function."""
+    frame = sys._getframe(2)
+    return frame.f_code.co_filename, frame.f_lineno, tuple(_COMPUTED_BY)
+
+
+def _slide_done(slide, kind, title, slide_num, caller, lang=None):
+    """Report a finished slide, and the build_deck line that made it, to SLIDE_HOOKS."""
+    if not SLIDE_HOOKS:
+        return
+    info = {
+        "id": slide_num, "kind": kind, "title": title, "lang": lang,
+        "file": caller[0], "line": caller[1], "sources": list(caller[2]),
+    }
+    for hook in SLIDE_HOOKS:
+        hook(slide, info)
+
 
 def add_header_band(slide, title_text):
     header = slide.shapes.add_shape(
         MSO_SHAPE.RECTANGLE, Inches(0), Inches(0),
-        SLIDE_WIDTH, Inches(1.0)
+        SLIDE_WIDTH, HEADER_HEIGHT
     )
     header.fill.solid()
     header.fill.fore_color.rgb = BLUE
     header.line.fill.background()
 
     accent = slide.shapes.add_shape(
-        MSO_SHAPE.RECTANGLE, Inches(0), Inches(1.0),
+        MSO_SHAPE.RECTANGLE, Inches(0), HEADER_HEIGHT,
         SLIDE_WIDTH, Inches(0.06)
     )
     accent.fill.solid()
-    accent.fill.fore_color.rgb = RGBColor(0xC0, 0x50, 0x20)
+    accent.fill.fore_color.rgb = ACCENT_ORANGE
     accent.line.fill.background()
 
     txBox = slide.shapes.add_textbox(
-        Inches(0.5), Inches(0.15), Inches(9), Inches(0.7)
+        Inches(0.5), Inches(0.15), SLIDE_WIDTH - Inches(1), HEADER_HEIGHT - Inches(0.3)
     )
     tf = txBox.text_frame
     tf.word_wrap = True
@@ -192,42 +384,43 @@ def add_header_band(slide, title_text):
     p.font.size = Pt(28)
     p.font.bold = True
     p.font.color.rgb = WHITE
-    p.font.name = "Calibri"
+    p.font.name = TITLE_FONT
 
 
 def add_footer(slide, slide_num):
+    top = SLIDE_HEIGHT - FOOTER_HEIGHT
     left_box = slide.shapes.add_textbox(
-        Inches(0.3), Inches(7.0), Inches(1.5), Inches(0.4)
+        Inches(0.3), top, Inches(1.5), Inches(0.4)
     )
     tf = left_box.text_frame
     p = tf.paragraphs[0]
     p.text = TODAY
     p.font.size = Pt(9)
-    p.font.color.rgb = RGBColor(0x80, 0x80, 0x80)
-    p.font.name = "Calibri"
+    p.font.color.rgb = FOOTER_GRAY
+    p.font.name = FONT
 
     center_box = slide.shapes.add_textbox(
-        Inches(2.5), Inches(7.0), Inches(5), Inches(0.4)
+        (SLIDE_WIDTH - Inches(5)) // 2, top, Inches(5), Inches(0.4)
     )
     tf = center_box.text_frame
     p = tf.paragraphs[0]
-    p.text = "Ain Shams University - Faculty of Engineering"
+    p.text = FOOTER_TEXT
     p.alignment = PP_ALIGN.CENTER
     p.font.size = Pt(9)
-    p.font.color.rgb = RGBColor(0x80, 0x80, 0x80)
-    p.font.name = "Calibri"
+    p.font.color.rgb = FOOTER_GRAY
+    p.font.name = FONT
     p.font.italic = True
 
     right_box = slide.shapes.add_textbox(
-        Inches(8.5), Inches(7.0), Inches(1.2), Inches(0.4)
+        SLIDE_WIDTH - Inches(1.5), top, Inches(1.2), Inches(0.4)
     )
     tf = right_box.text_frame
     p = tf.paragraphs[0]
     p.text = str(slide_num)
     p.alignment = PP_ALIGN.RIGHT
     p.font.size = Pt(9)
-    p.font.color.rgb = RGBColor(0x80, 0x80, 0x80)
-    p.font.name = "Calibri"
+    p.font.color.rgb = FOOTER_GRAY
+    p.font.name = FONT
 
 
 def _add_styled_run(paragraph, text, category, font_size=Pt(11)):
@@ -242,7 +435,74 @@ def _add_styled_run(paragraph, text, category, font_size=Pt(11)):
     run.font.italic = italic
 
 
-def add_code_box(slide, code_text, top, height, output_text=None, lang="sv"):
+def _coalesce(tokens):
+    """Merge neighbouring tokens that render with the same style."""
+    runs = []
+    for text, category in tokens:
+        style = TOKEN_STYLES.get(category, TOKEN_STYLES["default"])
+        if runs and TOKEN_STYLES.get(runs[-1][1], TOKEN_STYLES["default"]) == style:
+            runs[-1] = (runs[-1][0] + text, runs[-1][1])
+        else:
+            runs.append((text, category))
+    return runs or [("", "default")]
+
+
+def layout_code(code_text, output_text=None, lang="sv", highlight=True,
+                page_lines=CODE_PAGE_LINES):
+    """Tokenize, coalesce and paginate a code box.
+
+    Returns a list of (lines, output) pages: `lines` holds one list of
+    (text, category) runs per code line, and `output` the simulation output
+    lines, present on the last page only. Pure string work, so it can run
+    in a worker process. `page_lines=None` keeps everything on one page.
+    """
+    with build_trace.span("tokenize", "layout", lang=lang):
+        declared = declared_sv_names(code_text) if highlight and lang != "tcl" else ()
+        lines = []
+        for line in textwrap.dedent(code_text).strip().split("\n"):
+            if not highlight:
+                tokens = [(line, "default")]
+            elif lang == "tcl":
+                tokens = tokenize_tcl_line(line)
+            else:
+                tokens = tokenize_sv_line(line, declared)
+            lines.append(_coalesce(tokens))
+    output = output_text.strip().split("\n") if output_text else []
+
+    with build_trace.span("paginate", "layout", lines=len(lines)):
+        pages, pos = [], 0
+        for take in _page_sizes(len(lines), len(output), page_lines):
+            pages.append((lines[pos:pos + take], []))
+            pos += take
+        pages[-1] = (pages[-1][0], output)
+    return pages
+
+
+def _page_sizes(n_lines, n_output, page_lines):
+    """Return how many code lines go on each page of a code box."""
+    sizes = []
+    reserve = n_output + 1 if n_output else 0
+    while page_lines and n_lines + reserve > page_lines and n_lines > 1:
+        take = min(page_lines, n_lines - 1)
+        sizes.append(take)
+        n_lines -= take
+    sizes.append(n_lines)
+    return sizes
+
+
+def code_page_count(code_text, output_text=None, page_lines=CODE_PAGE_LINES):
+    """Return how many slides layout_code() splits a code box over.
+
+    Only counts lines, so callers can number slides without tokenizing.
+    """
+    lines = textwrap.dedent(code_text).strip().split("\n")
+    output = output_text.strip().split("\n") if output_text else []
+    return len(_page_sizes(len(lines), len(output), page_lines))
+
+
+def add_code_box(slide, code_text, top, height, output_text=None, lang="sv",
+                 page=None):
+    """Add a highlighted code box; `page` is a prepared layout_code() page."""
     code_shape = slide.shapes.add_shape(
         MSO_SHAPE.ROUNDED_RECTANGLE,
         Inches(0.4), top, Inches(9.2), height
@@ -260,10 +520,12 @@ def add_code_box(slide, code_text, top, height, output_text=None, lang="sv"):
     tf.margin_top = Inches(0.1)
     tf.margin_bottom = Inches(0.1)
 
-    tokenizer = tokenize_tcl_line if lang == "tcl" else tokenize_sv_line
-    cleaned = textwrap.dedent(code_text).strip()
+    if page is None:
+        page = layout_code(code_text, output_text, lang, HIGHLIGHT,
+                           page_lines=None)[0]
+    lines, output = page
 
-    for i, line in enumerate(cleaned.split("\n")):
+    for i, runs in enumerate(lines):
         if i == 0:
             p = tf.paragraphs[0]
         else:
@@ -276,14 +538,10 @@ def add_code_box(slide, code_text, top, height, output_text=None, lang="sv"):
         pPr.set('indent', '0')
         pPr.set('marL', '0')
 
-        tokens = tokenizer(line)
-        if not tokens:
-            _add_styled_run(p, "", "default")
-        else:
-            for text, category in tokens:
-                _add_styled_run(p, text, category)
+        for text, category in runs:
+            _add_styled_run(p, text, category)
 
-    if output_text:
+    if output:
         p = tf.add_paragraph()
         p.space_before = Pt(6)
         run = p.add_run()
@@ -293,7 +551,7 @@ def add_code_box(slide, code_text, top, height, output_text=None, lang="sv"):
         run.font.bold = True
         run.font.color.rgb = OUTPUT_GREEN
 
-        for line in output_text.strip().split("\n"):
+        for line in output:
             p = tf.add_paragraph()
             p.space_after = Pt(1)
             p.space_before = Pt(0)
@@ -304,89 +562,90 @@ def add_code_box(slide, code_text, top, height, output_text=None, lang="sv"):
             run.font.color.rgb = OUTPUT_GREEN
 
 
-def _classify_bullet(text):
-    """Return (display_text, color, bold, size) based on line content."""
-    stripped = text.lstrip()
-    indent = len(text) - len(stripped)
-
-    if stripped == "":
-        return ("", DARK_BLUE, False, Pt(8))
-
-    is_numbered = bool(re.match(r'^\d+\.', stripped))
-    is_section_num = bool(re.match(r'^\d+\.\d+', stripped))
-    is_sub = indent >= 4
-
-    if is_numbered:
-        return (stripped, ACCENT_ORANGE, True, Pt(17))
-    elif is_section_num:
-        return (stripped, BLUE, True, Pt(17))
-    elif is_sub:
-        return (stripped, MEDIUM_GRAY, False, Pt(15))
-    else:
-        return (stripped, DARK_BLUE, False, Pt(17))
-
-
-def add_bullet_slide(prs, title, bullets, slide_num):
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
-    add_header_band(slide, title)
-    add_footer(slide, slide_num)
-
-    txBox = slide.shapes.add_textbox(
-        Inches(0.6), Inches(1.3), Inches(8.8), Inches(5.5)
-    )
-    tf = txBox.text_frame
-    tf.word_wrap = True
-
-    for i, bullet in enumerate(bullets):
-        if i == 0:
-            p = tf.paragraphs[0]
-        else:
-            p = tf.add_paragraph()
-
-        display, color, bold, size = _classify_bullet(bullet)
-
-        if display == "":
-            p.space_after = Pt(2)
-            p.space_before = Pt(0)
-            run = p.add_run()
-            run.text = ""
-            run.font.size = Pt(4)
+# Outline markup for bullet slides: four leading spaces per nesting level,
+# "1." numbered and "4.5" section-numbered items and, for slides that opt
+# in with code_spans=True, `code` spans that are highlighted like code
+# boxes ("``" is a literal backtick). Without code_spans, backticks are
+# plain text, so excerpts and report text are shown as written.
+BULLET_STYLES = {
+    # kind: (color, bold, size)
+    "numbered": (ACCENT_ORANGE, True, Pt(17)),
+    "section": (ACCENT_ORANGE, True, Pt(17)),
+    "plain": (DARK_BLUE, False, Pt(17)),
+    "sub": (MEDIUM_GRAY, False, Pt(15)),
+}
+BULLET_INDENT = Inches(0.4)     # left margin added per nesting level
+
+_OUTLINE_RE = re.compile(r"( *)(?:(\d+(?:\.\d+)+)|(\d+\.))?")
+_CODE_SPAN_RE = re.compile(r"``|`([^`]+)`")
+OUTLINE_CACHE_SIZE = 4096
+
+
+def _inline_code(code, highlight):
+    """Token runs for a `code` span: Tcl when it starts with a Questa command."""
+    if not highlight:
+        return [(code, "default")]
+    words = code.split(None, 1)
+    if words and words[0] in TCL_KEYWORDS:
+        return _coalesce(tokenize_tcl_line(code))
+    return _coalesce(tokenize_sv_line(code))
+
+
+@functools.lru_cache(maxsize=OUTLINE_CACHE_SIZE)
+def parse_bullet(text, highlight=True, code_spans=False):
+    """Return one bullet's outline item (level, kind, runs).
+
+    kind is "blank" or a BULLET_STYLES key; runs is a tuple of
+    (text, category) where category None is prose and anything else is a
+    TOKEN_STYLES category of inline code (only with `code_spans`).
+    Items are kept in a bounded LRU cache.
+    """
+    m = _OUTLINE_RE.match(text)
+    body = text[m.end(1):]
+    level = len(m.group(1)) // 4
+    if not body.strip():
+        return (0, "blank", ())
+    kind = ("section" if m.group(2) else "numbered" if m.group(3)
+            else "sub" if level else "plain")
+    if not (code_spans and "`" in body):
+        return (level, kind, ((body, None),))
+    runs, pos = [], 0
+    for span in _CODE_SPAN_RE.finditer(body):
+        prose = body[pos:span.start()] + ("`" if span.group(1) is None else "")
+        if prose:
+            if runs and runs[-1][1] is None:
+                prose = runs.pop()[0] + prose
+            runs.append((prose, None))
+        if span.group(1) is not None:
+            runs.extend(_inline_code(span.group(1), highlight))
+        pos = span.end()
+    if pos < len(body):
+        if runs and runs[-1][1] is None:
+            runs.append((runs.pop()[0] + body[pos:], None))
         else:
-            is_sub = bullet.lstrip() != bullet and (len(bullet) - len(bullet.lstrip())) >= 4
-            p.space_after = Pt(4)
-            p.space_before = Pt(0)
-            if is_sub:
-                pPr = p._p.get_or_add_pPr()
-                pPr.set('marL', str(Emu(Inches(0.4))))
-            run = p.add_run()
-            run.text = display
-            run.font.name = "Calibri"
-            run.font.size = size
-            run.font.color.rgb = color
-            run.font.bold = bold
+            runs.append((body[pos:], None))
+    return (level, kind, tuple(runs))
 
-    return slide
 
+def parse_outline(bullets, highlight=True, code_spans=False):
+    """Return the outline items of a bullet list, ready for one writing pass."""
+    return tuple(parse_bullet(b, highlight, code_spans) for b in bullets)
 
-def add_code_slide(prs, title, code, output, slide_num, lang="sv"):
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
-    add_header_band(slide, title)
-    add_footer(slide, slide_num)
-    add_code_box(slide, code, Inches(1.3), Inches(5.5), output, lang=lang)
-    return slide
 
+def add_title_slide(prs, title, subtitle, slide_num):
+    if hasattr(prs, "add_title_slide"):
+        return prs.add_title_slide(title, subtitle, slide_num)
+    caller = _caller()
+    if PIPELINE is not None:
+        PIPELINE.submit(_build_title_slide, prs, title, subtitle, slide_num,
+                        caller)
+        return None
+    return _build_title_slide(prs, title, subtitle, slide_num, caller)
 
-def main():
-    prs = Presentation()
-    prs.slide_width = SLIDE_WIDTH
-    prs.slide_height = SLIDE_HEIGHT
-    sn = 0
 
-    # ================================================================
-    #  TITLE SLIDE
-    # ================================================================
-    sn += 1
-    slide = prs.slides.add_slide(prs.slide_layouts[6])
+@build_trace.traced("title slide", "shapes")
+def _build_title_slide(prs, title, subtitle, slide_num, caller):
+    slide = prs.slides.add_slide(prs.slide_layouts[BLANK_LAYOUT])
     bg = slide.shapes.add_shape(
         MSO_SHAPE.RECTANGLE, Inches(0), Inches(0),
         SLIDE_WIDTH, SLIDE_HEIGHT
@@ -400,56 +659,464 @@ def main():
     )
     tf = txBox.text_frame
     p = tf.paragraphs[0]
-    p.text = "Section 2"
+    p.text = title
     p.alignment = PP_ALIGN.CENTER
     p.font.size = Pt(52)
     p.font.bold = True
     p.font.color.rgb = WHITE
-    p.font.name = "Calibri"
+    p.font.name = TITLE_FONT
 
     p2 = tf.add_paragraph()
     p2.space_before = Pt(40)
-    p2.text = "Ramy Osama"
+    p2.text = subtitle
     p2.alignment = PP_ALIGN.CENTER
     p2.font.size = Pt(28)
     p2.font.color.rgb = RGBColor(0xCC, 0xDD, 0xFF)
-    p2.font.name = "Calibri"
+    p2.font.name = FONT
 
     footer_box = slide.shapes.add_textbox(
         Inches(1), Inches(5.5), Inches(8), Inches(0.8)
     )
     tf = footer_box.text_frame
     p = tf.paragraphs[0]
-    p.text = "Ain Shams University - Faculty of Engineering"
+    p.text = FOOTER_TEXT
     p.alignment = PP_ALIGN.CENTER
     p.font.size = Pt(16)
     p.font.color.rgb = RGBColor(0xAA, 0xCC, 0xFF)
-    p.font.name = "Calibri"
+    p.font.name = FONT
     p.font.italic = True
 
+    _slide_done(slide, "title", title, slide_num, caller)
+    return slide
+
+
+def add_bullet_slide(prs, title, bullets, slide_num, code_spans=False):
+    """Add a bullet slide; with `code_spans`, `code` in a bullet is highlighted."""
+    if hasattr(prs, "add_bullet_slide"):
+        return prs.add_bullet_slide(title, bullets, slide_num, code_spans)
+    caller = _caller()
+    if PIPELINE is not None:
+        PIPELINE.submit(_build_bullet_slide, prs, title, bullets, slide_num,
+                        caller, code_spans)
+        return None
+    return _build_bullet_slide(prs, title, bullets, slide_num, caller, code_spans)
+
+
+@build_trace.traced("bullet slide", "shapes")
+def _build_bullet_slide(prs, title, bullets, slide_num, caller, code_spans=False):
+    slide = prs.slides.add_slide(prs.slide_layouts[BLANK_LAYOUT])
+    add_header_band(slide, title)
+    add_footer(slide, slide_num)
+
+    txBox = slide.shapes.add_textbox(
+        Inches(0.6), Inches(1.3), Inches(8.8), Inches(5.5)
+    )
+    tf = txBox.text_frame
+    tf.word_wrap = True
+
+    for i, (level, kind, runs) in enumerate(parse_outline(bullets, HIGHLIGHT,
+                                                          code_spans)):
+        p = tf.paragraphs[0] if i == 0 else tf.add_paragraph()
+        p.space_before = Pt(0)
+        if kind == "blank":
+            p.space_after = Pt(2)
+            run = p.add_run()
+            run.text = ""
+            run.font.size = Pt(4)
+            continue
+        color, bold, size = BULLET_STYLES[kind]
+        p.space_after = Pt(4)
+        if level:
+            pPr = p._p.get_or_add_pPr()
+            pPr.set('marL', str(Emu(BULLET_INDENT * level)))
+        for text, category in runs:
+            if category is not None:
+                _add_styled_run(p, text, category, size - Pt(1))
+                continue
+            run = p.add_run()
+            run.text = text
+            run.font.name = FONT
+            run.font.size = size
+            run.font.color.rgb = color
+            run.font.bold = bold
+
+    _slide_done(slide, "bullet", title, slide_num, caller)
+    return slide
+
+
+def add_code_slide(prs, title, code, output, slide_num, lang="sv"):
+    """Add a code slide, plus "(cont.)" slides if the code needs more pages.
+
+    Pages are numbered from slide_num on; returns the last number used.
+    """
+    last = slide_num + code_page_count(code, output) - 1
+    if hasattr(prs, "add_code_slide"):
+        prs.add_code_slide(title, code, output, slide_num, lang)
+        return last
+    caller = _caller()
+    if PIPELINE is not None:
+        PIPELINE.submit_layout(
+            (code, output, lang, HIGHLIGHT),
+            _build_code_slide, prs, title, slide_num, lang, caller)
+        return last
+    pages = layout_code(code, output, lang, HIGHLIGHT)
+    _build_code_slide(prs, title, slide_num, lang, caller, pages)
+    return last
+
+
+@build_trace.traced("code slide", "shapes")
+def _build_code_slide(prs, title, slide_num, lang, caller, pages):
+    first = None
+    for i, page in enumerate(pages):
+        page_title = title if i == 0 else f"{title} (cont.)"
+        slide = prs.slides.add_slide(prs.slide_layouts[BLANK_LAYOUT])
+        add_header_band(slide, page_title)
+        add_footer(slide, slide_num + i)
+        add_code_box(slide, None, Inches(1.3), Inches(5.5), lang=lang,
+                     page=page)
+        _slide_done(slide, "code", page_title, slide_num + i, caller, lang=lang)
+        first = first or slide
+    return first
+
+
+def add_waveform_slide(prs, title, rows, slide_num, window, time_unit=""):
+    """Add a timing diagram of vcd_waves.layout_waves() rows over window=(start, end)."""
+    if hasattr(prs, "add_waveform_slide"):
+        return prs.add_waveform_slide(title, rows, slide_num, window, time_unit)
+    caller = _caller()
+    if PIPELINE is not None:
+        PIPELINE.submit(_build_waveform_slide, prs, title, rows, slide_num,
+                        window, time_unit, caller)
+        return None
+    return _build_waveform_slide(prs, title, rows, slide_num, window,
+                                 time_unit, caller)
+
+
+@build_trace.traced("waveform slide", "shapes")
+def _build_waveform_slide(prs, title, rows, slide_num, window, time_unit, caller):
+    slide = prs.slides.add_slide(prs.slide_layouts[BLANK_LAYOUT])
+    add_header_band(slide, title)
+    add_footer(slide, slide_num)
+
+    start, end = window
+    left, right = Inches(2.0), Inches(9.6)
+    top, bottom = Inches(1.4), Inches(6.5)
+    pitch = min(Inches(0.6), (bottom - top) // max(len(rows), 1))
+    swing = int(pitch * 0.6)
+
+    def x_at(t):
+        return left + int((right - left) * (t - start) / max(end - start, 1))
+
+    for i, row in enumerate(rows):
+        y_low = top + i * pitch + (pitch + swing) // 2
+        y_high = y_low - swing
+
+        name = slide.shapes.add_textbox(Inches(0.3), y_high, Inches(1.6), swing)
+        p = name.text_frame.paragraphs[0]
+        p.text = row["name"].rsplit(".", 1)[-1]
+        p.alignment = PP_ALIGN.RIGHT
+        p.font.size = Pt(11)
+        p.font.name = "Consolas"
+        p.font.color.rgb = DARK_BLUE
+
+        if row["width"] == 1:
+            # One freeform per scalar: x/z sit at mid-level, busy runs are shaded.
+            levels = {"0": y_low, "1": y_high}
+            builder = None
+            for t0, t1, label in row["segments"]:
+                y = levels.get(label, (y_low + y_high) // 2)
+                if builder is None:
+                    builder = slide.shapes.build_freeform(x_at(t0), y)
+                else:
+                    builder.add_line_segments([(x_at(t0), y)], close=False)
+                builder.add_line_segments([(x_at(t1), y)], close=False)
+                if label is None:
+                    busy = slide.shapes.add_shape(
+                        MSO_SHAPE.RECTANGLE, x_at(t0), y_high,
+                        max(x_at(t1) - x_at(t0), 1), swing)
+                    busy.fill.solid()
+                    busy.fill.fore_color.rgb = LIGHT_GRAY
+                    busy.line.fill.background()
+            trace = builder.convert_to_shape()
+            trace.line.color.rgb = BLUE
+            trace.line.width = Pt(1.5)
+            continue
+
+        for t0, t1, label in row["segments"]:
+            width = max(x_at(t1) - x_at(t0), 1)
+            seg = slide.shapes.add_shape(
+                MSO_SHAPE.HEXAGON if label is not None else MSO_SHAPE.RECTANGLE,
+                x_at(t0), y_high, width, swing)
+            seg.fill.solid()
+            seg.fill.fore_color.rgb = (
+                CODE_BG if label not in (None, "x", "z") else LIGHT_GRAY)
+            seg.line.color.rgb = ACCENT_ORANGE if label == "x" else BLUE
+            seg.line.width = Pt(1)
+            if label is not None and width > Inches(0.25):
+                tf = seg.text_frame
+                tf.margin_left = tf.margin_right = 0
+                p = tf.paragraphs[0]
+                p.text = label
+                p.alignment = PP_ALIGN.CENTER
+                p.font.size = Pt(9)
+                p.font.name = "Consolas"
+                p.font.color.rgb = BLACK
+
+    ticks = 5
+    for k in range(ticks + 1):
+        t = start + (end - start) * k // ticks
+        box = slide.shapes.add_textbox(x_at(t) - Inches(0.5), bottom,
+                                       Inches(1.0), Inches(0.3))
+        p = box.text_frame.paragraphs[0]
+        p.text = f"{t}{time_unit}"
+        p.alignment = PP_ALIGN.CENTER
+        p.font.size = Pt(9)
+        p.font.color.rgb = MEDIUM_GRAY
+
+    _slide_done(slide, "waveform", title, slide_num, caller)
+    return slide
+
+
+def add_histogram_slide(prs, title, labels, series, slide_num, caption=None,
+                        unit="%"):
+    """Add a native column chart: `series` maps a name to one value per label.
+
+    Values are shown with one decimal and `unit`, or as whole numbers when
+    `unit` is empty.
+    """
+    if hasattr(prs, "add_histogram_slide"):
+        return prs.add_histogram_slide(title, labels, series, slide_num,
+                                       caption, unit)
+    caller = _caller()
+    if PIPELINE is not None:
+        PIPELINE.submit(_build_histogram_slide, prs, title, labels, series,
+                        slide_num, caption, unit, caller)
+        return None
+    return _build_histogram_slide(prs, title, labels, series, slide_num,
+                                  caption, unit, caller)
+
+
+@build_trace.traced("histogram slide", "shapes")
+def _build_histogram_slide(prs, title, labels, series, slide_num, caption,
+                           unit, caller):
+    slide = prs.slides.add_slide(prs.slide_layouts[BLANK_LAYOUT])
+    add_header_band(slide, title)
+    add_footer(slide, slide_num)
+
+    value_format = f'0.0"{unit}"' if unit else "0"
+    data = CategoryChartData(number_format=value_format)
+    data.categories = labels
+    for name, values in series.items():
+        data.add_series(name, [None if v is None else round(v, 2) for v in values])
+    chart = slide.shapes.add_chart(
+        XL_CHART_TYPE.COLUMN_CLUSTERED, Inches(0.6), Inches(1.3),
+        Inches(8.8), Inches(5.0), data
+    ).chart
+    chart.has_legend = len(series) > 1
+    if chart.has_legend:
+        chart.legend.position = XL_LEGEND_POSITION.TOP
+        chart.legend.include_in_layout = False
+    chart.font.size = Pt(11)
+    chart.font.name = FONT
+    chart.value_axis.has_major_gridlines = True
+    chart.value_axis.tick_labels.number_format = f'0"{unit}"' if unit else "0"
+    chart.value_axis.tick_labels.number_format_is_linked = False
+    colors = [BLUE, ACCENT_ORANGE, SECTION_TEAL, LITERAL_PURPLE]
+    for i, plot_series in enumerate(chart.plots[0].series):
+        plot_series.format.fill.solid()
+        plot_series.format.fill.fore_color.rgb = colors[i % len(colors)]
+    if len(labels) <= 16:
+        plot = chart.plots[0]
+        plot.has_data_labels = True
+        plot.data_labels.number_format = value_format
+        plot.data_labels.number_format_is_linked = False
+        plot.data_labels.font.size = Pt(9)
+
+    if caption:
+        box = slide.shapes.add_textbox(Inches(0.6), Inches(6.35), Inches(8.8),
+                                       Inches(0.4))
+        p = box.text_frame.paragraphs[0]
+        p.text = caption
+        p.alignment = PP_ALIGN.CENTER
+        p.font.size = Pt(11)
+        p.font.italic = True
+        p.font.color.rgb = MEDIUM_GRAY
+
+    _slide_done(slide, "chart", title, slide_num, caller)
+    return slide
+
+
+def add_regions_slide(prs, title, step, slide_num):
+    """Add one sched_model trace step: the four region queues, values and output."""
+    if hasattr(prs, "add_regions_slide"):
+        return prs.add_regions_slide(title, step, slide_num)
+    caller = _caller()
+    if PIPELINE is not None:
+        PIPELINE.submit(_build_regions_slide, prs, title, step, slide_num, caller)
+        return None
+    return _build_regions_slide(prs, title, step, slide_num, caller)
+
+
+@build_trace.traced("regions slide", "shapes")
+def _build_regions_slide(prs, title, step, slide_num, caller):
+    slide = prs.slides.add_slide(prs.slide_layouts[BLANK_LAYOUT])
+    add_header_band(slide, title)
+    add_footer(slide, slide_num)
+
+    for i, region in enumerate(("Active", "Inactive", "NBA", "Postponed")):
+        left = Inches(0.3 + i * 2.37)
+        current = region == step["region"]
+        head = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, left, Inches(1.3),
+                                      Inches(2.2), Inches(0.4))
+        head.fill.solid()
+        head.fill.fore_color.rgb = ACCENT_ORANGE if current else BLUE
+        head.line.fill.background()
+        p = head.text_frame.paragraphs[0]
+        p.text = region
+        p.alignment = PP_ALIGN.CENTER
+        p.font.size = Pt(14)
+        p.font.bold = True
+        p.font.color.rgb = WHITE
+
+        box = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, left, Inches(1.7),
+                                     Inches(2.2), Inches(2.9))
+        box.fill.solid()
+        box.fill.fore_color.rgb = CODE_BG
+        box.line.color.rgb = ACCENT_ORANGE if current else LIGHT_GRAY
+        tf = box.text_frame
+        tf.word_wrap = True
+        tf.vertical_anchor = MSO_ANCHOR.TOP
+        entries = step["queues"][region] or ["(empty)"]
+        for j, entry in enumerate(entries[:8]):
+            p = tf.paragraphs[0] if j == 0 else tf.add_paragraph()
+            p.text = entry if j < 7 else f"... {len(entries) - 7} more"
+            p.font.size = Pt(9)
+            p.font.name = "Consolas"
+            running = current and j == 0 and step.get("running") == entry
+            p.font.bold = running
+            p.font.color.rgb = (ACCENT_ORANGE if running else
+                                MEDIUM_GRAY if entry == "(empty)" else BLACK)
+
+    values = "   ".join(f"{name}={value}" for name, value in step["values"].items())
+    box = slide.shapes.add_textbox(Inches(0.3), Inches(4.75), Inches(9.4), Inches(0.5))
+    box.text_frame.word_wrap = True
+    p = box.text_frame.paragraphs[0]
+    p.text = f"t={step['time']}:  {values}"
+    p.font.size = Pt(11)
+    p.font.name = "Consolas"
+    p.font.color.rgb = DARK_BLUE
+
+    box = slide.shapes.add_textbox(Inches(0.3), Inches(5.35), Inches(9.4), Inches(1.5))
+    tf = box.text_frame
+    for j, line in enumerate(["// Output so far:"] + list(step["output"])):
+        p = tf.paragraphs[0] if j == 0 else tf.add_paragraph()
+        p.text = line if j == 0 else f"// {line}"
+        p.font.size = Pt(10)
+        p.font.name = "Consolas"
+        p.font.bold = j == 0
+        p.font.color.rgb = OUTPUT_GREEN
+
+    _slide_done(slide, "regions", title, slide_num, caller)
+    return slide
+
+
+def add_table_slide(prs, title, header, rows, slide_num, caption=None):
+    """Add a native table, plus "(cont.)" slides past TABLE_PAGE_ROWS rows.
+
+    Pages are numbered from slide_num on; returns the last number used.
+    """
+    last = slide_num + max(1, -(-len(rows) // TABLE_PAGE_ROWS)) - 1
+    if hasattr(prs, "add_table_slide"):
+        prs.add_table_slide(title, header, rows, slide_num, caption)
+        return last
+    caller = _caller()
+    if PIPELINE is not None:
+        PIPELINE.submit(_build_table_slide, prs, title, header, rows,
+                        slide_num, caption, caller)
+        return last
+    _build_table_slide(prs, title, header, rows, slide_num, caption, caller)
+    return last
+
+
+@build_trace.traced("table slide", "shapes")
+def _build_table_slide(prs, title, header, rows, slide_num, caption, caller):
+    first = None
+    pages = [rows[i:i + TABLE_PAGE_ROWS]
+             for i in range(0, len(rows), TABLE_PAGE_ROWS)] or [[]]
+    for i, page in enumerate(pages):
+        page_title = title if i == 0 else f"{title} (cont.)"
+        slide = prs.slides.add_slide(prs.slide_layouts[BLANK_LAYOUT])
+        add_header_band(slide, page_title)
+        add_footer(slide, slide_num + i)
+
+        frame = slide.shapes.add_table(
+            len(page) + 1, len(header), Inches(0.5), Inches(1.3), Inches(9.0),
+            Inches(0.36) * (len(page) + 1))
+        table = frame.table
+        for r, values in enumerate([header] + page):
+            for c, value in enumerate(values):
+                cell = table.cell(r, c)
+                cell.fill.solid()
+                cell.fill.fore_color.rgb = (BLUE if r == 0 else
+                                            LIGHT_GRAY if r % 2 else WHITE)
+                cell.margin_top = cell.margin_bottom = Inches(0.03)
+                p = cell.text_frame.paragraphs[0]
+                p.text = str(value)
+                p.font.size = Pt(12 if r == 0 else 11)
+                p.font.bold = r == 0
+                p.font.color.rgb = WHITE if r == 0 else DARK_BLUE
+
+        if caption and i == len(pages) - 1:
+            box = slide.shapes.add_textbox(Inches(0.6), Inches(6.35), Inches(8.8),
+                                           Inches(0.4))
+            p = box.text_frame.paragraphs[0]
+            p.text = caption
+            p.alignment = PP_ALIGN.CENTER
+            p.font.size = Pt(11)
+            p.font.italic = True
+            p.font.color.rgb = MEDIUM_GRAY
+
+        _slide_done(slide, "table", page_title, slide_num + i, caller)
+        first = first or slide
+    return first
+
+
+def build_deck(prs, start=0):
+    """Add every slide of the deck to `prs`, numbering from `start` + 1.
+
+    Returns the number of the last slide added.
+    """
+    sn = start
+
+    # ================================================================
+    #  TITLE SLIDE
+    # ================================================================
+    sn += 1
+    add_title_slide(prs, "Section 2", "Ramy Osama", sn)
+
     # ================================================================
     #  COMPILATION, ELABORATION & SIMULATION PHASES
     # ================================================================
     sn += 1
     add_bullet_slide(prs, "Compilation, Elaboration & Simulation", [
-        "1. Compilation  (vlog -sv design.sv)",
+        "1. Compilation  (`vlog -sv design.sv`)",
         "    - Parses each source file independently",
         "    - Checks syntax and language rules (IEEE 1800)",
         "    - Converts source to an intermediate representation",
         "    - Errors: missing semicolons, undeclared variables, bad syntax",
         "",
-        "2. Elaboration  (vsim work.top_module)",
+        "2. Elaboration  (`vsim work.top_module`)",
         "    - Resolves the full module hierarchy and instantiation tree",
         "    - Evaluates parameters, generates parameterized instances",
         "    - Connects ports, checks width mismatches and unconnected ports",
         "    - Errors: missing modules, port count/type mismatches",
         "",
-        "3. Simulation  (run -all)",
+        "3. Simulation  (`run -all`)",
         "    - Executes the event-driven simulation model",
         "    - Processes initial, always, always_ff, always_comb blocks",
         "    - Advances simulation time, schedules events",
         "    - Errors: assertion failures, timeout, $fatal, x-propagation",
-    ], sn)
+    ], sn, code_spans=True)
 
     sn += 1
     add_bullet_slide(prs, "Simulator Flow - Phase by Phase", [
@@ -493,7 +1160,7 @@ def main():
     ], sn)
 
     sn += 1
-    add_code_slide(prs, "Step 1-2: Create Library & Compile", """
+    sn = add_code_slide(prs, "Step 1-2: Create Library & Compile", """
 # Step 1: Create a working library
 vlib work
 
@@ -511,7 +1178,7 @@ vlog -sv file1.sv file2.sv file3.sv
 """, None, sn, lang="tcl")
 
     sn += 1
-    add_code_slide(prs, "Step 3-4: Load Design & Run Simulation", """
+    sn = add_code_slide(prs, "Step 3-4: Load Design & Run Simulation", """
 # Load the top-level module for simulation
 vsim work.testbench
 
@@ -529,7 +1196,7 @@ run -all
 """, None, sn, lang="tcl")
 
     sn += 1
-    add_code_slide(prs, "Step 5: Debugging Commands", """
+    sn = add_code_slide(prs, "Step 5: Debugging Commands", """
 # Force a signal to a specific value
 force /testbench/rst 1 0, 0 100ns
 
@@ -544,7 +1211,7 @@ step
 """, None, sn, lang="tcl")
 
     sn += 1
-    add_code_slide(prs, "Complete Example: sim.do Script", """
+    sn = add_code_slide(prs, "Complete Example: sim.do Script", """
 # sim.do - Complete simulation script
 # Run with: do sim.do (in QuestaSim transcript)
 
@@ -562,24 +1229,24 @@ quit -sim
     sn += 1
     add_bullet_slide(prs, "QuestaSim - Modes of Operation", [
         "GUI Mode (default): Interactive windows, menus, and waveform viewer",
-        "    Invoke with:  vsim",
+        "    Invoke with:  `vsim`",
         "Command-line Mode: Interactive transcript, no graphical windows",
-        "    Invoke with:  vsim -c",
+        "    Invoke with:  `vsim -c`",
         "Batch Mode: Non-interactive, scripts only, for regression runs",
-        "    Invoke with:  vsim -c -do \"do sim.do; quit -f\"",
+        "    Invoke with:  `vsim -c -do \"do sim.do; quit -f\"`",
         "Use .do files (macro scripts) to automate repetitive tasks",
-    ], sn)
+    ], sn, code_spans=True)
 
     sn += 1
     add_bullet_slide(prs, "QuestaSim - Key Tips for Beginners", [
-        "Always create the library (vlib work) before compiling",
-        "Use -sv flag with vlog for SystemVerilog features",
-        "Use -voptargs=+acc with vsim for full signal visibility",
+        "Always create the library (`vlib work`) before compiling",
+        "Use `vlog -sv` for SystemVerilog features",
+        "Use `vsim -voptargs=+acc` for full signal visibility",
         "Save commands in .do files for repeatable simulations",
-        "Use 'add wave -r /*' to quickly view all signals",
+        "Use `add wave -r /*` to quickly view all signals",
         "Check the transcript window for compilation errors",
         "Use $display and $monitor in testbenches for text-based debug",
-    ], sn)
+    ], sn, code_spans=True)
 
     # ================================================================
     #  SECTION 5: LEXICAL CONVENTIONS
@@ -595,7 +1262,7 @@ quit -sim
     ], sn)
 
     sn += 1
-    add_code_slide(prs, "5.7 Number Formats & Literals", """
+    sn = add_code_slide(prs, "5.7 Number Formats & Literals", """
 // Sized literals
 $display("4'b1001   = %b (decimal %0d)", 4'b1001, 4'b1001);
 $display("8'hFF     = %h (decimal %0d)", 8'hFF, 8'hFF);
@@ -621,7 +1288,7 @@ $display("real = %f, string = %s (len=%0d)", r, s, s.len());
     "'1 = 11111111, '0 = 00000000", sn)
 
     sn += 1
-    add_code_slide(prs, "5.11 Operators Overview", """
+    sn = add_code_slide(prs, "5.11 Operators Overview", """
 logic [7:0] a = 8'hA5, b = 8'h3C;
 
 // Arithmetic
@@ -676,7 +1343,7 @@ $display("1 ? AA : 55 = %h", 1 ? 8'hAA : 8'h55);
     ], sn)
 
     sn += 1
-    add_code_slide(prs, "6.4 Integer Data Types", """
+    sn = add_code_slide(prs, "6.4 Integer Data Types", """
 // 2-state types: 0, 1 only (default = 0)
 bit       b;               // 1-bit
 byte      by = 127;        // signed 8-bit
@@ -703,7 +1370,7 @@ $display("logic[7:0] = %b (x and z)", l8);
     "logic[7:0] = xxxxzzzz", sn)
 
     sn += 1
-    add_code_slide(prs, "6.5 wire vs reg vs logic", """
+    sn = add_code_slide(prs, "6.5 wire vs reg vs logic", """
 //            assign  always_ff  always_comb  module port
 // wire:       YES      NO          NO        input/output
 // reg:        NO       YES         YES       output only
@@ -733,7 +1400,7 @@ $display("Use wire only when multiple drivers needed");
     "wire needed only for multi-driver buses", sn)
 
     sn += 1
-    add_code_slide(prs, "6.19 Enumerations", """
+    sn = add_code_slide(prs, "6.19 Enumerations", """
 typedef enum {IDLE, READ, WRITE, ERROR} state_t;
 
 typedef enum logic [2:0] {
@@ -765,7 +1432,7 @@ end while (st != st.first());
     "IDLE=0, READ=1, WRITE=2, ERROR=3", sn)
 
     sn += 1
-    add_code_slide(prs, "6.18 typedef & Constants", """
+    sn = add_code_slide(prs, "6.18 typedef & Constants", """
 // typedef: create named types
 typedef logic [7:0]  byte_t;
 typedef logic [31:0] word_t;
@@ -793,7 +1460,7 @@ $display("VERSION = %0d (const)", VERSION);
     "VERSION = 42", sn)
 
     sn += 1
-    add_code_slide(prs, "6.24 Casting & Scope Resolution", """
+    sn = add_code_slide(prs, "6.24 Casting & Scope Resolution", """
 // Static cast: type'(expression)
 int i = 42;
 real r = real'(i);
@@ -823,7 +1490,7 @@ if ($cast(c, 1))
     "$cast(1) = GREEN", sn)
 
     sn += 1
-    add_code_slide(prs, "6.20 Parameterized Types - Type Parameters", """
+    sn = add_code_slide(prs, "6.20 Parameterized Types - Type Parameters", """
 // Module with a type parameter (LRM 6.20.3)
 module generic_register #(parameter type T = logic [7:0])(
     input  logic clk, rst, en,
@@ -851,7 +1518,7 @@ $display("32-bit reg: q32 = %0d", q32);  // d32=123456
     "parameter type T: one module works for any type", sn)
 
     sn += 1
-    add_code_slide(prs, "6.25 Parameterized Data Types", """
+    sn = add_code_slide(prs, "6.25 Parameterized Data Types", """
 // Virtual class as a type container (LRM 6.25)
 virtual class C #(parameter type T = logic,
                   parameter int SIZE = 1);
@@ -897,7 +1564,7 @@ $display("Parameterized types avoid code duplication");
     ], sn)
 
     sn += 1
-    add_code_slide(prs, "3.2 Modules - Declaration & Instantiation", """
+    sn = add_code_slide(prs, "3.2 Modules - Declaration & Instantiation", """
 module adder (
     input  logic [7:0] a, b,
     output logic [8:0] sum
@@ -927,7 +1594,7 @@ counter #(.WIDTH(4)) u_cnt4 (
     "Parameters override with #(.NAME(val))", sn)
 
     sn += 1
-    add_code_slide(prs, "3.12 Interfaces - Signals & Modports", """
+    sn = add_code_slide(prs, "3.12 Interfaces - Signals & Modports", """
 interface bus_if;
     logic       valid;
     logic       ready;
@@ -956,7 +1623,7 @@ endmodule
     "master: drives valid/data, reads ready", sn)
 
     sn += 1
-    add_code_slide(prs, "3.13 Functions & Tasks", """
+    sn = add_code_slide(prs, "3.13 Functions & Tasks", """
 // Functions: no delays, return a value
 function automatic int factorial(int n);
     if (n <= 1) return 1;
@@ -981,7 +1648,7 @@ $display("factorial(0) = %0d", factorial(0));
     "Functions: combinational, Tasks: can have #delay", sn)
 
     sn += 1
-    add_code_slide(prs, "3.10 Packages - Reusable Definitions", """
+    sn = add_code_slide(prs, "3.10 Packages - Reusable Definitions", """
 package math_pkg;
     parameter int PI_INT = 3;
     typedef struct { int x; int y; } point_t;
@@ -1005,7 +1672,7 @@ endmodule
     "max(10,20) = 20\nPI = 3", sn)
 
     sn += 1
-    add_code_slide(prs, "3.14 Timeunits", """
+    sn = add_code_slide(prs, "3.14 Timeunits", """
 module timing_demo;
     timeunit 1ns;
     timeprecision 1ps;
@@ -1045,28 +1712,39 @@ endmodule
         "Race conditions occur when multiple blocks drive the same signal with =",
     ], sn)
 
-    sn += 1
-    add_code_slide(prs, "4.5 Blocking (=) vs Non-Blocking (<=)", """
+    # Output and region slides come from running the Section 4 example
+    # through the event-queue model rather than from a pasted transcript.
+    import sched_model
+    sim = sched_model.run_file(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                            "section_4", "4_scheduling", "4_scheduling.sv"),
+                               trace=(5, 5))
+    sched_output = [line for line in sim.output
+                    if line.startswith(("Blocking:", "Non-Blocking:"))]
+
+    with computed_by(sched_model):
+        sn += 1
+        sn = add_code_slide(prs, "4.5 Blocking (=) vs Non-Blocking (<=)", """
 // Blocking: sequential execution
 a = 1;
 b = a;   // sees a=1
 c = b;   // sees b=1
-$display("Blocking:     a=%b b=%b c=%b", a, b, c);
+$display("Blocking:     a=%b, b=%b, c=%b", a, b, c);
 
 // Non-blocking: all RHS sampled FIRST, then updated
 x <= 0;
 y <= x;  // samples OLD x (=1), schedules y=1
 z <= y;  // samples OLD y (=0), schedules z=0
 #1;
-$display("Non-Blocking: x=%b y=%b z=%b", x, y, z);
+$display("Non-Blocking: x=%b, y=%b, z=%b", x, y, z);
 
 // Pipeline (correct with <=)
 always @(posedge clk) pipe_a <= 8'hAA;
 always @(posedge clk) pipe_b <= pipe_a; // gets OLD pipe_a
 """,
-    "Blocking:     a=1 b=1 c=1\n"
-    "Non-Blocking: x=0 y=1 z=0\n"
-    "Use = in comb, <= in sequential logic", sn)
+        "\n".join(sched_output + ["Use = in comb, <= in sequential logic"]), sn)
+
+        sn = sched_model.region_slides(prs, sim, "4.5 Scheduling Regions",
+                                       add_regions_slide, sn)
 
     # ================================================================
     #  LAB: SECTION 4
@@ -1098,7 +1776,7 @@ always @(posedge clk) pipe_b <= pipe_a; // gets OLD pipe_a
 
     # ===== 7.2 STRUCTURES =====
     sn += 1
-    add_code_slide(prs, "7.2 Structures - Basic Declaration", """
+    sn = add_code_slide(prs, "7.2 Structures - Basic Declaration", """
 struct { bit [7:0] opcode; bit [23:0] addr; } IR;
 IR.opcode = 8'hAB;
 IR.addr   = 24'h123456;
@@ -1117,7 +1795,7 @@ $display("IR2.opcode = %h", IR2.opcode);
     "IR.opcode = ab\nIR.addr   = 123456\nIR2.opcode = ff", sn)
 
     sn += 1
-    add_code_slide(prs, "7.2.1 Packed Structures", """
+    sn = add_code_slide(prs, "7.2.1 Packed Structures", """
 struct packed signed {
     int       a;      // bits [63:32]
     shortint  b;      // bits [31:16]
@@ -1132,7 +1810,7 @@ $display("pack1[15:8] = %0h", pack1[15:8]); // same as c
     "pack1 as vector = 100020304\npack1[15:8] = 3 (same as pack1.c)", sn)
 
     sn += 1
-    add_code_slide(prs, "7.2.1 Packed Struct - ATM Header", """
+    sn = add_code_slide(prs, "7.2.1 Packed Struct - ATM Header", """
 typedef struct packed {
     bit [3:0]  GFC;
     bit [7:0]  VPI;
@@ -1153,7 +1831,7 @@ $display("Bit width = %0d bits", $bits(hdr));
     "Bit width = 38 bits", sn)
 
     sn += 1
-    add_code_slide(prs, "7.2.2 Assigning to Structures", """
+    sn = add_code_slide(prs, "7.2.2 Assigning to Structures", """
 typedef struct {
     int  addr;
     int  crc;
@@ -1174,7 +1852,7 @@ $display("p1.addr = %0d, p1.crc = %h", p1.addr, p1.crc);
 
     # ===== 7.3 UNIONS =====
     sn += 1
-    add_code_slide(prs, "7.3 Unions - Basic & Packed", """
+    sn = add_code_slide(prs, "7.3 Unions - Basic & Packed", """
 typedef union { int i; shortreal f; } num;
 num n;
 n.i = 42;       $display("n.i = %0d", n.i);
@@ -1196,7 +1874,7 @@ $display("wu.halves[0] = %h", wu.halves[0]);
 
     # ===== 7.4 ARRAYS =====
     sn += 1
-    add_code_slide(prs, "7.4 Packed vs Unpacked Arrays", """
+    sn = add_code_slide(prs, "7.4 Packed vs Unpacked Arrays", """
 bit [7:0] c1;            // packed array (vector)
 real u [7:0];            // unpacked array
 
@@ -1214,7 +1892,7 @@ int Array2[8][32];       // same thing using sizes
     "data32[3] = ca, data32[0] = be\ndata32 + 1 = cafebabf", sn)
 
     sn += 1
-    add_code_slide(prs, "7.4.4 Memories & 7.4.5 Multidimensional", """
+    sn = add_code_slide(prs, "7.4.4 Memories & 7.4.5 Multidimensional", """
 // Memory (1D array of reg/logic/bit)
 logic [7:0] mema [0:255];
 mema[5] = 8'hAA;
@@ -1234,7 +1912,7 @@ $display("joe[4][3]=%h, joe[4][2]=%h",
     "joe[4][3]=03, joe[4][2]=04", sn)
 
     sn += 1
-    add_code_slide(prs, "7.4.6 Indexing, Slicing, and Part-Select", """
+    sn = add_code_slide(prs, "7.4.6 Indexing, Slicing, and Part-Select", """
 logic [63:0] data = 64'h0123_4567_89AB_CDEF;
 $display("data[23:16] = %h", data[23:16]);
 
@@ -1253,7 +1931,7 @@ $display("bitvec[23-:8] = %h", bitvec[23 -: 8]);
     "bitvec[8+:8] = 98\nbitvec[23-:8] = ba", sn)
 
     sn += 1
-    add_code_slide(prs, "7.11 Array Querying Functions", """
+    sn = add_code_slide(prs, "7.11 Array Querying Functions", """
 logic [7:0] arr [3:0][2:0];
 
 $display("$left=%0d, $right=%0d", $left(arr,1), $right(arr,1));
@@ -1270,7 +1948,7 @@ $display("$increment=%0d", $increment(arr, 1));
 
     # ===== 7.5 DYNAMIC ARRAYS =====
     sn += 1
-    add_code_slide(prs, "7.5 Dynamic Arrays", """
+    sn = add_code_slide(prs, "7.5 Dynamic Arrays", """
 int arr[];
 arr = new[5];
 $display("arr.size() = %0d", arr.size());
@@ -1291,7 +1969,7 @@ dest2 = new[5](src);       // '{2, 3, 4, 0, 0} (padded)
     "dest1 = '{2, 3}\ndest2 = '{2, 3, 4, 0, 0}", sn)
 
     sn += 1
-    add_code_slide(prs, "7.5.2-7.5.3 size() and delete()", """
+    sn = add_code_slide(prs, "7.5.2-7.5.3 size() and delete()", """
 int arr[];
 arr = new[10];
 $display("size = %0d", arr.size());  // 10
@@ -1309,7 +1987,7 @@ $display("size = %0d", ab.size());   // 0
 
     # ===== 7.6 ARRAY ASSIGNMENTS =====
     sn += 1
-    add_code_slide(prs, "7.6 Array Assignments", """
+    sn = add_code_slide(prs, "7.6 Array Assignments", """
 int A[10:1], B[0:9];
 A = B;             // OK: same type and size (10 elements)
 $display("A[10]=%0d, A[9]=%0d", A[10], A[9]);
@@ -1329,7 +2007,7 @@ foreach (p[i]) $display("p[%0d] = %s", i, p[i]);
 
     # ===== 7.7 ARRAYS AS ARGUMENTS =====
     sn += 1
-    add_code_slide(prs, "7.7 Arrays as Arguments to Subroutines", """
+    sn = add_code_slide(prs, "7.7 Arrays as Arguments to Subroutines", """
 task print_matrix(int a[3:1][3:1]);
     foreach (a[i,j]) $display("a[%0d][%0d]=%0d", i, j, a[i][j]);
 endtask
@@ -1355,7 +2033,7 @@ endtask
 
     # ===== 7.8 ASSOCIATIVE ARRAYS =====
     sn += 1
-    add_code_slide(prs, "7.8 Associative Arrays", """
+    sn = add_code_slide(prs, "7.8 Associative Arrays", """
 integer i_array[*];          // wildcard index
 bit [20:0] arr_b[string];   // string index
 int scores[int];             // integral index
@@ -1380,7 +2058,7 @@ $display("a[1] = %0d", a[1]);
 
     # ===== 7.9 ASSOCIATIVE ARRAY METHODS =====
     sn += 1
-    add_code_slide(prs, "7.9 Associative Array Methods", """
+    sn = add_code_slide(prs, "7.9 Associative Array Methods", """
 int map[string];
 map["hello"]=1; map["sad"]=2; map["world"]=3;
 
@@ -1400,7 +2078,7 @@ $display("exists(nope) = %0d", map.exists("nope"));
     "exists(test) = 1, exists(nope) = 0", sn)
 
     sn += 1
-    add_code_slide(prs, "7.9 Traversal: first/last/next/prev", """
+    sn = add_code_slide(prs, "7.9 Traversal: first/last/next/prev", """
 int map[string];
 map["banana"]=2; map["apple"]=1;
 map["cherry"]=3; map["date"]=4;
@@ -1420,7 +2098,7 @@ if (map.last(s))
     "Reverse:  date=4, cherry=3, banana=2, apple=1", sn)
 
     sn += 1
-    add_code_slide(prs, "7.9.11 Associative Array Literals", """
+    sn = add_code_slide(prs, "7.9.11 Associative Array Literals", """
 // Literal with default value
 string words[int] = '{default: "hello"};
 $display("words[999] = %s", words[999]);
@@ -1442,7 +2120,7 @@ $display("tab[unknown] = %0d", tab["unknown"]);
 
     # ===== 7.10 QUEUES =====
     sn += 1
-    add_code_slide(prs, "7.10 Queues - Declaration & Operators", """
+    sn = add_code_slide(prs, "7.10 Queues - Declaration & Operators", """
 byte    q1[$];                // unbounded queue
 string  names[$] = {"Bob"};   // initialized
 integer Q[$] = {3, 2, 7};    // initialized
@@ -1461,7 +2139,7 @@ foreach (Q[i]) if (i>=1 && i<=2) $display("  [%0d]=%0d", i, Q[i]);
     "Q = '{3, 2, 7}", sn)
 
     sn += 1
-    add_code_slide(prs, "7.10.2 Queue Methods", """
+    sn = add_code_slide(prs, "7.10.2 Queue Methods", """
 int Q[$] = {10, 20, 30};
 int e;
 
@@ -1479,7 +2157,7 @@ Q.delete(2);         $display("delete(2): Q=%p", Q);
     "delete(2): '{10,15,30}", sn)
 
     sn += 1
-    add_code_slide(prs, "7.10.4 Queue via Assignment", """
+    sn = add_code_slide(prs, "7.10.4 Queue via Assignment", """
 int q[$] = {2, 4, 8};
 int e = 1;
 
@@ -1504,7 +2182,7 @@ q = {};            $display("clear: size = %0d", q.size());
 
     # ===== 7.12 ARRAY MANIPULATION =====
     sn += 1
-    add_code_slide(prs, "7.12.1 Array Locator Methods", """
+    sn = add_code_slide(prs, "7.12.1 Array Locator Methods", """
 int arr[] = '{10, 20, 30, 20, 40};
 int qi[$];
 
@@ -1522,7 +2200,7 @@ qi = arr.unique; $display("unique = %p", qi);
     "min='{10}, max='{40}, unique='{10,20,30,40}", sn)
 
     sn += 1
-    add_code_slide(prs, "7.12.2 Array Ordering Methods", """
+    sn = add_code_slide(prs, "7.12.2 Array Ordering Methods", """
 string s[] = '{"hello", "sad", "world"};
 s.reverse;    $display("reverse: %p", s);
 
@@ -1542,7 +2220,7 @@ c.sort(x) with ({x.blue, x.green});
     "shuffle: (random order)", sn)
 
     sn += 1
-    add_code_slide(prs, "7.12.3 Array Reduction Methods", """
+    sn = add_code_slide(prs, "7.12.3 Array Reduction Methods", """
 byte b[] = '{1, 2, 3, 4};
 
 $display("sum = %0d", b.sum);
@@ -1561,7 +2239,7 @@ $display("2D sum = %0d",
     "xor(item+4) = 12\n2D sum = 50", sn)
 
     sn += 1
-    add_code_slide(prs, "7.12.4 Iterator Index Querying", """
+    sn = add_code_slide(prs, "7.12.4 Iterator Index Querying", """
 int arr[] = '{0, 10, 2, 30, 4};
 int qi[$];
 
@@ -1604,11 +2282,226 @@ $display("Matching indices: %p", qi);
         "QuestaSim: vlib, vlog -sv, vsim, run -all, .do scripts",
     ], sn)
 
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-    prs.save(OUTPUT_FILE)
-    print(f"Presentation saved to: {OUTPUT_FILE}")
+    return sn
+
+
+# Module constants a template overrides, and their built-in values.
+_BRANDING = ("BLUE", "ACCENT_ORANGE", "DARK_BLUE", "LIGHT_GRAY", "WHITE",
+             "FONT", "TITLE_FONT", "FOOTER_TEXT", "BLANK_LAYOUT")
+_DEFAULT_BRANDING = {name: globals()[name] for name in _BRANDING}
+
+
+def use_template(path):
+    """Build later decks on the template .pptx at `path`; None restores the built-in style.
+
+    Colours, fonts, footer text and the blank layout come from the
+    template's cached style (see deck_template.py). The slide builders lay
+    out for SLIDE_WIDTH x SLIDE_HEIGHT, so the template must use that size.
+    """
+    global TEMPLATE
+    branding = dict(_DEFAULT_BRANDING)
+    template = None
+    if path is not None:
+        import deck_template
+        template = deck_template.load(path)
+        style = template.style
+        width, height = style["slide_size"]
+        if (width, height) != (SLIDE_WIDTH, SLIDE_HEIGHT):
+            raise ValueError(
+                f"slides are {Emu(width).inches:g} x {Emu(height).inches:g} in, "
+                f"the deck is laid out for {SLIDE_WIDTH.inches:g} x {SLIDE_HEIGHT.inches:g} in")
+        branding.update((name, RGBColor.from_string(value))
+                        for name, value in style["colors"].items())
+        branding.update(style["fonts"])
+        branding["FOOTER_TEXT"] = style["footer"] or branding["FOOTER_TEXT"]
+        branding["BLANK_LAYOUT"] = style["blank_layout"]
+
+    recolor = {globals()[name]: branding[name] for name in _BRANDING
+               if isinstance(branding[name], RGBColor)}
+    for kind, (color, bold, size) in BULLET_STYLES.items():
+        BULLET_STYLES[kind] = (recolor.get(color, color), bold, size)
+    globals().update(branding)
+    TEMPLATE = template
+
+
+def new_presentation():
+    """Return an empty Presentation on TEMPLATE (or python-pptx's default) at deck size."""
+    prs = TEMPLATE.presentation() if TEMPLATE is not None else Presentation()
+    prs.slide_width = SLIDE_WIDTH
+    prs.slide_height = SLIDE_HEIGHT
+    return prs
+
+
+def build(output_file=OUTPUT_FILE, profile="default", writer="stream",
+          repeat=1, chunk_size=None, pipeline=False, template=None):
+    """Build the deck into `output_file` and return the slide count.
+
+    `writer` is "stream" for pptx_writer.StreamingPackageWriter or
+    "python-pptx" for a plain prs.save(), which ignores the profile's
+    compresslevel. `chunk_size` (stream only) frees each batch of that
+    many slides once written, keeping memory flat.
+    `pipeline` lays out code slides on a slide_pipeline.SlidePipeline
+    process pool while shapes are built; it is experimental and not a
+    speedup. `repeat` concatenates that many copies of the deck, for
+    benchmarking large builds. `template` is a .pptx to build on (see
+    use_template).
+    """
+    global HIGHLIGHT, PIPELINE
+    settings = BUILD_PROFILES[profile]
+    HIGHLIGHT = settings["highlight"]
+
+    if template is not None:
+        use_template(template)
+    prs = new_presentation()
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+    hooks = [slide_deps.DependencyRecorder(__file__)]
+    if writer == "stream":
+        hooks.append(pptx_writer.StreamingPackageWriter(
+            output_file, settings["compresslevel"], chunk_size=chunk_size))
+
+    SLIDE_HOOKS.extend(hooks)
+    if pipeline:
+        PIPELINE = slide_pipeline.SlidePipeline()
+    try:
+        sn = 0
+        with build_trace.span("build_deck", repeat=repeat, pipeline=pipeline):
+            for _ in range(repeat):
+                sn = build_deck(prs, sn)
+            if PIPELINE is not None:
+                PIPELINE.close()
+    except BaseException:
+        if PIPELINE is not None:
+            PIPELINE.cancel()
+        if writer == "stream":
+            hooks[-1].abort()
+        raise
+    finally:
+        PIPELINE = None
+        del SLIDE_HOOKS[-len(hooks):]
+        HIGHLIGHT = True
+        if template is not None:
+            use_template(None)
+
+    with build_trace.span("serialize", writer=writer):
+        if writer == "stream":
+            hooks[-1].close(prs)
+        else:
+            prs.save(output_file)
+    hooks[0].save(slide_deps.sidecar_path(output_file))
+    return len(prs.slides)
+
+
+def _finish_trace(path):
+    events, processes = build_trace.finish(path)
+    print(f"Trace saved to: {path} ({events} events from {processes} processes)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--backend", choices=["pptx", "html"], default="pptx",
+                        help="html writes a static preview (see html_preview.py)")
+    parser.add_argument("--profile", choices=sorted(BUILD_PROFILES),
+                        default="default")
+    parser.add_argument("--writer", choices=["stream", "python-pptx"],
+                        default="stream",
+                        help="python-pptx saves with its own zip settings and "
+                             "ignores the profile's compresslevel")
+    parser.add_argument("--chunk-size", type=int, default=None,
+                        help="low-memory mode: free every N written slides")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="experimental: lay out code slides on a worker "
+                             "pool; not faster than the default build")
+    parser.add_argument("--budgets", default=None,
+                        help="JSON file of per-slide budgets (see deck_report.py)")
+    parser.add_argument("--pdf", action="store_true",
+                        help="also export a PDF (see pdf_export.py)")
+    parser.add_argument("--preprocess", action="store_true",
+                        help="also check that every .sv under codes/ preprocesses "
+                             "(see sv_preprocess.py)")
+    parser.add_argument("--verify", metavar="SIM", default=None,
+                        help="check code slide outputs with a simulator "
+                             "(see verify_outputs.py)")
+    parser.add_argument("--template", default=None,
+                        help="university .pptx to take masters, theme and colours from "
+                             "(see deck_template.py)")
+    parser.add_argument("--trace", metavar="JSON", default=None,
+                        help="write a Chrome trace of every stage and worker "
+                             "(see build_trace.py)")
+    parser.add_argument("-o", "--output", default=None)
+    args = parser.parse_args()
+
+    if args.trace:
+        build_trace.start()
+        atexit.register(_finish_trace, args.trace)
+
+    if args.template:
+        try:
+            use_template(args.template)
+        except (OSError, KeyError, ValueError) as exc:
+            print(f"{args.template}: {exc}", file=sys.stderr)
+            sys.exit(1)
+
+    if args.backend == "html":
+        import html_preview
+        output = args.output or html_preview.OUTPUT_FILE
+        count = html_preview.build(output, args.profile, template=args.template)
+        print(f"Preview saved to: {output}")
+        print(f"Total slides: {count}")
+        return
+
+    args.output = args.output or OUTPUT_FILE
+    if args.chunk_size and args.writer != "stream":
+        parser.error("--chunk-size needs --writer stream")
+
+    sn = build(args.output, args.profile, args.writer,
+               chunk_size=args.chunk_size, pipeline=args.pipeline)
+    print(f"Presentation saved to: {args.output}")
+    print(f"Dependency graph saved to: {slide_deps.sidecar_path(args.output)}")
     print(f"Total slides: {sn}")
 
+    with build_trace.span("deck report"):
+        rows = deck_report.analyze(args.output)
+    problems = deck_report.check_budgets(rows, deck_report.load_budgets(args.budgets))
+    for problem in problems:
+        print(f"BUDGET EXCEEDED: {problem}", file=sys.stderr)
+    if problems:
+        sys.exit(1)
+    heaviest = max(rows, key=lambda r: r["xml_bytes"])
+    print(f"All slides within budget (heaviest: slide {heaviest['slide']}, "
+          f"{heaviest['xml_bytes']} XML bytes)")
+
+    if args.preprocess:
+        import sv_preprocess
+        t0 = datetime.datetime.now()
+        with build_trace.span("preprocess"):
+            results, errors, _ = sv_preprocess.preprocess_tree()
+        ms = (datetime.datetime.now() - t0).total_seconds() * 1000
+        for path, error in sorted(errors.items()):
+            print(f"PREPROCESS ERROR: {error}", file=sys.stderr)
+        if errors:
+            sys.exit(1)
+        print(f"Preprocessed {len(results)} SV files in {ms:.1f} ms")
+
+    if args.pdf:
+        import pdf_export
+        try:
+            with build_trace.span("pdf export"):
+                pdf, status = pdf_export.export([args.output])[args.output]
+        except (RuntimeError, pdf_export.subprocess.SubprocessError) as exc:
+            print(f"PDF export failed: {exc}", file=sys.stderr)
+            sys.exit(1)
+        print(f"PDF {status}: {pdf}")
+
+    if args.verify:
+        import verify_outputs
+        with build_trace.span("verify", sim=args.verify):
+            rows = verify_outputs.verify(
+                verify_outputs.SIMULATORS.get(args.verify, args.verify))
+        print(verify_outputs.format_report(rows))
+        if any(row["status"] in ("fail", "error") for row in rows):
+            sys.exit(1)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,344 @@
+"""
+Per-student feedback decks and a cohort summary from Verification_Grades.xlsx
+
+Streams the gradebook sheet with openpyxl in read-only mode (assessment
+columns are the headers with a maximum in parentheses, e.g.
+"Midterm (20)"), keeps only the score matrix in a NumPy array and
+computes per-assessment statistics from it. A second streaming pass hands
+one student row at a time to a process pool that renders and saves that
+student's deck, with at most a few rows in flight, so memory does not grow
+with the number of students.
+
+Each deck is keyed by a hash of the student's row and the cohort figures
+it shows (in Feedback/.state.json); a re-run skips students whose key is
+unchanged and whose deck still exists. The cohort deck (Cohort.pptx) has
+the statistics table and a score distribution chart per assessment.
+
+Usage:
+    python grade_decks.py                        # ../../Verification_Grades.xlsx
+    python grade_decks.py grades.xlsx --sheet main --workers 8
+    python grade_decks.py --force --only 1900361
+    python grade_decks.py --template asu.pptx    # theme and masters from a template
+    python grade_decks.py --force --trace grades.json   # Chrome trace of all workers
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import hashlib
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import generate_pptx as gp
+import build_trace
+
+DEFAULT_WORKBOOK = os.path.join(gp.OUTPUT_DIR, "..", "Verification_Grades.xlsx")
+OUTPUT_DIR = os.path.join(gp.OUTPUT_DIR, "Feedback")
+STATE_FILE = ".state.json"
+BINS = 10
+
+_MAX_RE = re.compile(r"^(.*?)\s*\(\s*(\d+(?:\.\d+)?)\s*\)\s*$")
+_UNSAFE_RE = re.compile(r"[^\w.-]+")
+
+
+def _code(value):
+    """Student code as text: 1900361.0 and "1900361 " both give "1900361"."""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def read_header(rows):
+    """Consume `rows` up to the header; return (column index per field, assessments).
+
+    Assessments are (column, name, maximum) for headers like "Quiz 1(5)".
+    """
+    for row in rows:
+        cells = [str(c).strip() if c is not None else "" for c in row]
+        if "Student Code" not in cells:
+            continue
+        fields = {"code": cells.index("Student Code"),
+                  "name": cells.index("Name") if "Name" in cells else None,
+                  "plan": cells.index("Plan") if "Plan" in cells else None}
+        assessments = []
+        for col, text in enumerate(cells):
+            m = _MAX_RE.match(text)
+            if m:
+                assessments.append((col, m.group(1), float(m.group(2))))
+        return fields, assessments
+    raise ValueError("no header row with a 'Student Code' column")
+
+
+def iter_students(workbook, sheet="main"):
+    """Yield the assessments, then (code, name, plan, scores) for each student row."""
+    from openpyxl import load_workbook
+
+    wb = load_workbook(workbook, read_only=True, data_only=True)
+    try:
+        rows = wb[sheet].iter_rows(values_only=True)
+        fields, assessments = read_header(rows)
+        yield assessments
+        for row in rows:
+            code = row[fields["code"]] if fields["code"] < len(row) else None
+            if code is None or _code(code) == "":
+                continue
+            scores = tuple(
+                float(row[col]) if col < len(row) and isinstance(row[col], (int, float))
+                else None for col, _, _ in assessments)
+            name = row[fields["name"]] if fields["name"] is not None else None
+            plan = row[fields["plan"]] if fields["plan"] is not None else None
+            yield _code(code), str(name or "").strip(), str(plan or "").strip(), scores
+    finally:
+        wb.close()
+
+
+def cohort_stats(assessments, scores):
+    """Per-assessment and total statistics of the (students x assessments) `scores`.
+
+    Missing scores are NaN; they count as 0 in totals only.
+    """
+    maxima = np.array([m for _, _, m in assessments])
+    totals = np.nansum(scores, axis=1)
+    taken = ~np.isnan(scores)
+    counts = taken.sum(axis=0)
+    with np.errstate(all="ignore"):
+        stats = {
+            "names": [name for _, name, _ in assessments],
+            "max": maxima.tolist(),
+            "count": counts.tolist(),
+            "missing": (len(scores) - counts).tolist(),
+            "mean": np.nanmean(scores, axis=0).tolist(),
+            "median": np.nanmedian(scores, axis=0).tolist(),
+            "std": np.nanstd(scores, axis=0).tolist(),
+            "min": np.nanmin(scores, axis=0).tolist(),
+            "full": (np.sum(scores >= maxima, axis=0) / np.maximum(counts, 1)).tolist(),
+        }
+    stats["students"] = len(scores)
+    stats["total_max"] = float(maxima.sum())
+    stats["total_mean"] = float(totals.mean()) if len(totals) else 0.0
+    stats["total_median"] = float(np.median(totals)) if len(totals) else 0.0
+    stats["totals_sorted"] = np.sort(totals).tolist()
+    return stats
+
+
+def percentile(stats, total):
+    """Share of the cohort (0-100) with a total at or below `total`."""
+    ranked = stats["totals_sorted"]
+    return 100.0 * np.searchsorted(ranked, total, side="right") / max(len(ranked), 1)
+
+
+def _row_key(row, stats, branding=None):
+    code, name, plan, scores = row
+    total = sum(s for s in scores if s is not None)
+    shown = [round(v, 1) for v in stats["mean"] + stats["median"]]
+    key = [code, name, plan, scores, shown, round(percentile(stats, total))]
+    if branding:
+        key.append(branding)
+    return hashlib.sha1(json.dumps(key).encode("utf-8")).hexdigest()
+
+
+def _fmt(value):
+    return "-" if value is None or value != value else f"{round(value, 2):g}"
+
+
+def build_student_slides(prs, row, stats, start=0):
+    """Add one student's feedback slides; return the last slide number."""
+    code, name, plan, scores = row
+    total = sum(s for s in scores if s is not None)
+    rank = percentile(stats, total)
+    sn = start + 1
+    gp.add_title_slide(prs, name or code, f"{code}  {plan}  -  Verification feedback", sn)
+
+    rows = [[label, _fmt(score), _fmt(maximum), f"{mean:.1f}", _fmt(median)]
+            for label, score, maximum, mean, median
+            in zip(stats["names"], scores, stats["max"], stats["mean"], stats["median"])]
+    rows.append(["Total", _fmt(total), _fmt(stats["total_max"]),
+                 f"{stats['total_mean']:.1f}", _fmt(stats["total_median"])])
+    sn += 1
+    sn = gp.add_table_slide(prs, "Your Scores", ["Assessment", "Score", "Max",
+                                                 "Cohort mean", "Cohort median"],
+                            rows, sn,
+                            f"Total {_fmt(total)} / {stats['total_max']:g}: at or above "
+                            f"{rank:.0f}% of {stats['students']} students")
+
+    mine = [None if s is None else 100.0 * s / m for s, m in zip(scores, stats["max"])]
+    cohort = [100.0 * mean / m for mean, m in zip(stats["mean"], stats["max"])]
+    sn += 1
+    gp.add_histogram_slide(prs, "You vs. the Cohort", stats["names"],
+                           {"You": mine, "Cohort mean": cohort}, sn,
+                           "Score as a percentage of each assessment's maximum")
+
+    strong, weak, missing = [], [], []
+    for label, score, maximum, mean in zip(stats["names"], scores, stats["max"],
+                                           stats["mean"]):
+        if score is None:
+            missing.append(label)
+        elif score >= mean:
+            strong.append(f"{label}: {_fmt(score)} / {maximum:g}")
+        else:
+            weak.append(f"{label}: {_fmt(score)} / {maximum:g} (cohort mean {mean:.1f})")
+    bullets = ["At or above the cohort mean:"] + [f"    - {s}" for s in strong or ["none"]]
+    bullets += ["Below the cohort mean:"] + [f"    - {s}" for s in weak or ["none"]]
+    if missing:
+        bullets += ["No score recorded:"] + [f"    - {s}" for s in missing]
+    sn += 1
+    gp.add_bullet_slide(prs, "Feedback", bullets, sn)
+    return sn
+
+
+def build_cohort_slides(prs, stats, start=0):
+    """Add the cohort statistics table and distribution charts; return the last slide number."""
+    sn = start + 1
+    gp.add_title_slide(prs, "Cohort Summary",
+                       f"{stats['students']} students, {len(stats['names'])} assessments", sn)
+    rows = [[label, _fmt(m), str(count), str(missing), f"{mean:.2f}", _fmt(median),
+             f"{std:.2f}", _fmt(low), f"{100 * full:.0f}%"]
+            for label, m, count, missing, mean, median, std, low, full
+            in zip(stats["names"], stats["max"], stats["count"], stats["missing"],
+                   stats["mean"], stats["median"], stats["std"], stats["min"],
+                   stats["full"])]
+    sn += 1
+    return gp.add_table_slide(prs, "Assessment Statistics",
+                              ["Assessment", "Max", "Scored", "Missing", "Mean", "Median",
+                               "Std", "Min", "Full marks"], rows, sn,
+                              f"Total mean {stats['total_mean']:.2f} / {stats['total_max']:g}, "
+                              f"median {stats['total_median']:g}")
+
+
+def _histogram(values, maximum, bins=BINS):
+    edges = np.linspace(0, maximum, bins + 1)
+    counts, _ = np.histogram(np.clip(values, 0, maximum), edges)
+    labels = [f"{lo:g}-{hi:g}" for lo, hi in zip(edges[:-1], edges[1:])]
+    return labels, counts.tolist()
+
+
+def add_distribution_slides(prs, stats, scores, start):
+    """Add one score distribution chart per assessment and one for the total."""
+    sn = start
+    columns = [(name, scores[:, i], m)
+               for i, (name, m) in enumerate(zip(stats["names"], stats["max"]))]
+    columns.append(("Total", np.nansum(scores, axis=1), stats["total_max"]))
+    for name, values, maximum in columns:
+        values = values[~np.isnan(values)]
+        labels, counts = _histogram(values, maximum)
+        sn += 1
+        gp.add_histogram_slide(prs, f"Distribution: {name}", labels,
+                               {"Students": counts}, sn,
+                               f"{len(values)} scores out of {maximum:g}", unit="")
+    return sn
+
+
+def _render_student(job):
+    row, stats, path = job
+    with build_trace.span("student deck", "render", code=row[0]):
+        prs = gp.new_presentation()
+        build_student_slides(prs, row, stats)
+        prs.save(path)
+    build_trace.flush(f"render worker {os.getpid()}")
+    return path
+
+
+def deck_path(out_dir, code):
+    return os.path.join(out_dir, _UNSAFE_RE.sub("_", code) + ".pptx")
+
+
+def generate(workbook=DEFAULT_WORKBOOK, sheet="main", out_dir=OUTPUT_DIR,
+             workers=None, force=False, only=None, template=None):
+    """Write the cohort deck and every changed student deck; return (built, skipped).
+
+    `template` is a .pptx the decks are built on (see gp.use_template); each
+    worker prepares it once, and changing it rebuilds every deck.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    gp.use_template(template)
+    branding = gp.TEMPLATE.sha256 if gp.TEMPLATE is not None else None
+    rows = iter_students(workbook, sheet)
+    assessments = next(rows)
+    scores = np.array([[np.nan if s is None else s for s in row[3]] for row in rows],
+                      dtype=float).reshape(-1, len(assessments))
+    stats = cohort_stats(assessments, scores)
+
+    with build_trace.span("cohort deck", "render"):
+        prs = gp.new_presentation()
+        sn = build_cohort_slides(prs, stats)
+        add_distribution_slides(prs, stats, scores, sn)
+        prs.save(os.path.join(out_dir, "Cohort.pptx"))
+
+    state_file = os.path.join(out_dir, STATE_FILE)
+    state = {}
+    if os.path.exists(state_file) and not force:
+        with open(state_file, encoding="utf-8") as f:
+            state = json.load(f)
+
+    built = skipped = 0
+    workers = workers or os.cpu_count() or 1
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers, initializer=gp.use_template,
+                             initargs=(template,)) as pool:
+        rows = iter_students(workbook, sheet)
+        next(rows)
+        for row in rows:
+            if only and row[0] not in only:
+                continue
+            path = deck_path(out_dir, row[0])
+            key = _row_key(row, stats, branding)
+            if state.get(row[0]) == key and os.path.exists(path):
+                skipped += 1
+                continue
+            pending.append((row[0], key, pool.submit(_render_student, (row, stats, path))))
+            while len(pending) > 2 * workers:
+                code, key, future = pending.popleft()
+                with build_trace.span("wait render", "render"):
+                    future.result()
+                state[code] = key
+                built += 1
+        for code, key, future in pending:
+            future.result()
+            state[code] = key
+            built += 1
+
+    with open(state_file, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=0, sort_keys=True)
+    return built, skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("workbook", nargs="?", default=DEFAULT_WORKBOOK)
+    parser.add_argument("--sheet", default="main")
+    parser.add_argument("-o", "--output-dir", default=OUTPUT_DIR)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--force", action="store_true",
+                        help="rebuild every deck, ignoring the saved row hashes")
+    parser.add_argument("--only", action="append", default=None, metavar="CODE",
+                        help="only this student (repeatable)")
+    parser.add_argument("--template", default=None,
+                        help="university .pptx to build the decks on")
+    parser.add_argument("--trace", metavar="JSON", default=None,
+                        help="write a Chrome trace of the parent and every worker")
+    args = parser.parse_args()
+
+    if args.trace:
+        build_trace.start()
+
+    t0 = time.perf_counter()
+    try:
+        built, skipped = generate(args.workbook, args.sheet, args.output_dir,
+                                  args.workers, args.force, args.only, args.template)
+    except (ValueError, KeyError, OSError) as exc:
+        print(f"{args.workbook}: {exc}", file=sys.stderr)
+        sys.exit(1)
+    print(f"Feedback decks in {args.output_dir}: {built} built, {skipped} unchanged "
+          f"({time.perf_counter() - t0:.1f} s)")
+    if args.trace:
+        events, processes = build_trace.finish(args.trace)
+        print(f"Trace saved to: {args.trace} ({events} events from {processes} processes)")
+
+
+if __name__ == "__main__":
+    main()
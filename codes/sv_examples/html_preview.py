@@ -0,0 +1,366 @@
+"""
+Static HTML preview of the deck, without python-pptx
+
+HtmlDeck implements the same slide API as generate_pptx.py (title, bullet,
+code, waveform, chart, table and region slides with the header band and footer), so
+build_deck() renders into it unchanged. Code boxes reuse
+generate_pptx.layout_code(), so the tokenizers, run coalescing and
+pagination are shared with the .pptx; each TOKEN_STYLES category becomes
+one CSS class. Slides are laid out at their real size in inches and
+written to a single self-contained .html file.
+
+Usage:
+    python html_preview.py                      # ../../Presentations/Section2.html
+    python generate_pptx.py --backend html
+"""
+
+import os
+import html
+import argparse
+
+import generate_pptx as gp
+
+OUTPUT_FILE = os.path.splitext(gp.OUTPUT_FILE)[0] + ".html"
+
+
+def _hex(color):
+    return f"#{color}"
+
+
+def _inches(length):
+    return f"{length / 914400:.2f}in"
+
+
+def _token_css():
+    rules = []
+    for category, (color, bold, italic) in gp.TOKEN_STYLES.items():
+        rules.append(
+            f".tok-{category}{{color:{_hex(color)};"
+            f"font-weight:{'bold' if bold else 'normal'};"
+            f"font-style:{'italic' if italic else 'normal'}}}")
+    return "\n".join(rules)
+
+
+def stylesheet():
+    """CSS for the slide frame, the header/footer and one class per token category."""
+    return f"""
+body{{background:#666;margin:0;padding:24px;font-family:'{gp.FONT}',Carlito,sans-serif}}
+.slide{{position:relative;width:{_inches(gp.SLIDE_WIDTH)};height:{_inches(gp.SLIDE_HEIGHT)};
+  margin:0 auto 24px;background:#fff;overflow:hidden;box-shadow:0 2px 8px #0008}}
+.abs{{position:absolute;margin:0}}
+.band{{left:0;top:0;width:100%;height:1in;background:{_hex(gp.BLUE)}}}
+.accent{{left:0;top:1in;width:100%;height:.06in;background:{_hex(gp.ACCENT_ORANGE)}}}
+.title{{left:.5in;top:.15in;width:9in;font-size:28pt;font-weight:bold;color:{_hex(gp.WHITE)}}}
+.foot{{top:7in;font-size:9pt;color:#808080}}
+.bullets{{left:.6in;top:1.3in;width:8.8in}}
+.bullets p{{margin:0 0 4pt}}
+.code{{left:.4in;top:1.3in;width:9.2in;height:5.5in;box-sizing:border-box;
+  padding:.1in .15in;background:{_hex(gp.CODE_BG)};border:1pt solid #ccc;border-radius:.15in;
+  font-family:Consolas,'DejaVu Sans Mono',monospace;font-size:11pt;white-space:pre-wrap}}
+.code p{{margin:0 0 1pt;min-height:1.2em}}
+.out{{color:{_hex(gp.OUTPUT_GREEN)};font-size:10pt}}
+.table{{left:.5in;top:1.3in;width:9in;border-collapse:collapse;font-size:11pt;
+  color:{_hex(gp.DARK_BLUE)}}}
+.table th{{background:{_hex(gp.BLUE)};color:{_hex(gp.WHITE)};font-size:12pt;text-align:left}}
+.table th,.table td{{padding:.03in .1in;height:.3in}}
+.table tr:nth-child(even) td{{background:{_hex(gp.LIGHT_GRAY)}}}
+.cover{{left:0;top:0;width:100%;height:100%;background:{_hex(gp.BLUE)}}}
+{_token_css()}
+"""
+
+
+def add_header_band(out, title_text):
+    out.append('<div class="abs band"></div><div class="abs accent"></div>'
+               f'<p class="abs title">{html.escape(title_text)}</p>')
+
+
+def add_footer(out, slide_num):
+    out.append(
+        f'<p class="abs foot" style="left:.3in">{gp.TODAY}</p>'
+        '<p class="abs foot" style="left:2.5in;width:5in;text-align:center;'
+        f'font-style:italic">{html.escape(gp.FOOTER_TEXT)}</p>'
+        f'<p class="abs foot" style="left:8.5in;width:1.2in;text-align:right">'
+        f'{slide_num}</p>')
+
+
+def add_code_box(out, page):
+    """Append one layout_code() page as a code box."""
+    lines, output = page
+    out.append('<div class="abs code">')
+    for runs in lines:
+        out.append("<p>")
+        for text, category in runs:
+            out.append(f'<span class="tok-{category}">{html.escape(text)}</span>')
+        out.append("</p>")
+    if output:
+        out.append('<p class="out" style="margin-top:6pt;font-weight:bold">'
+                   '// Simulation Output:</p>')
+        for line in output:
+            out.append(f'<p class="out">// {html.escape(line)}</p>')
+    out.append("</div>")
+
+
+class HtmlDeck:
+    """String-buffer deck that the generate_pptx add_*_slide functions render into."""
+
+    def __init__(self, highlight=True):
+        self.highlight = highlight
+        self.slides = []
+        self.titles = []
+
+    def _slide(self, title, body):
+        self.slides.append(f'<section class="slide">{"".join(body)}</section>\n')
+        self.titles.append(title)
+
+    def add_title_slide(self, title, subtitle, slide_num):
+        self._slide(title, [
+            '<div class="abs cover"></div>',
+            '<div class="abs" style="left:1in;top:2.2in;width:8in;text-align:center">',
+            f'<p style="font-size:52pt;font-weight:bold;color:{_hex(gp.WHITE)}">'
+            f'{html.escape(title)}</p>',
+            f'<p style="margin-top:40pt;font-size:28pt;color:#CCDDFF">'
+            f'{html.escape(subtitle)}</p></div>',
+            '<p class="abs" style="left:1in;top:5.5in;width:8in;text-align:center;'
+            'font-size:16pt;font-style:italic;color:#AACCFF">'
+            f'{html.escape(gp.FOOTER_TEXT)}</p>',
+        ])
+
+    def add_bullet_slide(self, title, bullets, slide_num, code_spans=False):
+        body = []
+        add_header_band(body, title)
+        add_footer(body, slide_num)
+        body.append('<div class="abs bullets">')
+        for level, kind, runs in gp.parse_outline(bullets, self.highlight, code_spans):
+            if kind == "blank":
+                body.append('<p style="font-size:4pt;margin-bottom:2pt">&nbsp;</p>')
+                continue
+            color, bold, size = gp.BULLET_STYLES[kind]
+            style = (f"color:{_hex(color)};font-size:{size.pt:g}pt;"
+                     f"font-weight:{'bold' if bold else 'normal'}")
+            if level:
+                style += f";margin-left:{_inches(gp.BULLET_INDENT * level)}"
+            spans = []
+            for text, category in runs:
+                if category is None:
+                    spans.append(html.escape(text))
+                else:
+                    spans.append(f'<span class="tok-{category}" style="font-family:Consolas,'
+                                 f"'DejaVu Sans Mono',monospace;font-size:{size.pt - 1:g}pt\">"
+                                 f"{html.escape(text)}</span>")
+            body.append(f'<p style="{style}">{"".join(spans)}</p>')
+        body.append("</div>")
+        self._slide(title, body)
+
+    def add_code_slide(self, title, code, output, slide_num, lang="sv"):
+        pages = gp.layout_code(code, output, lang, self.highlight)
+        for i, page in enumerate(pages):
+            body = []
+            page_title = title if i == 0 else f"{title} (cont.)"
+            add_header_band(body, page_title)
+            add_footer(body, slide_num + i)
+            add_code_box(body, page)
+            self._slide(page_title, body)
+
+    def add_waveform_slide(self, title, rows, slide_num, window, time_unit=""):
+        body = []
+        add_header_band(body, title)
+        add_footer(body, slide_num)
+        start, end = window
+        left, right, top, bottom = 2.0, 9.6, 1.4, 6.5
+        pitch = min(0.6, (bottom - top) / max(len(rows), 1))
+        swing = pitch * 0.6
+
+        def x_at(t):
+            return left + (right - left) * (t - start) / max(end - start, 1)
+
+        body.append(f'<svg class="abs" style="left:0;top:0" width="10in" height="7.5in" '
+                    f'viewBox="0 0 10 7.5" font-family="Consolas,monospace">')
+        for i, row in enumerate(rows):
+            y_low = top + i * pitch + (pitch + swing) / 2
+            y_high = y_low - swing
+            body.append(f'<text x="1.9" y="{y_low - swing / 4:.3f}" font-size=".15" '
+                        f'text-anchor="end" fill="{_hex(gp.DARK_BLUE)}">'
+                        f'{html.escape(row["name"].rsplit(".", 1)[-1])}</text>')
+            if row["width"] == 1:
+                levels = {"0": y_low, "1": y_high}
+                points = []
+                for t0, t1, label in row["segments"]:
+                    y = levels.get(label, (y_low + y_high) / 2)
+                    points += [f"{x_at(t0):.3f},{y:.3f}", f"{x_at(t1):.3f},{y:.3f}"]
+                    if label is None:
+                        body.append(f'<rect x="{x_at(t0):.3f}" y="{y_high:.3f}" '
+                                    f'width="{x_at(t1) - x_at(t0):.3f}" height="{swing:.3f}" '
+                                    f'fill="{_hex(gp.LIGHT_GRAY)}"/>')
+                body.append(f'<polyline points="{" ".join(points)}" fill="none" '
+                            f'stroke="{_hex(gp.BLUE)}" stroke-width=".02"/>')
+                continue
+            for t0, t1, label in row["segments"]:
+                x0, x1 = x_at(t0), x_at(t1)
+                fill = gp.CODE_BG if label not in (None, "x", "z") else gp.LIGHT_GRAY
+                stroke = gp.ACCENT_ORANGE if label == "x" else gp.BLUE
+                body.append(f'<rect x="{x0:.3f}" y="{y_high:.3f}" width="{x1 - x0:.3f}" '
+                            f'height="{swing:.3f}" fill="{_hex(fill)}" '
+                            f'stroke="{_hex(stroke)}" stroke-width=".01"/>')
+                if label is not None and x1 - x0 > 0.25:
+                    body.append(f'<text x="{(x0 + x1) / 2:.3f}" '
+                                f'y="{y_low - swing / 3:.3f}" font-size=".12" '
+                                f'text-anchor="middle">{html.escape(label)}</text>')
+        for k in range(6):
+            t = start + (end - start) * k // 5
+            body.append(f'<text x="{x_at(t):.3f}" y="{bottom + 0.2:.3f}" font-size=".12" '
+                        f'text-anchor="middle" fill="#555555">{t}{html.escape(time_unit)}</text>')
+        body.append("</svg>")
+        self._slide(title, body)
+
+    def add_histogram_slide(self, title, labels, series, slide_num, caption=None,
+                            unit="%"):
+        body = []
+        add_header_band(body, title)
+        add_footer(body, slide_num)
+        colors = [gp.BLUE, gp.ACCENT_ORANGE, gp.SECTION_TEAL, gp.LITERAL_PURPLE]
+        left, right, top, bottom = 1.0, 9.4, 1.6, 5.9
+        peak = max((v for values in series.values() for v in values if v is not None),
+                   default=1) or 1
+        slot = (right - left) / max(len(labels), 1)
+        bar = slot * 0.8 / max(len(series), 1)
+
+        def fmt(value):
+            return f"{value:.1f}{unit}" if unit else f"{value:.0f}"
+
+        body.append('<svg class="abs" style="left:0;top:0" width="10in" height="7.5in" '
+                    'viewBox="0 0 10 7.5" font-family="Calibri,Carlito,sans-serif">')
+        body.append(f'<line x1="{left}" y1="{bottom}" x2="{right}" y2="{bottom}" '
+                    'stroke="#808080" stroke-width=".01"/>')
+        for s, (name, values) in enumerate(series.items()):
+            color = _hex(colors[s % len(colors)])
+            for i, value in enumerate(values):
+                if value is None:
+                    continue
+                height = (bottom - top) * value / peak
+                x = left + i * slot + slot * 0.1 + s * bar
+                body.append(f'<rect x="{x:.3f}" y="{bottom - height:.3f}" width="{bar:.3f}" '
+                            f'height="{height:.3f}" fill="{color}"><title>'
+                            f'{html.escape(name)}: {fmt(value)}</title></rect>')
+                if len(labels) <= 16:
+                    body.append(f'<text x="{x + bar / 2:.3f}" y="{bottom - height - .05:.3f}" '
+                                f'font-size=".11" text-anchor="middle">{fmt(value)}</text>')
+            if len(series) > 1:
+                body.append(f'<rect x="{left + s * 1.8:.2f}" y="1.3" width=".15" height=".15" '
+                            f'fill="{color}"/><text x="{left + s * 1.8 + .2:.2f}" y="1.43" '
+                            f'font-size=".14">{html.escape(name)}</text>')
+        for i, label in enumerate(labels):
+            body.append(f'<text x="{left + (i + .5) * slot:.3f}" y="{bottom + .2:.3f}" '
+                        f'font-size=".12" text-anchor="middle">{html.escape(label)}</text>')
+        if caption:
+            body.append(f'<text x="5" y="6.55" font-size=".15" font-style="italic" '
+                        f'text-anchor="middle" fill="#555555">{html.escape(caption)}</text>')
+        body.append("</svg>")
+        self._slide(title, body)
+
+    def add_table_slide(self, title, header, rows, slide_num, caption=None):
+        pages = [rows[i:i + gp.TABLE_PAGE_ROWS]
+                 for i in range(0, len(rows), gp.TABLE_PAGE_ROWS)] or [[]]
+        for i, page in enumerate(pages):
+            body = []
+            page_title = title if i == 0 else f"{title} (cont.)"
+            add_header_band(body, page_title)
+            add_footer(body, slide_num + i)
+            body.append('<table class="abs table"><tr>')
+            body.extend(f"<th>{html.escape(str(h))}</th>" for h in header)
+            body.append("</tr>")
+            for values in page:
+                body.append("<tr>")
+                body.extend(f"<td>{html.escape(str(v))}</td>" for v in values)
+                body.append("</tr>")
+            body.append("</table>")
+            if caption and i == len(pages) - 1:
+                body.append('<p class="abs" style="left:.6in;top:6.35in;width:8.8in;'
+                            'text-align:center;font-size:11pt;font-style:italic;'
+                            f'color:#555555">{html.escape(caption)}</p>')
+            self._slide(page_title, body)
+
+    def add_regions_slide(self, title, step, slide_num):
+        body = []
+        add_header_band(body, title)
+        add_footer(body, slide_num)
+        for i, region in enumerate(("Active", "Inactive", "NBA", "Postponed")):
+            current = region == step["region"]
+            color = _hex(gp.ACCENT_ORANGE if current else gp.BLUE)
+            left = 0.3 + i * 2.37
+            body.append(f'<p class="abs" style="left:{left:.2f}in;top:1.3in;width:2.2in;'
+                        f'height:.4in;line-height:.4in;background:{color};text-align:center;'
+                        f'font-size:14pt;font-weight:bold;color:{_hex(gp.WHITE)}">{region}</p>')
+            border = _hex(gp.ACCENT_ORANGE if current else gp.LIGHT_GRAY)
+            body.append(f'<div class="abs" style="left:{left:.2f}in;top:1.7in;width:2.2in;'
+                        f'height:2.9in;box-sizing:border-box;padding:.05in;'
+                        f'background:{_hex(gp.CODE_BG)};border:1pt solid {border};'
+                        "font-family:Consolas,'DejaVu Sans Mono',monospace;font-size:9pt\">")
+            entries = step["queues"][region] or ["(empty)"]
+            for j, entry in enumerate(entries[:8]):
+                text = entry if j < 7 else f"... {len(entries) - 7} more"
+                running = current and j == 0 and step.get("running") == entry
+                style = ("font-weight:bold;color:" + _hex(gp.ACCENT_ORANGE) if running
+                         else "color:#555555" if entry == "(empty)" else "")
+                body.append(f'<p style="margin:0 0 2pt;{style}">{html.escape(text)}</p>')
+            body.append("</div>")
+        values = "   ".join(f"{name}={value}" for name, value in step["values"].items())
+        body.append('<p class="abs" style="left:.3in;top:4.75in;width:9.4in;font-size:11pt;'
+                    f"font-family:Consolas,'DejaVu Sans Mono',monospace;"
+                    f'color:{_hex(gp.DARK_BLUE)}">t={step["time"]}:  {html.escape(values)}</p>')
+        body.append('<div class="abs code" style="top:5.35in;height:1.5in;background:none;'
+                    'border:none">')
+        body.append('<p class="out" style="font-weight:bold">// Output so far:</p>')
+        for line in step["output"]:
+            body.append(f'<p class="out">// {html.escape(line)}</p>')
+        body.append("</div>")
+        self._slide(title, body)
+
+    def html(self, title="Section 2"):
+        return "".join([
+            f"<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\">"
+            f"<title>{html.escape(title)}</title><style>{stylesheet()}</style>"
+            "</head><body>\n",
+            *self.slides,
+            "</body></html>\n",
+        ])
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.html())
+
+
+def build(output_file=OUTPUT_FILE, profile="default", repeat=1, template=None):
+    """Render the deck to a static HTML file and return the slide count.
+
+    `template` takes colours, fonts and footer text from a .pptx (see
+    gp.use_template); its masters have no HTML rendering.
+    """
+    deck = HtmlDeck(highlight=gp.BUILD_PROFILES[profile]["highlight"])
+    if template is not None:
+        gp.use_template(template)
+    try:
+        sn = 0
+        for _ in range(repeat):
+            sn = gp.build_deck(deck, sn)
+        os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+        deck.save(output_file)
+    finally:
+        if template is not None:
+            gp.use_template(None)
+    return len(deck.slides)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--profile", choices=sorted(gp.BUILD_PROFILES),
+                        default="default")
+    parser.add_argument("-o", "--output", default=OUTPUT_FILE)
+    args = parser.parse_args()
+
+    count = build(args.output, args.profile)
+    print(f"Preview saved to: {args.output}")
+    print(f"Total slides: {count}")
+
+
+if __name__ == "__main__":
+    main()
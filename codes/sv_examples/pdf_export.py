@@ -0,0 +1,310 @@
+"""
+Export generated decks to PDF with a pool of warm headless LibreOffice workers
+
+Each worker owns one soffice process with its own user profile, started
+once with a UNO socket so later conversions skip LibreOffice's cold start.
+Several decks convert concurrently, one per worker. A deck whose SHA-256
+matches the one recorded for its PDF is skipped, and workers only start
+once some deck needs converting.
+
+The UNO bridge ("uno" module, shipped with LibreOffice's Python or as
+python3-uno) is optional: without it every conversion runs
+`soffice --headless --convert-to pdf`, still in parallel and still with a
+per-worker profile, but paying the start-up cost each time.
+
+Usage:
+    python pdf_export.py ../../Presentations/Section2.pptx
+    python pdf_export.py deck1.pptx deck2.pptx --workers 4 --outdir pdf/
+    python generate_pptx.py --pdf
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import atexit
+import shutil
+import socket
+import hashlib
+import argparse
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import uno
+    from com.sun.star.beans import PropertyValue
+    from com.sun.star.connection import NoConnectException
+except ImportError:
+    uno = None
+
+import build_trace
+
+MANIFEST = ".pdf_export.json"
+START_TIMEOUT = 60
+CONVERT_TIMEOUT = 300
+
+
+def find_soffice():
+    """Return the path of the LibreOffice binary, or raise RuntimeError."""
+    for name in ("soffice", "libreoffice"):
+        path = shutil.which(name)
+        if path:
+            return path
+    raise RuntimeError("LibreOffice (soffice) not found on PATH")
+
+
+def file_hash(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _profile_url(path):
+    return "file://" + os.path.abspath(path).replace(os.sep, "/")
+
+
+def _prop(name, value):
+    p = PropertyValue()
+    p.Name = name
+    p.Value = value
+    return p
+
+
+class SofficeWorker:
+    """One headless soffice with a private profile; warm over UNO when available."""
+
+    def __init__(self, soffice, profile_dir):
+        self.soffice = soffice
+        self.profile_dir = profile_dir
+        self.proc = None
+        self.desktop = None
+        if uno is not None:
+            self._start()
+
+    def _base_cmd(self):
+        return [self.soffice, "--headless", "--invisible", "--nologo",
+                "--norestore", "--nodefault",
+                f"-env:UserInstallation={_profile_url(self.profile_dir)}"]
+
+    def _start(self):
+        port = _free_port()
+        self.proc = subprocess.Popen(
+            self._base_cmd()
+            + [f"--accept=socket,host=127.0.0.1,port={port};urp;StarOffice.ComponentContext"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        local = uno.getComponentContext()
+        resolver = local.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local)
+        deadline = time.monotonic() + START_TIMEOUT
+        while True:
+            try:
+                ctx = resolver.resolve(
+                    f"uno:socket,host=127.0.0.1,port={port};urp;StarOffice.ComponentContext")
+                break
+            except NoConnectException:
+                if time.monotonic() > deadline or self.proc.poll() is not None:
+                    self.close()
+                    raise RuntimeError("soffice did not start")
+                time.sleep(0.2)
+        self.desktop = ctx.ServiceManager.createInstanceWithContext(
+            "com.sun.star.frame.Desktop", ctx)
+
+    def convert(self, deck, pdf):
+        """Write `deck` as `pdf`."""
+        if self.desktop is None:
+            self._convert_cli(deck, pdf)
+            return
+        doc = self.desktop.loadComponentFromURL(
+            uno.systemPathToFileUrl(os.path.abspath(deck)), "_blank", 0,
+            (_prop("Hidden", True),))
+        try:
+            doc.storeToURL(uno.systemPathToFileUrl(os.path.abspath(pdf)),
+                           (_prop("FilterName", "impress_pdf_Export"),))
+        finally:
+            doc.close(True)
+
+    def _convert_cli(self, deck, pdf):
+        with tempfile.TemporaryDirectory() as tmp:
+            subprocess.run(
+                self._base_cmd() + ["--convert-to", "pdf", "--outdir", tmp, deck],
+                check=True, timeout=CONVERT_TIMEOUT,
+                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+            produced = os.path.join(
+                tmp, os.path.splitext(os.path.basename(deck))[0] + ".pdf")
+            if not os.path.exists(produced):
+                raise RuntimeError(f"soffice produced no PDF for {deck}")
+            shutil.move(produced, pdf)
+
+    def close(self):
+        if self.desktop is not None:
+            try:
+                self.desktop.terminate()
+            except Exception:
+                pass
+            self.desktop = None
+        if self.proc is not None:
+            try:
+                self.proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+            self.proc = None
+
+
+class PdfExporter:
+    """Pool of SofficeWorkers converting decks concurrently, skipping unchanged ones.
+
+    Workers start on the first export() with something to convert, no more
+    of them than there are decks to convert, and stay warm until close().
+    """
+
+    def __init__(self, workers=2, soffice=None):
+        self.soffice = soffice
+        self.nworkers = workers
+        self._profiles = None
+        self._idle = queue.Queue()
+        self._workers = []
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        with self._lock:
+            for worker in self._workers:
+                worker.close()
+            self._workers = []
+            self._idle = queue.Queue()
+            if self._profiles is not None:
+                shutil.rmtree(self._profiles, ignore_errors=True)
+                self._profiles = None
+
+    def _start_workers(self, count):
+        """Start workers until min(count, nworkers) are running."""
+        with self._lock:
+            first = len(self._workers)
+            count = min(count, self.nworkers) - first
+            if count <= 0:
+                return
+            self.soffice = self.soffice or find_soffice()
+            if self._profiles is None:
+                self._profiles = tempfile.mkdtemp(prefix="soffice_profiles_")
+            with build_trace.span("start soffice", "export", workers=count):
+                with ThreadPoolExecutor(count) as pool:
+                    started = list(pool.map(
+                        lambda i: SofficeWorker(
+                            self.soffice, os.path.join(self._profiles, f"w{i}")),
+                        range(first, first + count)))
+            self._workers += started
+            for worker in started:
+                self._idle.put(worker)
+
+    def _convert(self, deck, pdf):
+        with build_trace.span("wait soffice", "export"):
+            worker = self._idle.get()
+        try:
+            with build_trace.span("convert", "export", deck=os.path.basename(deck)):
+                worker.convert(deck, pdf)
+        finally:
+            self._idle.put(worker)
+
+    def export(self, decks, outdir=None):
+        """Convert `decks` to PDF; return {deck: (pdf, "converted"|"unchanged")}.
+
+        The manifests are written even when a conversion fails, so decks
+        that did convert are not converted again.
+        """
+        jobs, results, manifests = [], {}, {}
+        for deck in decks:
+            target_dir = outdir or os.path.dirname(os.path.abspath(deck))
+            os.makedirs(target_dir, exist_ok=True)
+            pdf = os.path.join(
+                target_dir, os.path.splitext(os.path.basename(deck))[0] + ".pdf")
+            manifest = manifests.setdefault(target_dir, _load_manifest(target_dir))
+            digest = file_hash(deck)
+            if os.path.exists(pdf) and manifest.get(os.path.basename(pdf)) == digest:
+                results[deck] = (pdf, "unchanged")
+            else:
+                jobs.append((deck, pdf, digest, manifest))
+        if not jobs:
+            return results
+
+        try:
+            self._start_workers(len(jobs))
+            with ThreadPoolExecutor(self.nworkers) as pool:
+                futures = [(job, pool.submit(self._convert, job[0], job[1]))
+                           for job in jobs]
+                for (deck, pdf, digest, manifest), future in futures:
+                    future.result()
+                    manifest[os.path.basename(pdf)] = digest
+                    results[deck] = (pdf, "converted")
+        finally:
+            for target_dir, manifest in manifests.items():
+                _save_manifest(target_dir, manifest)
+        return results
+
+
+def _load_manifest(target_dir):
+    try:
+        with open(os.path.join(target_dir, MANIFEST), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_manifest(target_dir, manifest):
+    path = os.path.join(target_dir, MANIFEST)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+
+_SHARED = None
+
+
+def export(decks, outdir=None, workers=2):
+    """Convert `decks` on a pool shared by every call in this process.
+
+    See PdfExporter.export(); the pool grows to `workers` as needed and
+    its soffice processes are closed at exit.
+    """
+    global _SHARED
+    if _SHARED is None:
+        _SHARED = PdfExporter(workers)
+        atexit.register(_SHARED.close)
+    _SHARED.nworkers = max(_SHARED.nworkers, workers)
+    return _SHARED.export(decks, outdir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("decks", nargs="+")
+    parser.add_argument("--outdir", default=None,
+                        help="directory for the PDFs (default: next to each deck)")
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+
+    try:
+        results = export(args.decks, args.outdir, args.workers)
+    except (RuntimeError, subprocess.SubprocessError) as exc:
+        print(f"PDF export failed: {exc}", file=sys.stderr)
+        sys.exit(1)
+    for deck, (pdf, status) in results.items():
+        print(f"{status:>9}: {pdf}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,580 @@
+"""
+Full-text index of the course PDFs for pulling exam questions into slides
+
+Extracts the text of every PDF under Sheets/, Exams & Quizzes/ and
+Lecture Notes/ on a process pool and stores it, split into question-sized
+passages, in an sqlite FTS5 table (Presentations/.pdf_index.sqlite,
+porter-stemmed, so "associative array" also finds "arrays"). Updates are
+incremental: a file whose mtime and size are unchanged is skipped without
+reading it, and a changed one is only re-extracted when its SHA-256
+differs from the indexed one. Queries are one FTS lookup ranked by bm25.
+
+Text extraction needs no PDF library: the reader below handles what
+Word/PowerPoint exports use (FlateDecode streams, object streams,
+ToUnicode CMaps, simple WinAnsi fonts). Scanned pages have no text and
+are indexed as empty.
+
+Usage:
+    python pdf_index.py "associative array"            # update, then search
+    python pdf_index.py 'queue AND (push_back OR pop_front)' --raw
+    python pdf_index.py "fork join" --slides review.pptx --limit 8
+"""
+
+import os
+import re
+import sys
+import time
+import zlib
+import sqlite3
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import generate_pptx as gp
+
+ROOT = os.path.normpath(os.path.join(gp.OUTPUT_DIR, ".."))
+SOURCE_DIRS = ("Sheets", "Exams & Quizzes", "Lecture Notes")
+DB_FILE = os.path.join(gp.OUTPUT_DIR, ".pdf_index.sqlite")
+PASSAGE_CHARS = 900
+EXCERPT_CHARS = 220
+PER_SLIDE = 3
+LINE_SHIFT = 4      # points of baseline move that start a new text line
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY, sha256 TEXT NOT NULL, mtime REAL NOT NULL,
+    size INTEGER NOT NULL, pages INTEGER NOT NULL);
+CREATE VIRTUAL TABLE IF NOT EXISTS passages USING fts5(
+    text, path UNINDEXED, page UNINDEXED, tokenize = 'porter unicode61');
+"""
+
+# A line that starts a new question or sub-question.
+_QUESTION_RE = re.compile(r"^\s*(?:Q(?:uestion)?\s*\d+|\d{1,2}\s*[.)-]\s|\(?[a-hA-H]\)\s)")
+_WORD_RE = re.compile(r"\w+", re.U)
+
+# --- minimal PDF reader -------------------------------------------------------
+
+_OBJ_RE = re.compile(rb"(\d+)\s+(\d+)\s+obj\b")
+_TOKEN_RE = re.compile(rb"""[\x00\t\n\f\r ]*(?:
+    (?P<comment>%[^\r\n]*)
+   |(?P<dict><<)|(?P<enddict>>>)|(?P<arr>\[)|(?P<endarr>\])
+   |(?P<name>/[^\x00\t\n\f\r /\[\]()<>{}%]*)
+   |(?P<hex><[0-9A-Fa-f\x00\t\n\f\r ]*>)
+   |(?P<str>\()
+   |(?P<num>[+-]?(?:\d+\.?\d*|\.\d+))
+   |(?P<kw>[^\x00\t\n\f\r /\[\]()<>{}%]+)
+   )""", re.X)
+_REF_RE = re.compile(rb"\s+(\d+)\s+R\b")
+_ESCAPES = {ord("n"): b"\n", ord("r"): b"\r", ord("t"): b"\t", ord("b"): b"\b",
+            ord("f"): b"\f", ord("("): b"(", ord(")"): b")", ord("\\"): b"\\"}
+
+
+class Ref(int):
+    """An indirect object reference (object number)."""
+
+
+class Name(str):
+    """A PDF name such as /Font, without the slash."""
+
+
+def _literal(data, pos):
+    """Parse a (string) whose "(" is at data[pos - 1]; return (bytes, end)."""
+    out, depth = bytearray(), 1
+    while pos < len(data):
+        ch = data[pos]
+        pos += 1
+        if ch == 0x5C:                                  # backslash
+            nxt = data[pos:pos + 1]
+            pos += 1
+            if nxt and nxt[0] in _ESCAPES:
+                out += _ESCAPES[nxt[0]]
+            elif nxt.isdigit():
+                digits = re.match(rb"[0-7]{1,3}", data[pos - 1:pos + 2]).group()
+                out.append(int(digits, 8) & 0xFF)
+                pos += len(digits) - 1
+            elif nxt == b"\r" and data[pos:pos + 1] == b"\n":
+                pos += 1
+        elif ch == 0x28:
+            depth += 1
+            out.append(ch)
+        elif ch == 0x29:
+            depth -= 1
+            if depth == 0:
+                return bytes(out), pos
+            out.append(ch)
+        else:
+            out.append(ch)
+    return bytes(out), pos
+
+
+def _token(data, pos):
+    """Return (kind, value, end) of the next token; kind None at the end."""
+    while True:
+        m = _TOKEN_RE.match(data, pos)
+        if not m:
+            return None, None, len(data)
+        kind = m.lastgroup
+        if kind != "comment":
+            break
+        pos = m.end()
+    end = m.end()
+    if kind == "str":
+        value, end = _literal(data, end)
+    elif kind == "hex":
+        digits = re.sub(rb"[^0-9A-Fa-f]", b"", m.group(kind)[1:-1])
+        value = bytes.fromhex((digits + b"0" * (len(digits) % 2)).decode())
+    elif kind == "name":
+        value = Name(m.group(kind)[1:].decode("latin-1"))
+    elif kind == "num":
+        text = m.group(kind)
+        value = float(text) if b"." in text else int(text)
+        ref = _REF_RE.match(data, end)
+        if ref and isinstance(value, int):
+            return "ref", Ref(value), ref.end()
+    else:
+        value = m.group(kind)
+    return kind, value, end
+
+
+def _value(data, pos):
+    """Parse one PDF value at `pos`; return (value, end)."""
+    kind, value, pos = _token(data, pos)
+    if kind == "dict":
+        out = {}
+        while True:
+            key, pos = _value(data, pos)
+            if key is _END or key is None:
+                return out, pos
+            out[key], pos = _value(data, pos)
+    if kind == "arr":
+        out = []
+        while True:
+            item, pos = _value(data, pos)
+            if item is _END or item is None:
+                return out, pos
+            out.append(item)
+    if kind in ("enddict", "endarr"):
+        return _END, pos
+    if kind == "kw":
+        value = {b"true": True, b"false": False, b"null": None}.get(value, value)
+    return value, pos
+
+
+_END = object()
+
+
+def _decode(info, raw):
+    filters = info.get("Filter")
+    filters = filters if isinstance(filters, list) else [filters] if filters else []
+    for name in filters:
+        if name != "FlateDecode":
+            return b""
+        try:
+            raw = zlib.decompress(raw)
+        except zlib.error:
+            raw = zlib.decompressobj().decompress(raw)
+    return raw
+
+
+class PdfReader:
+    """Objects of one PDF, found by scanning the file rather than the xref."""
+
+    def __init__(self, data):
+        self.objects = {}
+        self.streams = {}
+        pos = 0
+        while True:
+            m = _OBJ_RE.search(data, pos)
+            if not m:
+                break
+            num = int(m.group(1))
+            value, pos = _value(data, m.end())
+            kind, _, after = _token(data, pos)
+            if kind == "kw" and data[pos:after].strip() == b"stream" and isinstance(value, dict):
+                start = after + (2 if data[after:after + 2] == b"\r\n" else 1)
+                length = value.get("Length")
+                end = start + length if isinstance(length, int) else -1
+                if end < 0 or data[end:end + 30].strip()[:9] != b"endstream":
+                    end = data.find(b"endstream", start)
+                    end = len(data) if end < 0 else end
+                self.streams[num] = data[start:end]
+                pos = end + 9
+            self.objects[num] = value
+        for num, info in list(self.objects.items()):
+            if isinstance(info, dict) and info.get("Type") == "ObjStm":
+                self._unpack(info, self.stream(num))
+
+    def _unpack(self, info, data):
+        first, count = info.get("First", 0), info.get("N", 0)
+        header, pos = [], 0
+        for _ in range(2 * count):
+            value, pos = _value(data, pos)
+            header.append(value)
+        for num, offset in zip(header[::2], header[1::2]):
+            if isinstance(num, int) and num not in self.objects:
+                self.objects[num] = _value(data, first + offset)[0]
+
+    def get(self, value):
+        while isinstance(value, Ref):
+            value = self.objects.get(value)
+        return value
+
+    def stream(self, num):
+        info = self.objects.get(num)
+        if num not in self.streams or not isinstance(info, dict):
+            return b""
+        return _decode(info, self.streams[num])
+
+    def pages(self):
+        """Yield (page dict, resources) in document order."""
+        root = next((v for v in self.objects.values()
+                     if isinstance(v, dict) and v.get("Type") == "Catalog"), None)
+        stack = [(self.get(root.get("Pages")) if root else None, {})]
+        seen = set()
+        while stack:
+            node, resources = stack.pop()
+            if not isinstance(node, dict) or id(node) in seen:
+                continue
+            seen.add(id(node))
+            resources = self.get(node.get("Resources")) or resources
+            if node.get("Type") == "Pages" or "Kids" in node:
+                for kid in reversed(self.get(node.get("Kids")) or []):
+                    stack.append((self.get(kid), resources))
+            else:
+                yield node, resources
+
+    def contents(self, page):
+        refs = page.get("Contents")
+        refs = self.get(refs) if isinstance(refs, Ref) and isinstance(self.get(refs), list) \
+            else refs
+        refs = refs if isinstance(refs, list) else [refs]
+        return b"\n".join(self.stream(r) for r in refs if isinstance(r, Ref))
+
+
+class Font:
+    """Byte-to-text decoding for one font: its ToUnicode CMap, else cp1252."""
+
+    def __init__(self, reader, font):
+        font = font if isinstance(font, dict) else {}
+        # Simple fonts use one byte per glyph whatever their CMap claims.
+        self.width = 2 if font.get("Subtype") == "Type0" else 1
+        self.map = None
+        cmap = font.get("ToUnicode")
+        if isinstance(cmap, Ref):
+            self._parse_cmap(reader.stream(cmap))
+
+    def _parse_cmap(self, data):
+        self.map = {}
+        space = re.search(rb"begincodespacerange\s*<([0-9A-Fa-f]+)>", data)
+        if space and self.width == 2:
+            self.width = max(1, len(space.group(1)) // 2)
+
+        def text(hexstr):
+            return bytes.fromhex(hexstr.decode()).decode("utf-16-be", "ignore")
+
+        for block in re.findall(rb"beginbfchar(.*?)endbfchar", data, re.S):
+            for src, dst in re.findall(rb"<([0-9A-Fa-f]+)>\s*<([0-9A-Fa-f]*)>", block):
+                self.map[int(src, 16)] = text(dst)
+        for block in re.findall(rb"beginbfrange(.*?)endbfrange", data, re.S):
+            for lo, hi, dst in re.findall(
+                    rb"<([0-9A-Fa-f]+)>\s*<([0-9A-Fa-f]+)>\s*(<[0-9A-Fa-f]*>|\[[^\]]*\])",
+                    block):
+                lo, hi = int(lo, 16), int(hi, 16)
+                if dst.startswith(b"["):
+                    for i, item in enumerate(re.findall(rb"<([0-9A-Fa-f]*)>", dst)):
+                        self.map[lo + i] = text(item)
+                elif hi - lo < 0x10000:
+                    base = bytes.fromhex(dst[1:-1].decode())
+                    start = int.from_bytes(base[-2:] or b"\0", "big")
+                    prefix = base[:-2].decode("utf-16-be", "ignore")
+                    for i in range(hi - lo + 1):
+                        self.map[lo + i] = prefix + chr(start + i)
+
+    def decode(self, raw):
+        if self.map is None:
+            if self.width == 2:
+                return ""
+            return raw.decode("cp1252", "replace")
+        if self.width == 1:
+            return "".join(self.map.get(b) or bytes([b]).decode("cp1252", "replace")
+                           for b in raw)
+        return "".join(self.map.get(int.from_bytes(raw[i:i + 2], "big"), "")
+                       for i in range(0, len(raw) - 1, 2))
+
+
+def page_text(reader, page, resources, fonts):
+    """Return the text of one page, one line per text line (approximately)."""
+    font_refs = reader.get(resources.get("Font")) or {} if isinstance(resources, dict) else {}
+    data = reader.contents(page)
+    lines, line, operands = [], [], []
+    font, last_y, scale = None, None, 1
+    pos = 0
+    while True:
+        kind, value, pos = _token(data, pos)
+        if kind is None:
+            break
+        if kind != "kw":
+            if kind in ("dict", "arr"):
+                value, pos = _value(data, pos - (2 if kind == "dict" else 1))
+            operands.append(value)
+            continue
+        op = value
+        if op == b"BI":
+            end = data.find(b"EI", data.find(b"ID", pos))
+            pos = len(data) if end < 0 else end + 2
+        elif op == b"Tf" and len(operands) >= 2:
+            ref = font_refs.get(operands[-2]) if isinstance(font_refs, dict) else None
+            key = ref if isinstance(ref, Ref) else operands[-2]
+            if key not in fonts:
+                fonts[key] = Font(reader, reader.get(ref))
+            font = fonts[key]
+        elif op in (b"Tj", b"'", b'"') and operands and font:
+            if op != b"Tj" and line:
+                lines.append("".join(line))
+                line = []
+            if isinstance(operands[-1], bytes):
+                line.append(font.decode(operands[-1]))
+        elif op == b"TJ" and operands and isinstance(operands[-1], list) and font:
+            for item in operands[-1]:
+                if isinstance(item, bytes):
+                    line.append(font.decode(item))
+                elif isinstance(item, (int, float)) and item < -250:
+                    line.append(" ")
+        elif op in (b"Td", b"TD", b"Tm", b"T*"):
+            # A new line when the baseline moves by more than sub/superscript.
+            y = operands[-1] if op != b"T*" and operands else 0
+            if not isinstance(y, (int, float)):
+                y = 0
+            if op == b"Tm":
+                moved = last_y is None or abs(y - last_y) > LINE_SHIFT
+                last_y = y
+                if len(operands) == 6 and isinstance(operands[3], (int, float)):
+                    scale = abs(operands[3]) or 1
+            else:
+                moved = op == b"T*" or abs(y) * scale > LINE_SHIFT
+                if last_y is not None:
+                    last_y += y * scale
+            if moved and line:
+                lines.append("".join(line))
+                line = []
+        operands = []
+    if line:
+        lines.append("".join(line))
+    return "\n".join(re.sub(r"[ \t]+", " ", l).strip() for l in lines if l.strip())
+
+
+def extract_pages(path):
+    """Return the text of each page of the PDF at `path`."""
+    with open(path, "rb") as f:
+        reader = PdfReader(f.read())
+    fonts = {}
+    return [page_text(reader, page, resources, fonts)
+            for page, resources in reader.pages()]
+
+
+# --- index --------------------------------------------------------------------
+
+def passages(text):
+    """Split one page's text into question-sized passages."""
+    out, current = [], []
+    for line in text.splitlines():
+        size = sum(len(l) for l in current)
+        if current and (_QUESTION_RE.match(line) or size > PASSAGE_CHARS):
+            out.append("\n".join(current))
+            current = []
+        current.append(line)
+    if current:
+        out.append("\n".join(current))
+    return out
+
+
+def file_hash(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _source_files(root, dirs=SOURCE_DIRS):
+    for top in dirs:
+        for dirpath, dirnames, filenames in os.walk(os.path.join(root, top)):
+            dirnames.sort()
+            for name in sorted(filenames):
+                if name.lower().endswith(".pdf"):
+                    yield os.path.join(dirpath, name)
+
+
+def _extract(path):
+    try:
+        return extract_pages(path), None
+    except Exception as e:          # a damaged PDF must not stop the others
+        return [], f"{type(e).__name__}: {e}"
+
+
+def connect(db_file=DB_FILE):
+    os.makedirs(os.path.dirname(os.path.abspath(db_file)), exist_ok=True)
+    conn = sqlite3.connect(db_file)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def update(conn, root=ROOT, workers=None, rebuild=False):
+    """Re-extract new or changed PDFs; return (extracted, unchanged, removed, errors)."""
+    if rebuild:
+        with conn:
+            conn.execute("DELETE FROM passages")
+            conn.execute("DELETE FROM files")
+    known = {path: (sha, mtime, size) for path, sha, mtime, size
+             in conn.execute("SELECT path, sha256, mtime, size FROM files")}
+    changed, unchanged = [], 0
+    for path in _source_files(root):
+        rel = os.path.relpath(path, root).replace(os.sep, "/")
+        st = os.stat(path)
+        sha, mtime, size = known.pop(rel, (None, None, None))
+        if (mtime, size) == (st.st_mtime, st.st_size):
+            unchanged += 1
+            continue
+        digest = file_hash(path)
+        if digest == sha:
+            with conn:
+                conn.execute("UPDATE files SET mtime = ?, size = ? WHERE path = ?",
+                             (st.st_mtime, st.st_size, rel))
+            unchanged += 1
+            continue
+        changed.append((path, rel, digest, st))
+
+    errors = {}
+    if changed:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+            results = pool.map(_extract, [c[0] for c in changed])
+            for (path, rel, digest, st), (pages, error) in zip(changed, results):
+                with conn:
+                    conn.execute("DELETE FROM passages WHERE path = ?", (rel,))
+                    if error:
+                        # No files row, so the next update tries it again.
+                        errors[rel] = error
+                        conn.execute("DELETE FROM files WHERE path = ?", (rel,))
+                        continue
+                    conn.executemany(
+                        "INSERT INTO passages (text, path, page) VALUES (?, ?, ?)",
+                        [(p, rel, n) for n, text in enumerate(pages, 1)
+                         for p in passages(text)])
+                    conn.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)",
+                                 (rel, digest, st.st_mtime, st.st_size, len(pages)))
+    with conn:
+        for rel in known:
+            conn.execute("DELETE FROM passages WHERE path = ?", (rel,))
+            conn.execute("DELETE FROM files WHERE path = ?", (rel,))
+    return len(changed), unchanged, len(known), errors
+
+
+def fts_query(text):
+    """Quote each word of a plain-text query so FTS5 syntax characters are literal."""
+    return " ".join(f'"{w}"' for w in _WORD_RE.findall(text))
+
+
+def search(conn, query, limit=20, raw=False):
+    """Return (path, page, passage) rows best matching `query`, best first.
+
+    A passage repeated in another PDF (sheet copies, solutions), even
+    under another question number, is returned once, from its best-ranked file.
+    """
+    rows, seen = [], set()
+    cursor = conn.execute(
+        "SELECT path, page, text FROM passages WHERE passages MATCH ? "
+        "ORDER BY bm25(passages) LIMIT ?",
+        (query if raw else fts_query(query), 4 * limit))
+    for row in cursor:
+        key = _QUESTION_RE.sub("", " ".join(row[2].split())).lower()
+        if key not in seen:
+            seen.add(key)
+            rows.append(row)
+            if len(rows) == limit:
+                break
+    return rows
+
+
+def excerpt(text, query, width=EXCERPT_CHARS):
+    """Return about `width` characters of `text` around the first query word."""
+    flat = " ".join(text.split())
+    words = [w.lower() for w in _WORD_RE.findall(query)]
+    lower = flat.lower()
+    hits = [i for i in (lower.find(w[:max(4, len(w) - 2)]) for w in words) if i >= 0]
+    start = max(0, min(hits) - width // 3) if hits else 0
+    out = flat[start:start + width]
+    return ("..." if start else "") + out + ("..." if start + width < len(flat) else "")
+
+
+def build_slides(prs, conn, query, start=0, limit=12, raw=False):
+    """Add "Review: <query>" bullet slides of matching excerpts; return the last slide number."""
+    rows = search(conn, query, limit, raw)
+    sn = start
+    if not rows:
+        sn += 1
+        gp.add_bullet_slide(prs, f"Review: {query}", [f"No passages match '{query}'"], sn)
+        return sn
+    for i in range(0, len(rows), PER_SLIDE):
+        bullets = []
+        for path, page, text in rows[i:i + PER_SLIDE]:
+            bullets.append(excerpt(text, query))
+            bullets.append(f"    - Source: {os.path.splitext(os.path.basename(path))[0]}, "
+                           f"p. {page}")
+        sn += 1
+        title = f"Review: {query}" + (" (cont.)" if i else "")
+        gp.add_bullet_slide(prs, title, bullets, sn)
+    return sn
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("queries", nargs="*")
+    parser.add_argument("--raw", action="store_true",
+                        help="pass queries to FTS5 as written (AND/OR/NEAR, prefix*)")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--root", default=ROOT)
+    parser.add_argument("--db", default=DB_FILE)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--rebuild", action="store_true",
+                        help="re-extract every PDF instead of only changed ones")
+    parser.add_argument("--slides", metavar="PPTX",
+                        help="write review slides for the queries to PPTX")
+    args = parser.parse_args()
+
+    conn = connect(args.db)
+    t0 = time.perf_counter()
+    extracted, unchanged, removed, errors = update(conn, args.root, args.workers,
+                                                   args.rebuild)
+    for rel, error in sorted(errors.items()):
+        print(f"{rel}: {error}", file=sys.stderr)
+    print(f"Index: {extracted} extracted, {unchanged} unchanged, {removed} removed "
+          f"({time.perf_counter() - t0:.2f} s)", file=sys.stderr)
+
+    if args.raw:
+        for query in args.queries:
+            try:
+                search(conn, query, 1, raw=True)
+            except sqlite3.OperationalError as exc:
+                conn.close()
+                parser.error(f"bad FTS5 query {query!r}: {exc}")
+
+    for query in args.queries:
+        t0 = time.perf_counter()
+        rows = search(conn, query, args.limit, args.raw)
+        ms = (time.perf_counter() - t0) * 1000
+        print(f"== {query}: {len(rows)} passages ({ms:.1f} ms)")
+        for path, page, text in rows:
+            print(f"{path} p.{page}: {excerpt(text, query, 160)}")
+
+    if args.slides:
+        prs = gp.new_presentation()
+        sn = 0
+        for query in args.queries:
+            sn = build_slides(prs, conn, query, sn, args.limit, args.raw)
+        prs.save(args.slides)
+        print(f"Review slides saved to: {args.slides} ({len(prs.slides)} slides)")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,395 @@
+"""
+Power-domain slides from the QuestaSim Power Aware reports
+
+vopt -pa_genrpt writes report.upf.txt (power domains, their supplies,
+isolation strategies with the signals they isolate, and power state
+tables) and report.mspa.txt (the sequential elements of each domain).
+Both are read in one pass, line by line: iter_upf_report() and
+iter_mspa_report() yield one small record per domain, strategy, signal,
+PST or element as soon as it is complete, and PowerReport keeps them
+compactly (isolated signals as interned scope indices plus leaf names,
+elements only as per-domain counts), so a report of tens of thousands of
+lines parses in constant memory apart from the records kept.
+
+Every record keeps its `file(line)` back-reference into the UPF file;
+upf_commands() streams the UPF once to pull out the commands those
+references point at, for the code slides.
+
+Usage:
+    python power_report.py
+    python power_report.py ../power_aware_sim -o Power.pptx
+"""
+
+import os
+import re
+import sys
+import argparse
+from array import array
+
+import generate_pptx as gp
+
+EXAMPLES_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_RUN_DIR = os.path.join(EXAMPLES_DIR, "..", "power_aware_sim")
+OUTPUT_FILE = os.path.join(gp.OUTPUT_DIR, "Power.pptx")
+
+# Isolated signals listed on one strategy slide.
+MAX_LISTED = 12
+
+_REF = r"(?P<file>[^\s(]+)\((?P<line>\d+)\)"
+_DOMAIN_RE = re.compile(r"Power Domain: (?P<name>\S+), File: " + _REF)
+_STRATEGY_RE = re.compile(r"(?P<kind>\w+) Strategy: (?P<name>\S+), File: " + _REF)
+_PST_RE = re.compile(r"Pst (?P<name>\S+), File:\s*" + _REF)
+_SUPPLY_RE = re.compile(r"(?P<role>power|ground)\s*: (?P<net>\S+)")
+_CONTROL_RE = re.compile(r"(?P<key>[A-Z][\w ]*?) \((?P<value>[^)]*)\)")
+_SIGNAL_RE = re.compile(r"\d+\. Signal : (?P<path>\S+)")
+_PST_HEADER_RE = re.compile(r"Header ==>\s*:(?P<supplies>.*)")
+_PST_STATE_RE = re.compile(r"(?P<name>\S+)\s+" + _REF + r":(?P<states>.*)")
+_PORT_RE = re.compile(r"(?P<name>\S+) \[ source supply port: (?P<port>[^,]+), File:\s*"
+                      + _REF + r"\]")
+_PORT_STATE_RE = re.compile(r"\d+\. (?P<state>\w+)\s*: (?P<value>[-\d.]+)")
+_TOTAL_RE = re.compile(r"Total\s+\( (?P<scope>\S+)\s*\)")
+_SUBTOTAL_RE = re.compile(r"(?P<domain>\S+) sub_total \( (?P<scope>\S+)\s*\)")
+_COUNT_RE = re.compile(r"(?P<kind>[A-Z]+_[A-Z]+|OUTPUT) # (?P<count>\d+)")
+_ELEMENT_RE = re.compile(r"(?P<path>/\S+) (?P<bits>\d+)$")
+
+
+def _ref(m):
+    return m.group("file"), int(m.group("line"))
+
+
+def iter_upf_report(path):
+    """Yield (kind, record) from report.upf.txt in one pass.
+
+    kind is "domain", "strategy", "signal" or "pst". A record is yielded
+    when its block ends; a signal is ("signal", (domain, strategy, path))
+    and is yielded as soon as it is read.
+    """
+    record, kind, section = None, None, None
+    domain = None
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for raw in f:
+            line = raw.strip()
+            if not line:
+                continue
+            m = (_DOMAIN_RE.match(line) or _STRATEGY_RE.match(line)
+                 or _PST_RE.match(line))
+            if m or line.startswith("---"):
+                if record is not None:
+                    yield kind, record
+                record, kind, section = None, None, None
+                if m is None:
+                    continue
+                if m.re is _DOMAIN_RE:
+                    domain = m.group("name")
+                    kind, record = "domain", {
+                        "name": domain, "ref": _ref(m), "scope": None,
+                        "power": None, "ground": None}
+                elif m.re is _STRATEGY_RE:
+                    kind, record = "strategy", {
+                        "name": m.group("name"), "kind": m.group("kind").lower(),
+                        "domain": domain, "ref": _ref(m), "power": None,
+                        "ground": None, "control": {}, "signals": 0}
+                else:
+                    kind, record = "pst", {
+                        "name": m.group("name"), "ref": _ref(m), "scope": None,
+                        "supplies": [], "states": [], "ports": []}
+                continue
+            if record is None:
+                continue
+
+            if kind == "pst" and section is not None:
+                # "List of possible states on:" one block per supply port.
+                m = _PORT_RE.match(line)
+                if m:
+                    record["ports"].append({
+                        "name": m.group("name"), "port": m.group("port").strip(),
+                        "ref": _ref(m), "states": []})
+                    continue
+                m = _PORT_STATE_RE.match(line)
+                if m and record["ports"]:
+                    record["ports"][-1]["states"].append(
+                        (m.group("state"), float(m.group("value"))))
+                continue
+            if line.startswith("Creation Scope:"):
+                record["scope"] = line.split(":", 1)[1].strip()
+            elif line.startswith("Scope =>"):
+                record["scope"] = line.split("=>", 1)[1].strip()
+            elif line.endswith(":") and not line.startswith("Header"):
+                section = line[:-1]
+            elif kind in ("domain", "strategy") and _SUPPLY_RE.match(line):
+                m = _SUPPLY_RE.match(line)
+                record[m.group("role")] = m.group("net")
+            elif kind == "strategy" and _SIGNAL_RE.match(line):
+                record["signals"] += 1
+                yield "signal", (record["domain"], record["name"],
+                                 _SIGNAL_RE.match(line).group("path"))
+            elif kind == "strategy":
+                for m in _CONTROL_RE.finditer(line):
+                    record["control"][m.group("key").lower()] = m.group("value")
+            elif kind == "pst" and _PST_HEADER_RE.match(line):
+                record["supplies"] = _PST_HEADER_RE.match(line).group("supplies").split()
+            elif kind == "pst" and _PST_STATE_RE.match(line):
+                m = _PST_STATE_RE.match(line)
+                record["states"].append((m.group("name"), _ref(m),
+                                         m.group("states").split()))
+        if record is not None:
+            yield kind, record
+
+
+def iter_mspa_report(path):
+    """Yield (kind, record) from report.mspa.txt in one pass.
+
+    kind is "total" ({"scope", "counts"}), "domain" ({"name", "scope",
+    "counts"}) or "element" ((domain, category, path, bits)).
+    """
+    record, kind, category = None, None, None
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for raw in f:
+            line = raw.strip()
+            m = _TOTAL_RE.match(line)
+            if m:
+                kind, record = "total", {"scope": m.group("scope"), "counts": {}}
+                continue
+            m = _SUBTOTAL_RE.match(line)
+            if m:
+                kind, record = "domain", {"name": m.group("domain"),
+                                          "scope": m.group("scope"), "counts": {}}
+                continue
+            if record is None:
+                continue
+            m = _COUNT_RE.match(line)
+            if m:
+                category = m.group("kind")
+                record["counts"][category] = int(m.group("count"))
+                continue
+            m = _ELEMENT_RE.match(line)
+            if m and kind == "domain":
+                yield "element", (record["name"], category, m.group("path"),
+                                  int(m.group("bits")))
+            elif line.startswith("---"):
+                yield kind, record
+                record, kind = None, None
+
+
+class PowerReport:
+    """Domains, strategies, PSTs and MSPA counts of one Power Aware run."""
+
+    def __init__(self):
+        self.domains = {}       # name -> record, in report order
+        self.strategies = []
+        self.psts = []
+        self.total = None
+        self.mspa = {}          # domain -> {"scope", "counts", "elements", "bits"}
+        self._scopes = []
+        self._scope_ids = {}
+        self._sig_rows = {}     # strategy index -> rows of _sig_scope/_sig_leaf
+        self._sig_scope = array("I")
+        self._sig_leaf = []
+        self._strategy_ids = {}
+
+    def add_upf(self, path):
+        for kind, record in iter_upf_report(path):
+            if kind == "domain":
+                record["strategies"] = []
+                self.domains[record["name"]] = record
+            elif kind == "strategy":
+                self._strategy(record["domain"], record["name"]).update(record)
+            elif kind == "signal":
+                domain, name, signal = record
+                scope, _, leaf = signal.rpartition("/")
+                sid = self._scope_ids.get(scope)
+                if sid is None:
+                    sid = self._scope_ids[scope] = len(self._scopes)
+                    self._scopes.append(scope)
+                index = self._strategy(domain, name)["index"]
+                self._sig_rows.setdefault(index, array("I")).append(len(self._sig_leaf))
+                self._sig_scope.append(sid)
+                self._sig_leaf.append(sys.intern(leaf))
+            elif kind == "pst":
+                self.psts.append(record)
+        for strategy in self.strategies:
+            domain = self.domains.get(strategy["domain"])
+            if domain is not None and strategy["name"] not in domain["strategies"]:
+                domain["strategies"].append(strategy["name"])
+
+    def add_mspa(self, path):
+        for kind, record in iter_mspa_report(path):
+            if kind == "total":
+                self.total = record
+            elif kind == "domain":
+                self._mspa(record["name"]).update(scope=record["scope"],
+                                                  counts=record["counts"])
+            elif kind == "element":
+                domain, _, _, bits = record
+                entry = self._mspa(domain)
+                entry["elements"] += 1
+                entry["bits"] += bits
+
+    def _strategy(self, domain, name):
+        key = (domain, name)
+        index = self._strategy_ids.get(key)
+        if index is None:
+            index = self._strategy_ids[key] = len(self.strategies)
+            self.strategies.append({"name": name, "domain": domain, "index": index})
+        return self.strategies[index]
+
+    def _mspa(self, domain):
+        return self.mspa.setdefault(domain, {"scope": None, "counts": {}, "elements": 0,
+                                             "bits": 0})
+
+    def signals(self, strategy):
+        """Return the full paths of the signals `strategy` isolates."""
+        return [f"{self._scopes[self._sig_scope[r]]}/{self._sig_leaf[r]}"
+                for r in self._sig_rows.get(strategy["index"], ())]
+
+    def refs(self):
+        """Return every (file, line) back-reference in the report."""
+        refs = [d["ref"] for d in self.domains.values()]
+        refs += [s["ref"] for s in self.strategies if "ref" in s]
+        for pst in self.psts:
+            refs.append(pst["ref"])
+            refs += [ref for _, ref, _ in pst["states"]]
+            refs += [port["ref"] for port in pst["ports"]]
+        return refs
+
+
+def load(run_dir=DEFAULT_RUN_DIR):
+    """Parse report.upf.txt and report.mspa.txt (if present) in `run_dir`."""
+    upf = os.path.join(run_dir, "report.upf.txt")
+    if not os.path.exists(upf):
+        raise FileNotFoundError(f"{upf} not found (run vsim with -pa_genrpt)")
+    report = PowerReport()
+    report.add_upf(upf)
+    mspa = os.path.join(run_dir, "report.mspa.txt")
+    if os.path.exists(mspa):
+        report.add_mspa(mspa)
+    return report
+
+
+def upf_commands(path, lines=(), names=()):
+    """Stream the UPF file at `path` and return {first line: command text}.
+
+    Keeps each command (joined over `\\` continuations) that spans one of
+    `lines` or whose first argument is one of `names`.
+    """
+    lines, names = set(lines), set(names)
+    found = {}
+    command, start = [], None
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for number, raw in enumerate(f, 1):
+            text = raw.rstrip("\n")
+            if not command and (not text.strip() or text.lstrip().startswith("#")):
+                continue
+            if not command:
+                start = number
+            command.append(text)
+            if text.rstrip().endswith("\\"):
+                continue
+            words = command[0].split()
+            if (lines.intersection(range(start, number + 1))
+                    or (len(words) > 1 and words[1] in names)):
+                found[start] = "\n".join(command)
+            command = []
+    return found
+
+
+def _leaf(path):
+    return path.rsplit("/", 1)[-1] if path else "-"
+
+
+def _where(ref):
+    return f"{ref[0]}({ref[1]})"
+
+
+def build_slides(prs, report, run_dir=DEFAULT_RUN_DIR, start=0):
+    """Add the domain table, PST and per-strategy slides; return the last slide number."""
+    sn = start
+    rows = []
+    for domain in report.domains.values():
+        mspa = report.mspa.get(domain["name"], {})
+        counts = mspa.get("counts", {})
+        rows.append([
+            domain["name"],
+            _leaf(mspa.get("scope") or domain["scope"]),
+            f"{_leaf(domain['power'])} / {_leaf(domain['ground'])}",
+            ", ".join(domain["strategies"]) or "-",
+            sum(counts.values()) if counts else "-",
+            _where(domain["ref"]),
+        ])
+    caption = None
+    if report.total:
+        caption = (f"{sum(report.total['counts'].values())} non power-management "
+                   f"sequential elements in {report.total['scope']}")
+    sn += 1
+    sn = gp.add_table_slide(prs, "Power Domains",
+                            ["Domain", "Instance", "Power / Ground", "Strategies",
+                             "Seq. elements", "UPF"], rows, sn, caption)
+
+    for pst in report.psts:
+        sn += 1
+        sn = gp.add_table_slide(
+            prs, f"Power State Table: {pst['name']}",
+            ["State"] + pst["supplies"] + ["UPF"],
+            [[name] + states + [_where(ref)] for name, ref, states in pst["states"]],
+            sn, f"Defined at {_where(pst['ref'])}")
+
+    refs = report.refs()
+    commands = {}
+    for name in sorted({ref[0] for ref in refs}):
+        path = os.path.join(run_dir, name)
+        if os.path.exists(path):
+            wanted = [ref[1] for ref in refs if ref[0] == name]
+            commands[name] = upf_commands(path, wanted,
+                                          [s["name"] for s in report.strategies])
+
+    for strategy in report.strategies:
+        control = strategy.get("control", {})
+        signals = report.signals(strategy)
+        bullets = [
+            f"Domain: {strategy['domain']}",
+            f"Defined at: {_where(strategy['ref'])}",
+            f"Supplies: {strategy.get('power') or '-'} / {strategy.get('ground') or '-'}",
+        ]
+        bullets += [f"{key.capitalize()}: {value}" for key, value in control.items()]
+        bullets += ["", f"Isolated signals ({len(signals)}):"]
+        bullets += [f"    {s}" for s in signals[:MAX_LISTED]]
+        if len(signals) > MAX_LISTED:
+            bullets.append(f"    ... and {len(signals) - MAX_LISTED} more")
+        sn += 1
+        gp.add_bullet_slide(prs, f"{strategy['kind'].capitalize()} Strategy: "
+                                 f"{strategy['name']}", bullets, sn)
+
+        source = commands.get(strategy["ref"][0], {})
+        text = [cmd for line, cmd in sorted(source.items())
+                if cmd.split()[1:2] == [strategy["name"]]]
+        if text:
+            sn += 1
+            sn = gp.add_code_slide(prs, f"{strategy['name']} in UPF",
+                                   "\n\n".join(text), None, sn, lang="tcl")
+    return sn
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("run_dir", nargs="?", default=DEFAULT_RUN_DIR,
+                        help="directory holding report.upf.txt and report.mspa.txt")
+    parser.add_argument("-o", "--output", default=OUTPUT_FILE)
+    args = parser.parse_args()
+
+    try:
+        report = load(args.run_dir)
+    except FileNotFoundError as exc:
+        print(exc, file=sys.stderr)
+        sys.exit(1)
+
+    prs = gp.new_presentation()
+    build_slides(prs, report, args.run_dir)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    prs.save(args.output)
+    print(f"{len(report.domains)} domains, {len(report.strategies)} strategies, "
+          f"{len(report._sig_leaf)} isolated signals")
+    print(f"Presentation saved to: {args.output} ({len(prs.slides)} slides)")
+
+
+if __name__ == "__main__":
+    main()
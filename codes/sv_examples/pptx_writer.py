@@ -0,0 +1,154 @@
+"""
+Streaming .pptx package writer
+
+A drop-in replacement for prs.save() that writes each slide part to the zip
+as soon as the slide is finished instead of serializing the whole package
+at the end. Parts are deflated on a thread pool (zlib releases the GIL), and
+finished entries are appended in order while later slides are still being
+built.
+
+With `chunk_size` set, every `chunk_size` written slides have their lxml
+trees swapped for an empty <p:sld> so python-pptx no longer holds the
+whole deck in memory; peak RSS then stays roughly flat as the deck grows.
+
+Usage (see generate_pptx.build):
+    writer = StreamingPackageWriter(OUTPUT_FILE, compresslevel=9, chunk_size=20)
+    SLIDE_HOOKS.append(writer)
+    build_deck(prs)
+    writer.close(prs)
+"""
+
+import os
+import zlib
+import struct
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from pptx.opc.oxml import serialize_part_xml
+from pptx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI
+from pptx.opc.serialized import _ContentTypesItem
+from pptx.oxml.slide import CT_Slide
+
+import build_trace
+
+# DOS date/time of every entry (1980-01-01 00:00), so identical decks
+# produce identical bytes.
+_DOS_TIME = 0
+_DOS_DATE = (1 << 5) | 1
+
+_ZIP_STORED = 0
+_ZIP_DEFLATED = 8
+_ZIP_LIMIT = 0xFFFFFFFF
+
+
+@build_trace.traced("deflate", "serialize")
+def _compress(blob, level):
+    """Return (crc, method, payload) for one zip entry."""
+    crc = zlib.crc32(blob)
+    if level == 0:
+        return crc, _ZIP_STORED, blob
+    return crc, _ZIP_DEFLATED, zlib.compress(blob, level, wbits=-15)
+
+
+class StreamingPackageWriter:
+    """Zip writer fed by a SLIDE_HOOKS callback, one entry per finished part.
+
+    `compresslevel` is the zlib level; 0 stores parts uncompressed. At most
+    `max_pending` compressed parts are held in memory waiting to be written.
+    `chunk_size` releases written slides in batches of that many; None
+    keeps every slide alive until close().
+    """
+
+    def __init__(self, path, compresslevel=6, workers=None, max_pending=None,
+                 chunk_size=None):
+        self.path = path
+        self.compresslevel = compresslevel
+        workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or 2 * workers
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+        self._pending = deque()
+        self._entries = []
+        self._written = set()
+        self.chunk_size = chunk_size
+        self._chunk = []
+        self._fp = open(path, "wb")
+
+    def __call__(self, slide, info):
+        self.write_part(slide.part)
+        if self.chunk_size:
+            self._chunk.append(slide.part)
+            if len(self._chunk) >= self.chunk_size:
+                self.release_chunk()
+
+    def release_chunk(self):
+        """Drop the lxml trees of the slides written since the last release.
+
+        Each part keeps its partname and relationships, so the package graph
+        and the [Content_Types].xml written by close() are unchanged.
+        """
+        for part in self._chunk:
+            part._element = CT_Slide.new()
+            part.__dict__.pop("slide", None)
+        self._chunk = []
+
+    def write_part(self, part):
+        """Queue `part` and its relationships for compression and writing."""
+        self._submit(part.partname, part.blob)
+        if len(part.rels):
+            self._submit(part.partname.rels_uri, part.rels.xml)
+        self._written.add(part.partname)
+
+    def _submit(self, partname, blob):
+        name = partname.membername.encode("utf-8")
+        future = self._pool.submit(_compress, blob, self.compresslevel)
+        self._pending.append((name, len(blob), future))
+        while self._pending and (len(self._pending) > self.max_pending
+                                 or self._pending[0][2].done()):
+            self._write_entry(*self._pending.popleft())
+
+    def _write_entry(self, name, size, future):
+        crc, method, payload = future.result()
+        offset = self._fp.tell()
+        if max(offset, size, len(payload)) > _ZIP_LIMIT:
+            raise ValueError(f"{name.decode()}: package too large for a non-zip64 writer")
+        self._fp.write(struct.pack(
+            "<IHHHHHIIIHH", 0x04034B50, 20, 0, method, _DOS_TIME, _DOS_DATE,
+            crc, len(payload), size, len(name), 0))
+        self._fp.write(name)
+        self._fp.write(payload)
+        self._entries.append((name, method, crc, len(payload), size, offset))
+
+    def abort(self):
+        """Stop writing and delete the partial package."""
+        self._pool.shutdown(cancel_futures=True)
+        self._fp.close()
+        os.remove(self.path)
+
+    def close(self, prs):
+        """Write every part not streamed yet, the content types and the zip directory."""
+        package = prs.part.package
+        parts = list(package.iter_parts())
+        self._submit(CONTENT_TYPES_URI,
+                     serialize_part_xml(_ContentTypesItem.xml_for(parts)))
+        self._submit(PACKAGE_URI.rels_uri, package._rels.xml)
+        for part in parts:
+            if part.partname not in self._written:
+                self.write_part(part)
+        while self._pending:
+            self._write_entry(*self._pending.popleft())
+        self._pool.shutdown()
+
+        start = self._fp.tell()
+        for name, method, crc, csize, size, offset in self._entries:
+            self._fp.write(struct.pack(
+                "<IHHHHHHIIIHHHHHII", 0x02014B50, 20, 20, 0, method,
+                _DOS_TIME, _DOS_DATE, crc, csize, size, len(name),
+                0, 0, 0, 0, 0, offset))
+            self._fp.write(name)
+        end = self._fp.tell()
+        if len(self._entries) > 0xFFFF or end > _ZIP_LIMIT:
+            raise ValueError("package too large for a non-zip64 writer")
+        self._fp.write(struct.pack(
+            "<IHHHHIIH", 0x06054B50, 0, 0, len(self._entries),
+            len(self._entries), end - start, start, 0))
+        self._fp.close()
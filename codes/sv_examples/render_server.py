@@ -0,0 +1,213 @@
+"""
+Local render server for snippets and single slides
+
+A small asyncio HTTP server, bound to 127.0.0.1 only, for the sv-lsp
+extension and authoring scripts that want to see a snippet as it will look
+on a slide without running the whole generator. Every endpoint takes a
+JSON body {"code": ..., "output": ..., "lang": "sv"|"tcl", "title": ...}:
+
+    POST /tokenize      -> {"pages": [[lines, output], ...]}  (layout_code)
+    POST /render/html   -> one code slide as a standalone HTML page
+    POST /render/pptx   -> one code slide as a .pptx file
+    GET  /health        -> {"ok": true, "cache": {...}}
+
+Results are kept in an LRU cache keyed by the SHA-256 of the endpoint and
+request; identical requests in flight share one render. Every render
+runs on a thread pool so slow renders never hold up other requests.
+
+Usage:
+    python render_server.py --port 8765
+    curl -d '{"code": "logic [7:0] a;"}' localhost:8765/render/html
+"""
+
+import io
+import json
+import asyncio
+import hashlib
+import argparse
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import generate_pptx as gp
+import html_preview
+
+HOST = "127.0.0.1"
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found",
+            405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+class RenderCache:
+    """LRU of render results (or in-flight futures) keyed by request hash."""
+
+    def __init__(self, maxsize=512):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key, compute):
+        """Return the cached result for `key`, awaiting compute() on a miss."""
+        entry = self._items.get(key)
+        if entry is not None:
+            self._items.move_to_end(key)
+            self.hits += 1
+            return await asyncio.shield(entry)
+        self.misses += 1
+        entry = asyncio.ensure_future(compute())
+        self._items[key] = entry
+        if len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+        try:
+            return await asyncio.shield(entry)
+        except Exception:
+            self._items.pop(key, None)
+            raise
+
+    def stats(self):
+        return {"size": len(self._items), "hits": self.hits, "misses": self.misses}
+
+
+def _snippet(body):
+    if not isinstance(body, dict):
+        raise ValueError("request body must be a JSON object")
+    code = body.get("code")
+    if not isinstance(code, str):
+        raise ValueError('"code" must be a string')
+    output = body.get("output")
+    if output is not None and not isinstance(output, str):
+        raise ValueError('"output" must be a string')
+    title = body.get("title", "")
+    if not isinstance(title, str):
+        raise ValueError('"title" must be a string')
+    lang = body.get("lang", "sv")
+    if lang not in ("sv", "tcl"):
+        raise ValueError('"lang" must be "sv" or "tcl"')
+    return code, output or None, lang, title
+
+
+def render_tokens(code, output, lang, title):
+    return json.dumps({"pages": gp.layout_code(code, output, lang)}).encode()
+
+
+def render_html(code, output, lang, title):
+    deck = html_preview.HtmlDeck()
+    deck.add_code_slide(title, code, output, 1, lang)
+    return deck.html(title or "Snippet").encode()
+
+
+def render_pptx(code, output, lang, title):
+    prs = gp.new_presentation()
+    gp.add_code_slide(prs, title, code, output, 1, lang)
+    buf = io.BytesIO()
+    prs.save(buf)
+    return buf.getvalue()
+
+
+# path -> (renderer, content type)
+ROUTES = {
+    "/tokenize": (render_tokens, "application/json"),
+    "/render/html": (render_html, "text/html; charset=utf-8"),
+    "/render/pptx": (
+        render_pptx,
+        "application/vnd.openxmlformats-officedocument.presentationml.presentation"),
+}
+
+
+class RenderServer:
+    def __init__(self, workers=4, cache_size=512):
+        self.cache = RenderCache(cache_size)
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+
+    def warm_up(self):
+        """Compile the lexers and load the python-pptx template before serving."""
+        for render, _ in ROUTES.values():
+            render("module top; endmodule", "ok", "sv", "warm-up")
+        gp.layout_code("vlog -sv top.sv", lang="tcl")
+
+    async def dispatch(self, method, path, body):
+        """Return (status, content type, payload) for one request."""
+        if path == "/health":
+            return 200, "application/json", json.dumps(
+                {"ok": True, "cache": self.cache.stats()}).encode()
+        if path not in ROUTES:
+            return 404, "text/plain", b"unknown endpoint\n"
+        if method != "POST":
+            return 405, "text/plain", b"use POST\n"
+        try:
+            args = _snippet(json.loads(body or b"{}"))
+        except ValueError as exc:
+            return 400, "text/plain", f"{exc}\n".encode()
+
+        render, ctype = ROUTES[path]
+        key = hashlib.sha256(
+            json.dumps([path, *args]).encode()).hexdigest()
+
+        async def compute():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._pool, render, *args)
+
+        return 200, ctype, await self.cache.get(key, compute)
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request = await reader.readline()
+                if not request.strip():
+                    break
+                method, path, _ = request.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                body = await reader.readexactly(length) if length else b""
+
+                try:
+                    status, ctype, payload = await self.dispatch(
+                        method, path.split("?", 1)[0], body)
+                except Exception as exc:
+                    status, ctype, payload = 500, "text/plain", f"{exc}\n".encode()
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(
+                    f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+                    f"Content-Type: {ctype}\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+                    "\r\n".encode("latin-1") + payload)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ValueError, ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, port):
+        server = await asyncio.start_server(self.handle, HOST, port)
+        print(f"Render server listening on http://{HOST}:{port}")
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=4,
+                        help="threads for rendering")
+    parser.add_argument("--cache-size", type=int, default=512)
+    args = parser.parse_args()
+
+    server = RenderServer(args.workers, args.cache_size)
+    server.warm_up()
+    try:
+        asyncio.run(server.serve(args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,698 @@
+"""
+Stratified event-queue model of IEEE 1800 scheduling (LRM Section 4)
+
+Runs a small subset of SystemVerilog through the Active, Inactive, NBA
+and Postponed regions of each time slot, to compute what the Section 4
+examples print and to show, region by region, why they print it.
+
+Supported: module-level logic/bit/reg/int/byte declarations with optional
+initializers, initial and always processes, begin/end, if/else, repeat,
+forever, blocking (=) and non-blocking (<=) assignments, #delay (#0 goes
+to the Inactive region), @(posedge/negedge sig) and @(sig), $display,
+$write, $strobe, $monitor and $finish. Values are two-state integers with
+None for x; expressions follow Python semantics and are masked to the
+target width on assignment.
+
+Each process is compiled once into a Python generator that yields what
+it waits for, and the scheduler is a heap of future time slots with a
+FIFO per region, so plain runs handle millions of events per second.
+trace=(start, end) records a snapshot of every region of the time slots
+in that window, plus one right after each batch of NBA updates is
+applied, for region_slides().
+
+Usage:
+    python sched_model.py section_4/4_scheduling/4_scheduling.sv
+    python sched_model.py section_4/4_scheduling/4_scheduling.sv --trace 5:6 --slides regions.pptx
+    python sched_model.py --race 1000 --cycles 2000     # throughput benchmark
+"""
+
+import re
+import sys
+import time
+import heapq
+import argparse
+from collections import deque
+
+REGIONS = ("Active", "Inactive", "NBA", "Postponed")
+
+# Output lines under "// Output so far:" that fit on one region slide.
+OUTPUT_LINES = 8
+
+ANY, POSEDGE, NEGEDGE = 0, 1, 2
+
+TYPE_WIDTHS = {"logic": 1, "bit": 1, "reg": 1, "wire": 1, "int": 32,
+               "integer": 32, "byte": 8, "shortint": 16, "longint": 64}
+
+_TOKEN_RE = re.compile(r"""
+    (?P<space>\s+|//[^\n]*|/\*.*?\*/)
+   |(?P<string>"(?:[^"\\\n]|\\.)*")
+   |(?P<number>\d*'[sS]?[bBoOdDhH][0-9a-fA-FxXzZ_?]+|\d[\d_]*(?:\.\d+)?)
+   |(?P<name>\$?[A-Za-z_][\w$]*)
+   |(?P<op><=|>=|==|!=|&&|\|\||<<|>>|[-+*/%&|^~!<>=?:;,.()\[\]{}#@])
+""", re.X | re.S)
+
+_BINARY = [
+    ("?",), ("||",), ("&&",), ("|",), ("^",), ("&",), ("==", "!="),
+    ("<", "<=", ">", ">="), ("<<", ">>"), ("+", "-"), ("*", "/", "%"),
+]
+_PY_OPS = {"/": "//", "&&": "and", "||": "or"}
+_FORMAT_RE = re.compile(r"%(0?)(\d*)([bBoOdDhHxXsStTcCmM%])")
+
+
+class Finish(Exception):
+    pass
+
+
+def _tokens(text):
+    line = 1
+    for m in _TOKEN_RE.finditer(text):
+        kind = m.lastgroup
+        if kind != "space":
+            yield kind, m.group(), line
+        line += m.group().count("\n")
+
+
+def _literal(text):
+    """Return (value or None for x/z, width or None) of an SV number."""
+    if "'" not in text:
+        return int(text.replace("_", "")), None
+    size, _, rest = text.partition("'")
+    rest = rest.lstrip("sS")
+    base = {"b": 2, "o": 8, "d": 10, "h": 16}[rest[0].lower()]
+    digits = rest[1:].replace("_", "")
+    width = int(size) if size else None
+    if any(c in "xXzZ?" for c in digits):
+        return None, width
+    return int(digits, base), width
+
+
+class _Parser:
+    """Recursive-descent parser from SV source to a small statement AST."""
+
+    def __init__(self, text):
+        self.toks = list(_tokens(text))
+        self.lines = text.splitlines()
+        self.pos = 0
+
+    def peek(self, offset=0):
+        i = self.pos + offset
+        return self.toks[i][1] if i < len(self.toks) else None
+
+    def line(self):
+        return self.toks[min(self.pos, len(self.toks) - 1)][2] if self.toks else 0
+
+    def take(self, expected=None):
+        if self.pos >= len(self.toks):
+            raise ValueError(f"unexpected end of source, expected {expected!r}")
+        kind, text, line = self.toks[self.pos]
+        if expected is not None and text != expected:
+            raise ValueError(f"line {line}: expected {expected!r}, got {text!r}")
+        self.pos += 1
+        return text
+
+    def module(self):
+        """Return (name, [(var, width, init)], [(kind, line, label, stmt)])."""
+        while self.peek() not in ("module", None):
+            self.take()
+        self.take("module")
+        name = self.take()
+        while self.take() != ";":
+            pass
+        decls, procs = [], []
+        while self.peek() not in ("endmodule", None):
+            word = self.peek()
+            line = self.line()
+            if word in TYPE_WIDTHS:
+                decls.extend(self.declaration())
+            elif word in ("initial", "always", "always_ff"):
+                self.take()
+                stmt = self.statement()
+                label = f"L{line}: {self.lines[line - 1].split('//')[0].strip()}"
+                procs.append(("initial" if word == "initial" else "always",
+                              line, label, stmt))
+            else:
+                raise ValueError(f"line {line}: unsupported module item {word!r}")
+        return name, decls, procs
+
+    def declaration(self):
+        width = TYPE_WIDTHS[self.take()]
+        while self.peek() in ("signed", "unsigned"):
+            self.take()
+        if self.peek() == "[":
+            self.take("[")
+            msb = int(self.take())
+            self.take(":")
+            lsb = int(self.take())
+            self.take("]")
+            width = abs(msb - lsb) + 1
+        decls = []
+        while True:
+            name = self.take()
+            init = None
+            if self.peek() == "=":
+                self.take()
+                init = self.expression()
+            decls.append((name, width, init))
+            if self.take() == ";":
+                return decls
+
+    def statement(self):
+        word = self.peek()
+        line = self.line()
+        if word == "begin":
+            self.take()
+            body = []
+            while self.peek() != "end":
+                body.append(self.statement())
+            self.take("end")
+            return ("block", body)
+        if word == "#":
+            self.take()
+            delay = int(float(self.take()))
+            if self.peek() == ";":
+                self.take()
+                return ("delay", delay, None)
+            return ("delay", delay, self.statement())
+        if word == "@":
+            self.take()
+            self.take("(")
+            edge = ANY
+            if self.peek() in ("posedge", "negedge"):
+                edge = POSEDGE if self.take() == "posedge" else NEGEDGE
+            signal = self.take()
+            self.take(")")
+            if self.peek() == ";":
+                self.take()
+                return ("wait", signal, edge, None)
+            return ("wait", signal, edge, self.statement())
+        if word == "if":
+            self.take()
+            self.take("(")
+            cond = self.expression()
+            self.take(")")
+            then = self.statement()
+            other = None
+            if self.peek() == "else":
+                self.take()
+                other = self.statement()
+            return ("if", cond, then, other)
+        if word == "repeat":
+            self.take()
+            self.take("(")
+            count = self.expression()
+            self.take(")")
+            return ("repeat", count, self.statement())
+        if word == "forever":
+            self.take()
+            return ("forever", self.statement())
+        if word == ";":
+            self.take()
+            return ("block", [])
+        if word and word.startswith("$"):
+            task = self.take()
+            args = []
+            if self.peek() == "(":
+                self.take("(")
+                while self.peek() != ")":
+                    if self.peek().startswith('"'):
+                        args.append(("str", self.take()[1:-1]))
+                    else:
+                        args.append(self.expression())
+                    if self.peek() == ",":
+                        self.take()
+                self.take(")")
+            self.take(";")
+            if task not in ("$display", "$write", "$strobe", "$monitor", "$finish", "$stop"):
+                raise ValueError(f"line {line}: unsupported system task {task}")
+            return ("task", task, args)
+        target = self.take()
+        op = self.take()
+        if op not in ("=", "<="):
+            raise ValueError(f"line {line}: unsupported statement at {target!r}")
+        value = self.expression()
+        self.take(";")
+        return ("nba" if op == "<=" else "assign", target, value, line)
+
+    def expression(self, level=0):
+        if level == len(_BINARY):
+            return self.unary()
+        left = self.expression(level + 1)
+        while self.peek() in _BINARY[level]:
+            op = self.take()
+            if op == "?":
+                then = self.expression()
+                self.take(":")
+                other = self.expression(level)
+                left = ("?", left, then, other)
+            else:
+                left = (op, left, self.expression(level + 1))
+        return left
+
+    def unary(self):
+        word = self.take()
+        if word in ("~", "!", "-"):
+            return ("u" + word, self.unary())
+        if word == "(":
+            expr = self.expression()
+            self.take(")")
+            return expr
+        if word[0].isdigit() or word[0] == "'":
+            return ("const", _literal(word)[0])
+        if word in ("$time", "$stime", "$realtime"):
+            return ("time",)
+        if self.peek() == "[":
+            self.take()
+            index = self.expression()
+            self.take("]")
+            return ("bit", word, index)
+        return ("var", word)
+
+
+class Simulator:
+    """One module of the supported subset, compiled and ready to run()."""
+
+    def __init__(self, source, trace=None):
+        self.name, decls, procs = _Parser(source).module()
+        self.names = [name for name, _, _ in decls]
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.widths = [width for _, width, _ in decls]
+        self.masks = [(1 << w) - 1 for w in self.widths]
+        self.values = [None] * len(self.names)
+        self.waiters = [[] for _ in self.names]
+        self.output = []
+        self.time = 0
+        self.events = 0
+        self.steps = []
+        self.trace = trace
+        self._nba = []
+        self._strobes = []
+        self._watch = None
+        self._specs = []
+        self._consts = []
+        self._procs = []
+        self.labels = {}
+        for name, _, init in decls:
+            if init is not None:
+                value = eval(self._expr(init), {}, {"V": self.values})
+                i = self.index[name]
+                self.values[i] = None if value is None else value & self.masks[i]
+        for n, (kind, line, label, stmt) in enumerate(procs):
+            self._procs.append((self._compile(n, kind, stmt), label))
+
+    # -- compilation ---------------------------------------------------
+
+    def _var(self, name):
+        if name not in self.index:
+            raise ValueError(f"undeclared identifier {name!r}")
+        return self.index[name]
+
+    def _expr(self, node):
+        kind = node[0]
+        if kind == "const":
+            return repr(node[1])
+        if kind == "var":
+            return f"V[{self._var(node[1])}]"
+        if kind == "time":
+            return "S.time"
+        if kind == "bit":
+            return f"(V[{self._var(node[1])}] >> ({self._expr(node[2])}) & 1)"
+        if kind == "u~":
+            return f"(~{self._expr(node[1])})"
+        if kind == "u-":
+            return f"(-{self._expr(node[1])})"
+        if kind == "u!":
+            return f"int(not {self._expr(node[1])})"
+        if kind == "?":
+            return (f"({self._expr(node[2])} if {self._expr(node[1])} "
+                    f"else {self._expr(node[3])})")
+        left, right = self._expr(node[1]), self._expr(node[2])
+        op = _PY_OPS.get(kind, kind)
+        if kind in ("&&", "||", "==", "!=", "<", "<=", ">", ">="):
+            return f"int({left} {op} {right})"
+        return f"({left} {op} {right})"
+
+    def _const(self, value):
+        self._consts.append(value)
+        return f"C[{len(self._consts) - 1}]"
+
+    def _stmt(self, node, out, ind):
+        pad = "    " * ind
+        kind = node[0]
+        if kind == "block":
+            for child in node[1]:
+                self._stmt(child, out, ind)
+            if not node[1]:
+                out.append(f"{pad}pass")
+        elif kind == "delay":
+            out.append(f"{pad}yield {node[1]}")
+            if node[2] is not None:
+                self._stmt(node[2], out, ind)
+        elif kind == "wait":
+            out.append(f"{pad}yield {self._const((self._var(node[1]), node[2]))}")
+            if node[3] is not None:
+                self._stmt(node[3], out, ind)
+        elif kind in ("assign", "nba"):
+            i = self._var(node[1])
+            out.append(f"{pad}try:")
+            out.append(f"{pad}    _v = {self._expr(node[2])} & {self.masks[i]}")
+            out.append(f"{pad}except (TypeError, ArithmeticError):")
+            out.append(f"{pad}    _v = None")
+            if kind == "nba":
+                out.append(f"{pad}N.append(({i}, _v))")
+            else:
+                out.append(f"{pad}if V[{i}] != _v:")
+                out.append(f"{pad}    S._set({i}, _v)")
+        elif kind == "if":
+            out.append(f"{pad}try:")
+            out.append(f"{pad}    _c = {self._expr(node[1])}")
+            out.append(f"{pad}except (TypeError, ArithmeticError):")
+            out.append(f"{pad}    _c = None")
+            out.append(f"{pad}if _c:")
+            self._stmt(node[2], out, ind + 1)
+            if node[3] is not None:
+                out.append(f"{pad}else:")
+                self._stmt(node[3], out, ind + 1)
+        elif kind == "repeat":
+            out.append(f"{pad}for _ in range({self._expr(node[1])}):")
+            self._stmt(node[2], out, ind + 1)
+        elif kind == "forever":
+            out.append(f"{pad}while True:")
+            self._stmt(node[1], out, ind + 1)
+        elif kind == "task":
+            task, args = node[1], node[2]
+            if task in ("$finish", "$stop"):
+                out.append(f"{pad}raise Finish")
+                return
+            spec = self._spec(args, newline=task != "$write")
+            values = ", ".join(self._expr(a) for a in args if a[0] != "str")
+            getter = f"lambda: ({values},)" if values else "lambda: ()"
+            method = {"$display": "_display", "$write": "_display",
+                      "$strobe": "_strobe", "$monitor": "_monitor"}[task]
+            out.append(f"{pad}S.{method}({spec}, {getter})")
+
+    def _spec(self, args, newline):
+        """Pre-split the format of a display task into literal and conversion parts."""
+        exprs = [a for a in args if a[0] != "str"]
+        widths = [self.widths[self.index[a[1]]] if a[0] == "var" else 32 for a in exprs]
+        fmt = ""
+        if args and args[0][0] == "str":
+            fmt = args[0][1].encode().decode("unicode_escape")
+        parts, n, pos = [], 0, 0
+        for m in _FORMAT_RE.finditer(fmt):
+            parts.append(fmt[pos:m.start()])
+            conv = m.group(3).lower()
+            if conv == "%":
+                parts.append("%")
+            elif conv == "m":
+                parts.append(self.name)
+            else:
+                minimal = m.group(1) == "0" or m.group(2) == "0"
+                parts.append((conv, minimal, widths[n] if n < len(widths) else 32, n))
+                n += 1
+            pos = m.end()
+        parts.append(fmt[pos:])
+        # Arguments without a conversion print as decimals.
+        for extra in range(n, len(exprs)):
+            parts.append(("d", False, widths[extra], extra))
+        if newline:
+            parts.append("\n")
+        return self._const(tuple(parts))
+
+    def _compile(self, n, kind, stmt):
+        out = [f"def _p{n}(S, V, N, C):"]
+        if kind == "always":
+            out.append("    while True:")
+            self._stmt(stmt, out, 2)
+        else:
+            self._stmt(stmt, out, 1)
+        out.append("    return")
+        out.append("    yield")
+        namespace = {"Finish": Finish}
+        exec("\n".join(out), namespace)
+        return namespace[f"_p{n}"]
+
+    # -- runtime -------------------------------------------------------
+
+    def _format(self, spec, values):
+        text = []
+        for part in spec:
+            if part.__class__ is str:
+                text.append(part)
+                continue
+            conv, minimal, width, n = part
+            value = values[n] if n < len(values) else None
+            if conv in ("b", "o", "h", "x"):
+                base = {"b": ("b", 1), "o": ("o", 3), "h": ("x", 4), "x": ("x", 4)}[conv]
+                digits = 1 if minimal else -(-width // base[1])
+                text.append("x" * digits if value is None
+                            else format(value, f"0{digits}{base[0]}"))
+            elif conv == "t":
+                text.append(str(value) if minimal else f"{value:>20}")
+            elif conv == "s":
+                text.append(str(value))
+            elif conv == "c":
+                text.append(chr(value or 0))
+            else:
+                digits = 1 if minimal else len(str((1 << width) - 1))
+                text.append(("x" if value is None else str(value)).rjust(digits))
+        return "".join(text)
+
+    def _emit(self, text):
+        lines = text.split("\n")
+        if self.output and self._open_line:
+            self.output[-1] += lines[0]
+            lines = lines[1:]
+        self._open_line = not text.endswith("\n")
+        if not self._open_line:
+            lines = lines[:-1]
+        self.output.extend(lines)
+
+    def _display(self, spec, getter):
+        self._emit(self._format(spec, getter()))
+
+    def _strobe(self, spec, getter):
+        self._strobes.append((spec, getter))
+
+    def _monitor(self, spec, getter):
+        self._watch = [spec, getter, None]
+
+    def _set(self, i, value):
+        old = self.values[i]
+        self.values[i] = value
+        waiting = self.waiters[i]
+        if not waiting:
+            return
+        keep = []
+        for proc, edge in waiting:
+            if edge == ANY:
+                self._active.append(proc)
+                continue
+            o = None if old is None else old & 1
+            n = None if value is None else value & 1
+            if edge == POSEDGE:
+                hit = (o == 0 and n != 0) or (o is None and n == 1)
+            else:
+                hit = (o == 1 and n != 1) or (o is None and n == 0)
+            if hit:
+                self._active.append(proc)
+            else:
+                keep.append((proc, edge))
+        self.waiters[i] = keep
+
+    def _snapshot(self, region, inactive, applied=False):
+        def label(proc):
+            return self.labels.get(proc, "?")
+        self.steps.append({
+            "time": self.time,
+            "region": region,
+            "applied": applied,
+            "running": label(self._active[0]) if region == "Active" else None,
+            "queues": {
+                "Active": [label(p) for p in self._active],
+                "Inactive": [label(p) for p in inactive],
+                "NBA": [f"{self.names[i]} <= {self._show(i, v)}" for i, v in self._nba],
+                "Postponed": (["$strobe"] * len(self._strobes)
+                              + (["$monitor"] if self._watch else [])),
+            },
+            "values": {name: self._show(i, v)
+                       for i, (name, v) in enumerate(zip(self.names, self.values))},
+            "output": len(self.output),
+        })
+
+    def _show(self, i, value):
+        if value is None:
+            return "x"
+        return str(value) if self.widths[i] == 1 else format(value, "X")
+
+    def run(self, until=None):
+        """Run to $finish, an empty queue or time `until`; return the output lines."""
+        values, nba, consts = self.values, self._nba, self._consts
+        labels = self.labels
+        self._open_line = False
+        self._active = active = deque()
+        future = {0: []}
+        heap = [0]
+        for compiled, label in self._procs:
+            proc = compiled(self, values, nba, consts)
+            labels[proc] = label
+            future[0].append(proc)
+        trace = self.trace
+        events = 0
+        try:
+            while heap:
+                t = heapq.heappop(heap)
+                if until is not None and t > until:
+                    break
+                self.time = t
+                active.extend(future.pop(t))
+                tracing = trace is not None and trace[0] <= t <= trace[1]
+                inactive = []
+                while True:
+                    while active:
+                        if tracing:
+                            self._snapshot("Active", inactive)
+                        proc = active.popleft()
+                        events += 1
+                        try:
+                            wait = proc.send(None)
+                        except StopIteration:
+                            continue
+                        if wait.__class__ is int:
+                            if wait == 0:
+                                inactive.append(proc)
+                            else:
+                                slot = future.get(t + wait)
+                                if slot is None:
+                                    future[t + wait] = [proc]
+                                    heapq.heappush(heap, t + wait)
+                                else:
+                                    slot.append(proc)
+                        else:
+                            self.waiters[wait[0]].append((proc, wait[1]))
+                    if inactive:
+                        if tracing:
+                            self._snapshot("Inactive", inactive)
+                        active.extend(inactive)
+                        inactive = []
+                        continue
+                    if nba:
+                        if tracing:
+                            self._snapshot("NBA", inactive)
+                        updates = nba[:]
+                        del nba[:]
+                        for i, value in updates:
+                            events += 1
+                            if values[i] != value:
+                                self._set(i, value)
+                        if tracing:
+                            self._snapshot("NBA", inactive, applied=True)
+                        continue
+                    break
+                self._postponed(tracing)
+        except Finish:
+            self._postponed(trace is not None and trace[0] <= self.time <= trace[1])
+        self.events += events
+        return self.output
+
+    def _postponed(self, tracing):
+        if not (self._strobes or self._watch):
+            return
+        if tracing:
+            self._snapshot("Postponed", [])
+        for spec, getter in self._strobes:
+            self._emit(self._format(spec, getter()))
+        del self._strobes[:]
+        if self._watch:
+            spec, getter, last = self._watch
+            current = getter()
+            if current != last:
+                self._watch[2] = current
+                self._emit(self._format(spec, current))
+
+
+def run_file(path, trace=None, until=None):
+    """Simulate the first module in the SV file at `path`; return the Simulator."""
+    with open(path, encoding="utf-8") as f:
+        sim = Simulator(f.read(), trace)
+    sim.run(until)
+    return sim
+
+
+def region_slides(prs, sim, title, add_slide, start=0, max_steps=12):
+    """Add one region slide per traced step; return the last slide number.
+
+    `add_slide` is the deck's add_regions_slide, so the slides go through
+    the running build's hooks, pipeline and template. The whole output so
+    far is shown, OUTPUT_LINES per slide, continuing on "(cont.)" slides.
+    """
+    steps = sim.steps[:max_steps]
+    sn = start
+    for i, step in enumerate(steps, 1):
+        output = [line for text in sim.output[:step["output"]]
+                  for line in text.splitlines() if line.strip()]
+        pages = [output[k:k + OUTPUT_LINES]
+                 for k in range(0, len(output), OUTPUT_LINES)] or [[]]
+        for page, lines in enumerate(pages):
+            shown = dict(step, output=lines)
+            cont = " (cont.)" if page else ""
+            applied = " updated" if step.get("applied") else ""
+            sn += 1
+            add_slide(prs, f"{title} [{i}/{len(steps)}]: t={step['time']} "
+                           f"{step['region']}{applied}{cont}", shown, sn)
+    return sn
+
+
+def race_source(n, cycles):
+    """Return a module with an n-stage NBA pipeline clocked for `cycles` cycles."""
+    lines = ["module race;", "    logic clk = 0;"]
+    lines += [f"    logic [7:0] s{i} = 0;" for i in range(n)]
+    lines.append("    always #5 clk = ~clk;")
+    lines.append("    always @(posedge clk) s0 <= s0 + 1;")
+    lines += [f"    always @(posedge clk) s{i} <= s{i - 1};" for i in range(1, n)]
+    lines.append(f"    initial begin #{cycles * 10}; $display(\"s{n - 1}=%0d\", s{n - 1});"
+                 " $finish; end")
+    lines.append("endmodule")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("source", nargs="?", help="SV file with one module")
+    parser.add_argument("--trace", help="START:END time window to record regions for")
+    parser.add_argument("--slides", metavar="PPTX", help="write the region slides")
+    parser.add_argument("--race", type=int, metavar="N",
+                        help="benchmark an N-stage non-blocking pipeline")
+    parser.add_argument("--cycles", type=int, default=1000)
+    args = parser.parse_args()
+
+    trace = tuple(int(x) for x in args.trace.split(":")) if args.trace else None
+    if not (args.race or args.source):
+        parser.error("a source file or --race is required")
+    try:
+        if args.race:
+            sim = Simulator(race_source(args.race, args.cycles), trace)
+        else:
+            with open(args.source, encoding="utf-8") as f:
+                sim = Simulator(f.read(), trace)
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        sys.exit(1)
+    t0 = time.perf_counter()
+    sim.run()
+    elapsed = time.perf_counter() - t0
+    print("\n".join(sim.output))
+    print(f"-- {sim.events} events to t={sim.time} in {elapsed:.3f} s "
+          f"({sim.events / max(elapsed, 1e-9) / 1e6:.2f} M events/s)", file=sys.stderr)
+
+    if args.slides:
+        import generate_pptx as gp
+
+        prs = gp.new_presentation()
+        sn = region_slides(prs, sim, sim.name, gp.add_regions_slide,
+                           max_steps=len(sim.steps))
+        prs.save(args.slides)
+        print(f"Region slides saved to: {args.slides} ({sn} slides)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
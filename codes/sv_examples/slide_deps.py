@@ -0,0 +1,271 @@
+"""
+Slide-to-source dependency graph for generate_pptx.py
+
+While the deck is built, every slide records what it was made from:
+  - the build_deck() call that holds its inline title/code/output strings
+  - the example .sv files (and transcripts) covering the same LRM section,
+    and the modules that computed its content (generate_pptx.computed_by)
+  - the style constants and helper functions its renderer reads
+
+The graph is written next to the deck as <deck>.deps.json and can be queried
+for the slides impacted by a set of changes.
+
+Usage:
+    python slide_deps.py section_7/7_10_queues/7_10_queues.sv
+    python slide_deps.py SV_KEYWORDS
+    python slide_deps.py generate_pptx.py:42-58 --graph ../../Presentations/Section2.deps.json
+"""
+
+import os
+import re
+import ast
+import json
+import argparse
+
+EXAMPLES_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.normpath(os.path.join(EXAMPLES_DIR, "..", ".."))
+DEFAULT_GRAPH = os.path.join(REPO_ROOT, "Presentations", "Section2.deps.json")
+
+# Renderer entry point for each slide kind.
+KIND_ROOTS = {
+    "title": "add_title_slide",
+    "bullet": "add_bullet_slide",
+    "code": "add_code_slide",
+    "waveform": "add_waveform_slide",
+    "chart": "add_histogram_slide",
+    "table": "add_table_slide",
+    "regions": "add_regions_slide",
+}
+
+# A code slide only runs the tokenizer for its own language.
+LANG_EXCLUDES = {
+    "sv": {"tokenize_tcl_line"},
+    "tcl": {"tokenize_sv_line", "declared_sv_names"},
+}
+
+# Build plumbing that never changes what a slide looks like.
+NON_RENDER_SYMBOLS = {"SLIDE_HOOKS", "_slide_done", "_caller", "PIPELINE"}
+
+_SECTION_RE = re.compile(r"^(\d+(?:\.\d+)*)\b")
+_LRM_HEADER_RE = re.compile(r"LRM Sections?\s+([\d.\s/\-]+)")
+_REGION_RE = re.compile(r"^(.*):(\d+)(?:-(\d+))?$")
+
+
+def sidecar_path(pptx_path):
+    """Return the dependency-graph path that sits next to `pptx_path`."""
+    return os.path.splitext(pptx_path)[0] + ".deps.json"
+
+
+def _rel(path):
+    return os.path.relpath(os.path.abspath(path), REPO_ROOT).replace(os.sep, "/")
+
+
+def module_symbols(path):
+    """Map each top-level function/constant in `path` to (start, end, names used)."""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+
+    symbols = {}
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef):
+            names = [node.name]
+        elif isinstance(node, ast.Assign):
+            names = [t.id for t in node.targets if isinstance(t, ast.Name)]
+        else:
+            continue
+        used = {n.id for n in ast.walk(node) if isinstance(n, ast.Name)}
+        for name in names:
+            symbols[name] = (node.lineno, node.end_lineno, used - {name})
+    return symbols
+
+
+def slide_calls(path, func="build_deck"):
+    """Return (start, end) line spans of the calls inside `func` in `path`."""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+
+    spans = []
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef) and node.name == func:
+            for stmt in node.body:
+                if isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Call):
+                    spans.append((stmt.lineno, stmt.end_lineno))
+    return spans
+
+
+def symbol_closure(roots, symbols, exclude=()):
+    """Return every symbol reachable from `roots` through name references."""
+    seen = set()
+    stack = [r for r in roots if r in symbols]
+    while stack:
+        name = stack.pop()
+        if name in seen or name in exclude:
+            continue
+        seen.add(name)
+        stack.extend(n for n in symbols[name][2] if n in symbols)
+    return seen
+
+
+def example_index(examples_dir=EXAMPLES_DIR):
+    """Map each LRM section number named in an example header to its files."""
+    index = {}
+    for dirpath, _, filenames in os.walk(examples_dir):
+        for name in sorted(filenames):
+            if not name.endswith(".sv"):
+                continue
+            path = os.path.join(dirpath, name)
+            with open(path, encoding="utf-8", errors="replace") as f:
+                header = "".join(f.readline() for _ in range(5))
+            m = _LRM_HEADER_RE.search(header)
+            if not m:
+                continue
+            files = [_rel(path)]
+            transcript = os.path.join(dirpath, "transcript")
+            if os.path.isfile(transcript):
+                files.append(_rel(transcript))
+            for num in re.findall(r"\d+(?:\.\d+)*", m.group(1)):
+                index.setdefault(num, []).extend(files)
+    return index
+
+
+def examples_for_title(title, index):
+    """Return the example files whose LRM sections overlap the slide title's."""
+    m = _SECTION_RE.match(title)
+    if not m:
+        return []
+    num = m.group(1)
+    files = []
+    for section, paths in index.items():
+        if (num == section or num.startswith(section + ".")
+                or section.startswith(num + ".")):
+            files.extend(p for p in paths if p not in files)
+    return sorted(files)
+
+
+class DependencyRecorder:
+    """SLIDE_HOOKS callback that collects one graph node per finished slide."""
+
+    def __init__(self, generator_path):
+        self.generator = os.path.abspath(generator_path)
+        self.symbols = module_symbols(self.generator)
+        self.calls = slide_calls(self.generator)
+        self.examples = example_index()
+        self.slides = []
+
+    def _call_span(self, line):
+        for start, end in self.calls:
+            if start <= line <= end:
+                return start, end
+        return line, line
+
+    def __call__(self, slide, info):
+        root = KIND_ROOTS[info["kind"]]
+        exclude = NON_RENDER_SYMBOLS | LANG_EXCLUDES.get(info["lang"], set())
+        start, end = self._call_span(info["line"])
+        self.slides.append({
+            "id": info["id"],
+            "title": info["title"],
+            "kind": info["kind"],
+            "lang": info["lang"],
+            "call": [_rel(info["file"]), start, end],
+            "config": sorted(symbol_closure([root], self.symbols, exclude)),
+            "files": examples_for_title(info["title"], self.examples)
+                     + sorted({_rel(p) for p in info.get("sources", ())}),
+        })
+
+    def to_dict(self, out_dir):
+        gen = _rel(self.generator)
+        return {
+            "version": 1,
+            "root": os.path.relpath(REPO_ROOT, out_dir).replace(os.sep, "/"),
+            "symbols": {
+                name: [gen, start, end]
+                for name, (start, end, _) in sorted(self.symbols.items())
+            },
+            "slides": self.slides,
+        }
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(os.path.dirname(os.path.abspath(path))),
+                      f, indent=1)
+
+
+def load_graph(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _parse_change(change, root):
+    """Split a change spec into (repo-relative path or None, line span, symbol)."""
+    m = _REGION_RE.match(change)
+    path, span = change, None
+    if m and not os.path.exists(change):
+        path = m.group(1)
+        start = int(m.group(2))
+        span = (start, int(m.group(3) or start))
+    if os.path.exists(path):
+        return _rel(path), span, None
+    if os.path.exists(os.path.join(root, path)):
+        return _rel(os.path.join(root, path)), span, None
+    return None, None, change
+
+
+def _overlaps(span, start, end):
+    return span is None or (span[0] <= end and start <= span[1])
+
+
+def impacted_slides(graph, changes, graph_dir="."):
+    """Return the graph's slides that depend on any of `changes`.
+
+    A change is a file path, a `path:start[-end]` line range, or the name of
+    a generator constant/function such as SV_KEYWORDS.
+    """
+    root = os.path.normpath(os.path.join(graph_dir, graph["root"]))
+    symbols = graph["symbols"]
+    changed_files = set()
+    changed_symbols = set()
+    changed_calls = []
+
+    for change in changes:
+        path, span, symbol = _parse_change(change, root)
+        if symbol is not None:
+            changed_symbols.add(symbol)
+            continue
+        if span is None:
+            changed_files.add(path)
+        changed_calls.append((path, span))
+        for name, (spath, start, end) in symbols.items():
+            if spath == path and _overlaps(span, start, end):
+                changed_symbols.add(name)
+
+    hits = []
+    for slide in graph["slides"]:
+        cpath, cstart, cend = slide["call"]
+        if (changed_files.intersection(slide["files"])
+                or changed_symbols.intersection(slide["config"])
+                or any(p == cpath and _overlaps(s, cstart, cend)
+                       for p, s in changed_calls)):
+            hits.append(slide)
+    return hits
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="List the slides impacted by changed files, lines or constants.")
+    parser.add_argument("changes", nargs="+",
+                        help="path, path:start-end, or constant name (e.g. SV_KEYWORDS)")
+    parser.add_argument("--graph", default=DEFAULT_GRAPH,
+                        help="dependency graph written by generate_pptx.py")
+    args = parser.parse_args()
+
+    graph = load_graph(args.graph)
+    hits = impacted_slides(graph, args.changes,
+                           os.path.dirname(os.path.abspath(args.graph)))
+    for slide in hits:
+        print(f"{slide['id']:4d}  {slide['title']}")
+    print(f"{len(hits)} of {len(graph['slides'])} slides impacted")
+
+
+if __name__ == "__main__":
+    main()
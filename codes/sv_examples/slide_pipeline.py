@@ -0,0 +1,75 @@
+"""
+Pipelined slide building for generate_pptx.py
+
+Laying out a code box (tokenize, coalesce runs, paginate) is pure string
+work that does not depend on python-pptx. With a SlidePipeline installed as
+generate_pptx.PIPELINE, the add_*_slide functions queue their slides
+instead of building them: code layouts are computed on a process pool
+while the main thread builds shapes for the oldest queued slide. The
+queue holds at most `depth` slides, so memory stays capped and slides
+are still added to the presentation in order.
+
+Experimental: layout is a small share of a build, and starting the pool
+and pickling pages costs about as much as it saves, so no speedup has
+been measured (the default deck builds no faster, often slower). Keep it
+for trace experiments; the serial build is the one to use.
+
+Usage (see generate_pptx.build):
+    generate_pptx.PIPELINE = SlidePipeline()
+    build_deck(prs)
+    generate_pptx.PIPELINE.close()
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import build_trace
+
+
+def _layout(args):
+    import generate_pptx
+    with build_trace.span("layout", "worker", lang=args[2] if len(args) > 2 else "sv"):
+        pages = generate_pptx.layout_code(*args)
+    build_trace.flush(f"layout worker {os.getpid()}")
+    return pages
+
+
+class SlidePipeline:
+    """Bounded FIFO of slide builders fed by a layout process pool."""
+
+    def __init__(self, workers=None, depth=None):
+        workers = workers or os.cpu_count() or 1
+        self.depth = depth or 4 * workers
+        self._pool = ProcessPoolExecutor(max_workers=workers)
+        self._queue = deque()
+
+    def submit(self, build, *args):
+        """Queue build(*args) behind the slides already waiting."""
+        self._queue.append((build, args, None))
+        self._drain(self.depth)
+
+    def submit_layout(self, layout_args, build, *args):
+        """Lay out layout_args in a worker, then run build(*args, pages)."""
+        future = self._pool.submit(_layout, layout_args)
+        self._queue.append((build, args, future))
+        self._drain(self.depth)
+
+    def _drain(self, keep):
+        while len(self._queue) > keep:
+            build, args, future = self._queue.popleft()
+            build_trace.counter("pipeline queue", slides=len(self._queue))
+            if future is not None:
+                with build_trace.span("merge layout", "pipeline", ready=future.done()):
+                    args += (future.result(),)
+            build(*args)
+
+    def close(self):
+        """Build every queued slide and stop the workers."""
+        self._drain(0)
+        self._pool.shutdown()
+
+    def cancel(self):
+        """Drop the queued slides and stop the workers."""
+        self._queue.clear()
+        self._pool.shutdown(cancel_futures=True)
@@ -0,0 +1,223 @@
+"""
+Golden snapshots of a generated deck, compared slide by slide
+
+Reads the .pptx straight from the zip (no python-pptx, like deck_report)
+and turns every slide, plus any chart parts it references, into a
+canonical text form: one element per line with sorted attributes, shape
+ids, shape-name counters and relationship ids blanked, and footer dates
+replaced. Each slide is hashed; the hashes and canonical text of an
+accepted deck are the golden snapshot (snapshots/<deck>.golden.json.gz).
+
+A check aligns the current hashes with the golden ones, so an inserted
+slide shows up as added rather than as every later slide changing, and
+prints a unified diff of the canonical XML only for the slides that
+differ. The whole deck checks in well under a second.
+
+snapshots/Section2.golden.json.gz is committed. When a change to the
+generator is meant to change the deck, accept it with --build --update
+and commit the new snapshot together with the change; a new deck is
+bootstrapped the same way. The file is written with a fixed gzip
+timestamp, so an update that changes no slide leaves it byte-identical.
+
+Usage:
+    python slide_snapshots.py --update              # accept the current deck
+    python slide_snapshots.py                       # check ../../Presentations/Section2.pptx
+    python slide_snapshots.py --build --context 1   # rebuild the deck, then check
+    python slide_snapshots.py other.pptx --golden other.golden.json.gz
+"""
+
+import os
+import re
+import sys
+import gzip
+import json
+import time
+import difflib
+import hashlib
+import zipfile
+import argparse
+import posixpath
+import xml.etree.ElementTree as ET
+
+import deck_report
+
+EXAMPLES_DIR = os.path.dirname(os.path.abspath(__file__))
+GOLDEN_DIR = os.path.join(EXAMPLES_DIR, "snapshots")
+DEFAULT_DECK = os.path.join(EXAMPLES_DIR, "..", "..", "Presentations", "Section2.pptx")
+VERSION = 1
+
+PREFIXES = {
+    "http://schemas.openxmlformats.org/presentationml/2006/main": "p",
+    "http://schemas.openxmlformats.org/drawingml/2006/main": "a",
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships": "r",
+    "http://schemas.openxmlformats.org/drawingml/2006/chart": "c",
+}
+_NS_RE = re.compile(r"\{([^}]*)\}")
+_DATE_RE = re.compile(r"\b\d{1,2}/\d{1,2}/\d{4}\b|\b\d{4}-\d{2}-\d{2}\b")
+_COUNTER_RE = re.compile(r" \d+$")
+# Attributes whose values are allocated per package or per slide.
+VOLATILE = {"r:id", "r:embed", "r:link", "r:pict", "id"}
+
+
+def _short(name):
+    return _NS_RE.sub(lambda m: PREFIXES.get(m.group(1), m.group(1)) + ":", name)
+
+
+def blank_dates(text):
+    """Replace the dates in `text` (build date, report dates) with "<date>"."""
+    return _DATE_RE.sub("<date>", text)
+
+
+def canonical(xml):
+    """Return the canonical text lines of one XML part."""
+    lines = []
+
+    def walk(elem, depth):
+        tag = _short(elem.tag)
+        attrs = []
+        for key, value in sorted((_short(k), v) for k, v in elem.attrib.items()):
+            if key in VOLATILE:
+                value = "*"
+            elif key == "name" and tag.endswith("cNvPr"):
+                value = _COUNTER_RE.sub("", value)
+            attrs.append(f"{key}={value!r}")
+        text = (elem.text or "").strip()
+        if text:
+            text = " " + repr(blank_dates(text))
+        lines.append("  " * depth + " ".join([tag] + attrs) + text)
+        for child in elem:
+            walk(child, depth + 1)
+
+    walk(ET.fromstring(xml), 0)
+    return lines
+
+
+def _related_charts(zf, member):
+    rels = posixpath.join(posixpath.dirname(member), "_rels",
+                          posixpath.basename(member) + ".rels")
+    if rels not in zf.namelist():
+        return []
+    root = ET.fromstring(zf.read(rels))
+    base = posixpath.dirname(member)
+    return sorted(posixpath.normpath(posixpath.join(base, r.get("Target")))
+                  for r in root.iter(deck_report.NS_REL + "Relationship")
+                  if r.get("Type", "").endswith("/chart"))
+
+
+def snapshot(path):
+    """Return [{"title", "sha256", "xml"}] for each slide of the deck at `path`."""
+    slides = []
+    with zipfile.ZipFile(path) as zf:
+        for member in deck_report.slide_members(zf):
+            data = zf.read(member)
+            lines = canonical(data)
+            for chart in _related_charts(zf, member):
+                lines.append("# chart")
+                lines += canonical(zf.read(chart))
+            title = ""
+            for elem in ET.fromstring(data).iter(deck_report.NS_A + "t"):
+                if elem.text and elem.text.strip():
+                    title = elem.text.strip()
+                    break
+            text = "\n".join(lines)
+            slides.append({"title": title, "xml": text,
+                           "sha256": hashlib.sha256(text.encode("utf-8")).hexdigest()})
+    return slides
+
+
+def golden_path(deck):
+    stem = os.path.splitext(os.path.basename(deck))[0]
+    return os.path.join(GOLDEN_DIR, stem + ".golden.json.gz")
+
+
+def save_golden(slides, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    data = json.dumps({"version": VERSION, "slides": slides}).encode("utf-8")
+    with open(path, "wb") as f, gzip.GzipFile(fileobj=f, mode="wb", mtime=0) as gz:
+        gz.write(data)
+
+
+def load_golden(path):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("version") != VERSION:
+        raise ValueError(f"{path}: snapshot version {data.get('version')}, "
+                         f"expected {VERSION}; run with --update")
+    return data["slides"]
+
+
+def compare(golden, current):
+    """Return [(kind, golden index, current index)] for every slide that is not equal.
+
+    kind is "changed", "added" or "removed"; indexes are 0-based or None.
+    """
+    matcher = difflib.SequenceMatcher(None, [s["sha256"] for s in golden],
+                                      [s["sha256"] for s in current], autojunk=False)
+    out = []
+    for op, g0, g1, c0, c1 in matcher.get_opcodes():
+        if op == "equal":
+            continue
+        pairs = min(g1 - g0, c1 - c0) if op == "replace" else 0
+        out += [("changed", g0 + i, c0 + i) for i in range(pairs)]
+        out += [("removed", g, None) for g in range(g0 + pairs, g1)]
+        out += [("added", None, c) for c in range(c0 + pairs, c1)]
+    return out
+
+
+def format_diff(golden, current, differences, context=3):
+    lines = []
+    for kind, g, c in differences:
+        if kind == "removed":
+            lines.append(f"--- slide {g + 1} removed: {golden[g]['title']}")
+            continue
+        if kind == "added":
+            lines.append(f"+++ slide {c + 1} added: {current[c]['title']}")
+            continue
+        lines.append(f"*** slide {c + 1} changed: {current[c]['title']}")
+        lines += difflib.unified_diff(
+            golden[g]["xml"].splitlines(), current[c]["xml"].splitlines(),
+            f"golden/slide{g + 1}", f"current/slide{c + 1}", n=context, lineterm="")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("deck", nargs="?", default=DEFAULT_DECK)
+    parser.add_argument("--golden", default=None,
+                        help="snapshot file (default: snapshots/<deck>.golden.json.gz)")
+    parser.add_argument("--update", action="store_true",
+                        help="store the current deck as the golden snapshot")
+    parser.add_argument("--build", action="store_true",
+                        help="rebuild the deck with generate_pptx.build() first")
+    parser.add_argument("--context", type=int, default=3,
+                        help="lines of context in the XML diffs")
+    args = parser.parse_args()
+    golden_file = args.golden or golden_path(args.deck)
+
+    if args.build:
+        import generate_pptx
+        generate_pptx.build(args.deck)
+
+    t0 = time.perf_counter()
+    current = snapshot(args.deck)
+    if args.update:
+        save_golden(current, golden_file)
+        print(f"Golden snapshot of {len(current)} slides saved to: {golden_file}")
+        return
+    if not os.path.exists(golden_file):
+        sys.exit(f"{golden_file}: no golden snapshot; run with --update first")
+
+    golden = load_golden(golden_file)
+    differences = compare(golden, current)
+    if differences:
+        print(format_diff(golden, current, differences, args.context))
+    counts = {}
+    for kind, _, _ in differences:
+        counts[kind] = counts.get(kind, 0) + 1
+    summary = ", ".join(f"{n} {kind}" for kind, n in sorted(counts.items())) or "all match"
+    print(f"{len(current)} slides checked in {time.perf_counter() - t0:.2f} s: {summary}")
+    sys.exit(1 if differences else 0)
+
+
+if __name__ == "__main__":
+    main()
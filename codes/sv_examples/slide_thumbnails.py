@@ -0,0 +1,292 @@
+"""
+Slide thumbnails, a contact sheet and an index for deck review and the LMS
+
+Every slide is rasterized to a PNG in a content-addressed cache: the file
+name is a hash of the slide's content, the source and the thumbnail width,
+so only slides that changed since the last run are rendered again. Missing
+thumbnails are rendered on a process pool. The stage then writes a contact
+sheet (a grid of all thumbnails) and an index JSON that maps every slide to
+its title, hash and thumbnail.
+
+Two sources are supported:
+    pdf   - pages of the exported PDF (pdf_export.py), keyed by slide XML
+            and the parts it uses, exported only when a thumbnail is missing;
+            rendered with PyMuPDF when installed, otherwise poppler's pdftoppm
+    html  - slides of the HTML preview (html_preview.py), keyed by slide
+            HTML; rendered with headless Chromium
+
+Usage:
+    python slide_thumbnails.py ../../Presentations/Section2.pptx
+    python slide_thumbnails.py --source html --width 480 --cols 4
+"""
+
+import os
+import sys
+import json
+import shutil
+import hashlib
+import zipfile
+import argparse
+import tempfile
+import posixpath
+import subprocess
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image, ImageDraw
+
+try:
+    import fitz
+except ImportError:
+    fitz = None
+
+import generate_pptx as gp
+import deck_report
+from slide_snapshots import blank_dates
+
+CACHE_DIR = os.path.join(gp.OUTPUT_DIR, ".thumbs")
+RENDER_TIMEOUT = 120
+
+# Slide size in CSS pixels (96 dpi), the viewport Chromium renders at.
+_PX_WIDTH = round(gp.SLIDE_WIDTH / 9525)
+_PX_HEIGHT = round(gp.SLIDE_HEIGHT / 9525)
+
+
+def _key(source, width, *blobs):
+    h = hashlib.sha256(f"{source}:{width}".encode())
+    for blob in blobs:
+        h.update(hashlib.sha256(blob).digest())
+    return h.hexdigest()
+
+
+def _rels_member(member):
+    folder, name = posixpath.split(member)
+    return posixpath.join(folder, "_rels", name + ".rels")
+
+
+def _related(zf, member, names):
+    """Return the parts `member` references (layout, chart, image, ...), notes aside."""
+    rels = _rels_member(member)
+    if rels not in names:
+        return []
+    base = posixpath.dirname(member)
+    return [posixpath.normpath(posixpath.join(base, r.get("Target")))
+            for r in ET.fromstring(zf.read(rels)).iter(deck_report.NS_REL + "Relationship")
+            if r.get("TargetMode") != "External"
+            and not r.get("Type", "").endswith("/notesSlide")]
+
+
+def _part_digest(zf, member, names, memo):
+    """Hash of one part and its .rels, with footer dates blanked."""
+    if member not in memo:
+        h = hashlib.sha256()
+        for part in (member, _rels_member(member)):
+            data = zf.read(part) if part in names else b""
+            if part.endswith((".xml", ".rels")):
+                data = blank_dates(data.decode("utf-8")).encode("utf-8")
+            h.update(hashlib.sha256(data).digest())
+        memo[member] = h.digest()
+    return memo[member]
+
+
+def pdf_slides(deck, width):
+    """Return [(title, key)] for the slides of `deck` in order.
+
+    A slide's key covers its XML and every part it reaches through
+    relationships (charts, media, layout, master, theme), so re-theming
+    the deck renders it again while a new footer date does not.
+    """
+    rows = deck_report.analyze(deck)
+    with zipfile.ZipFile(deck) as zf:
+        names = set(zf.namelist())
+        memo, keys = {}, []
+        for member in deck_report.slide_members(zf):
+            parts, todo = {}, [member]
+            while todo:
+                part = todo.pop()
+                if part in parts or part not in names:
+                    continue
+                parts[part] = _part_digest(zf, part, names, memo)
+                todo += _related(zf, part, names)
+            keys.append(_key("pdf", width, *(parts[part] for part in sorted(parts))))
+    return [(row["title"], key) for row, key in zip(rows, keys)]
+
+
+def html_slides(profile, width):
+    """Return ([(title, key)], [standalone page]) for the HTML preview slides."""
+    import html_preview
+
+    deck = html_preview.HtmlDeck(highlight=gp.BUILD_PROFILES[profile]["highlight"])
+    gp.build_deck(deck)
+    css = html_preview.stylesheet() + (
+        "body{background:#fff;padding:0}.slide{margin:0;box-shadow:none}")
+    pages = [
+        f'<!DOCTYPE html>\n<html><head><meta charset="utf-8"><style>{css}'
+        f"</style></head><body>{section}</body></html>\n"
+        for section in deck.slides
+    ]
+    slides = [(title, _key("html", width, blank_dates(page).encode()))
+              for title, page in zip(deck.titles, pages)]
+    return slides, pages
+
+
+def _render_pdf_page(pdf, index, width, out):
+    if fitz is not None:
+        with fitz.open(pdf) as doc:
+            page = doc[index]
+            zoom = width / page.rect.width
+            page.get_pixmap(matrix=fitz.Matrix(zoom, zoom)).save(out)
+        return
+    tool = shutil.which("pdftoppm")
+    if tool is None:
+        raise RuntimeError("PDF thumbnails need PyMuPDF or poppler's pdftoppm")
+    prefix = os.path.splitext(out)[0]
+    subprocess.run(
+        [tool, "-f", str(index + 1), "-l", str(index + 1), "-png", "-singlefile",
+         "-scale-to-x", str(width), "-scale-to-y", "-1", pdf, prefix],
+        check=True, timeout=RENDER_TIMEOUT, stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE)
+    os.replace(prefix + ".png", out)
+
+
+def _find_chromium():
+    for name in ("chromium", "chromium-browser", "google-chrome", "chrome"):
+        path = shutil.which(name)
+        if path:
+            return path
+    raise RuntimeError("HTML thumbnails need Chromium or Google Chrome on PATH")
+
+
+def _render_html_page(page, width, out):
+    chrome = _find_chromium()
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "slide.html")
+        with open(src, "w", encoding="utf-8") as f:
+            f.write(page)
+        shot = os.path.join(tmp, "shot.png")
+        subprocess.run(
+            [chrome, "--headless", "--disable-gpu", "--hide-scrollbars",
+             "--force-device-scale-factor=1", f"--user-data-dir={tmp}",
+             f"--window-size={_PX_WIDTH},{_PX_HEIGHT}", f"--screenshot={shot}",
+             "file://" + src],
+            check=True, timeout=RENDER_TIMEOUT, stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE)
+        with Image.open(shot) as img:
+            img.convert("RGB").resize(
+                (width, round(width * _PX_HEIGHT / _PX_WIDTH)),
+                Image.LANCZOS).save(out)
+
+
+def _rasterize(job):
+    """Worker: render one slide to its cache file (written atomically)."""
+    source, arg, index, width, path = job
+    tmp = f"{path}.{os.getpid()}.tmp.png"
+    try:
+        if source == "pdf":
+            _render_pdf_page(arg, index, width, tmp)
+        else:
+            _render_html_page(arg, width, tmp)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return index
+
+
+def contact_sheet(paths, out, cols=6, gap=8):
+    """Paste the thumbnails at `paths` into a numbered grid saved as `out`.
+
+    Returns False, writing nothing, when there are no thumbnails.
+    """
+    if not paths:
+        return False
+    thumbs = [Image.open(p) for p in paths]
+    try:
+        w = max(t.width for t in thumbs)
+        h = max(t.height for t in thumbs)
+        label = 14
+        rows = -(-len(thumbs) // cols)
+        sheet = Image.new("RGB", (cols * (w + gap) + gap,
+                                  rows * (h + label + gap) + gap), "#666666")
+        draw = ImageDraw.Draw(sheet)
+        for i, thumb in enumerate(thumbs):
+            x = gap + (i % cols) * (w + gap)
+            y = gap + (i // cols) * (h + label + gap)
+            sheet.paste(thumb, (x, y + label))
+            draw.text((x, y), str(i + 1), fill="#FFFFFF")
+        sheet.save(out, optimize=True)
+        return True
+    finally:
+        for thumb in thumbs:
+            thumb.close()
+
+
+def build(deck=gp.OUTPUT_FILE, source="pdf", width=320, cols=6, workers=None,
+          cache_dir=CACHE_DIR, profile="default"):
+    """Render missing thumbnails and write the contact sheet and index.
+
+    Returns (index path, number of slides rendered this run).
+    """
+    if source == "pdf":
+        slides, args = pdf_slides(deck, width), None
+    else:
+        slides, args = html_slides(profile, width)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    paths = [os.path.join(cache_dir, f"{key}.png") for _, key in slides]
+    missing = [i for i, path in enumerate(paths) if not os.path.exists(path)]
+    if missing and args is None:
+        import pdf_export
+        pdf, _ = pdf_export.export([deck])[deck]
+        args = [pdf] * len(slides)
+    jobs = [(source, args[i], i, width, paths[i]) for i in missing]
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(_rasterize, jobs))
+
+    stem = os.path.splitext(deck)[0]
+    sheet = f"{stem}.contact.png"
+    if not contact_sheet(paths, sheet, cols):
+        sheet = None
+    rendered = {job[2] for job in jobs}
+    index = {
+        "deck": os.path.abspath(deck),
+        "source": source,
+        "width": width,
+        "contact_sheet": sheet and os.path.abspath(sheet),
+        "slides": [
+            {"slide": i + 1, "title": title, "hash": key,
+             "thumbnail": os.path.abspath(path), "rendered": i in rendered}
+            for i, ((title, key), path) in enumerate(zip(slides, paths))
+        ],
+    }
+    index_path = f"{stem}.thumbs.json"
+    with open(index_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=1)
+    return index_path, len(jobs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("deck", nargs="?", default=gp.OUTPUT_FILE,
+                        help="the .pptx (with --source html: names the outputs)")
+    parser.add_argument("--source", choices=["pdf", "html"], default="pdf")
+    parser.add_argument("--profile", choices=sorted(gp.BUILD_PROFILES),
+                        default="default", help="HTML preview build profile")
+    parser.add_argument("--width", type=int, default=320)
+    parser.add_argument("--cols", type=int, default=6)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    args = parser.parse_args()
+
+    try:
+        index, rendered = build(args.deck, args.source, args.width, args.cols,
+                                args.workers, args.cache_dir, args.profile)
+    except (RuntimeError, subprocess.CalledProcessError) as exc:
+        print(f"Thumbnail stage failed: {exc}", file=sys.stderr)
+        sys.exit(1)
+    print(f"Rendered {rendered} thumbnails; index saved to: {index}")
+
+
+if __name__ == "__main__":
+    main()
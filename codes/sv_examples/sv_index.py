@@ -0,0 +1,241 @@
+"""
+Symbol index of every SystemVerilog example, kept in sqlite
+
+Scans each .sv file under codes/ once and records where modules,
+interfaces, programs, packages, classes, typedefs, functions and tasks
+are declared (file, line and enclosing scope). The index lives in
+Presentations/.sv_index.sqlite and is updated incrementally: a file is
+rescanned only when its mtime or size changed, and files that disappeared
+are dropped. Lookups are a single indexed query, so "where is color_t
+defined?" answers instantly from the CLI; the same index feeds an
+appendix table of the deck.
+
+Usage:
+    python sv_index.py color_t 'math_*'          # update, then look up
+    python sv_index.py --kind class --kind typedef
+    python sv_index.py --rebuild --slides Index.pptx
+"""
+
+import os
+import re
+import sys
+import sqlite3
+import argparse
+
+import generate_pptx as gp
+
+EXAMPLES_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.normpath(os.path.join(EXAMPLES_DIR, ".."))
+DB_FILE = os.path.join(gp.OUTPUT_DIR, ".sv_index.sqlite")
+SKIP_DIRS = {".git", "node_modules", "work", "__pycache__"}
+
+CONTAINERS = {
+    "module": "endmodule", "interface": "endinterface", "program": "endprogram",
+    "package": "endpackage", "class": "endclass",
+}
+ROUTINES = {"function", "task"}
+MODIFIERS = {"automatic", "static", "virtual", "pure", "extern", "local",
+             "protected", "forkjoin"}
+# Kinds listed on the appendix slide; functions and tasks only in lookups.
+APPENDIX_KINDS = ("package", "interface", "module", "program", "class", "typedef")
+
+# Outside a block comment only; inside one, just the next */ counts.
+_STRIP_RE = re.compile(r'//.*|/\*|"(?:[^"\\]|\\.)*"')
+_WORD_RE = re.compile(r"[A-Za-z_][\w$]*|::|[(){}\[\];#]")
+_OPEN = {"(": ")", "[": "]", "{": "}"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY, mtime REAL NOT NULL, size INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS symbols (
+    name TEXT NOT NULL, kind TEXT NOT NULL, path TEXT NOT NULL,
+    line INTEGER NOT NULL, scope TEXT);
+CREATE INDEX IF NOT EXISTS symbols_name ON symbols (name);
+CREATE INDEX IF NOT EXISTS symbols_path ON symbols (path);
+"""
+
+
+def _code_tokens(lines):
+    """Yield (line number, token) with comments and string literals removed."""
+    in_comment = False
+    for number, line in enumerate(lines, 1):
+        pos, code = 0, []
+        while pos < len(line):
+            if in_comment:
+                end = line.find("*/", pos)
+                if end < 0:
+                    break
+                in_comment, pos = False, end + 2
+                continue
+            m = _STRIP_RE.search(line, pos)
+            if m is None:
+                code.append(line[pos:])
+                break
+            code.append(line[pos:m.start()])
+            pos = m.end()
+            in_comment = m.group() == "/*"
+        for m in _WORD_RE.finditer(" ".join(code)):
+            yield number, m.group()
+
+
+def scan(lines):
+    """Yield (kind, name, line, scope) for each declaration in SV source `lines`.
+
+    One pass over the tokens: containers push a scope until their end
+    keyword; a typedef names the last identifier outside brackets before
+    its `;`; a function or task names the identifier before its `(` or `;`.
+    """
+    scopes = []
+    prev = None
+    tokens = _code_tokens(lines)
+    for number, tok in tokens:
+        if tok in CONTAINERS and not (tok == "interface" and prev == "virtual"):
+            kind = tok
+            for _, name in tokens:
+                if name == "class" and kind == "interface":
+                    kind = "class"      # interface class
+                elif name not in MODIFIERS:
+                    break
+            else:
+                return
+            if name in ("(", ";", "#"):
+                prev = name
+                continue
+            yield kind, name, number, scopes[-1][1] if scopes else None
+            scopes.append((CONTAINERS[kind], name))
+        elif scopes and tok == scopes[-1][0]:
+            scopes.pop()
+        elif tok == "typedef":
+            depth, last = 0, None
+            for _, t in tokens:
+                if t in _OPEN:
+                    depth += 1
+                elif t in (")", "]", "}"):
+                    depth -= 1
+                elif t == ";" and depth == 0:
+                    break
+                elif depth == 0 and (t[0].isalpha() or t[0] == "_"):
+                    last = t
+            if last:
+                yield "typedef", last, number, scopes[-1][1] if scopes else None
+        elif tok in ROUTINES and prev not in ("import", "export"):
+            owner, last, before = None, None, None
+            for _, t in tokens:
+                if t in ("(", ";"):
+                    break
+                if t[0].isalpha() or t[0] == "_":
+                    # cls::name defines name in cls; pkg::type_t name does not.
+                    owner = last if before == "::" else None
+                    last = t
+                before = t
+            if last and last != "new":
+                scope = owner or (scopes[-1][1] if scopes else None)
+                yield tok, last, number, scope
+        prev = tok
+
+
+def _source_files(root):
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+        for name in sorted(filenames):
+            if name.endswith((".sv", ".svh")):
+                yield os.path.join(dirpath, name)
+
+
+def connect(db_file=DB_FILE):
+    os.makedirs(os.path.dirname(os.path.abspath(db_file)), exist_ok=True)
+    conn = sqlite3.connect(db_file)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def update(conn, root=ROOT, rebuild=False):
+    """Rescan new or changed files under `root`; return (scanned, unchanged, removed)."""
+    known = {path: (mtime, size) for path, mtime, size
+             in conn.execute("SELECT path, mtime, size FROM files")}
+    scanned = unchanged = 0
+    with conn:
+        if rebuild:
+            conn.execute("DELETE FROM symbols")
+            conn.execute("DELETE FROM files")
+            known = {}
+        for path in _source_files(root):
+            rel = os.path.relpath(path, root).replace(os.sep, "/")
+            st = os.stat(path)
+            stamp = known.pop(rel, None)
+            if stamp == (st.st_mtime, st.st_size):
+                unchanged += 1
+                continue
+            with open(path, encoding="utf-8", errors="replace") as f:
+                rows = [(name, kind, rel, line, scope)
+                        for kind, name, line, scope in scan(f)]
+            conn.execute("DELETE FROM symbols WHERE path = ?", (rel,))
+            conn.executemany("INSERT INTO symbols VALUES (?, ?, ?, ?, ?)", rows)
+            conn.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?)",
+                         (rel, st.st_mtime, st.st_size))
+            scanned += 1
+        for rel in known:
+            conn.execute("DELETE FROM symbols WHERE path = ?", (rel,))
+            conn.execute("DELETE FROM files WHERE path = ?", (rel,))
+    return scanned, unchanged, len(known)
+
+
+def lookup(conn, pattern="*", kinds=None):
+    """Return (name, kind, path, line, scope) rows whose name matches the glob `pattern`."""
+    query = "SELECT name, kind, path, line, scope FROM symbols WHERE name GLOB ?"
+    args = [pattern]
+    if kinds:
+        query += f" AND kind IN ({', '.join('?' * len(kinds))})"
+        args += list(kinds)
+    query += " ORDER BY name, path, line"
+    return conn.execute(query, args).fetchall()
+
+
+def build_slides(prs, conn, start=0, kinds=APPENDIX_KINDS):
+    """Add the "Appendix: Symbol Index" table; return the last slide number."""
+    rows = [[name, kind, scope or "-", f"{path}:{line}"]
+            for name, kind, path, line, scope in lookup(conn, "*", kinds)]
+    files = conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+    sn = start + 1
+    return gp.add_table_slide(prs, "Appendix: Symbol Index",
+                              ["Symbol", "Kind", "Scope", "Defined at"], rows, sn,
+                              f"{len(rows)} declarations in {files} files under codes/")
+    return sn
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("names", nargs="*", help="symbol names or glob patterns")
+    parser.add_argument("--kind", action="append", default=None,
+                        help="restrict to this declaration kind (repeatable)")
+    parser.add_argument("--root", default=ROOT)
+    parser.add_argument("--db", default=DB_FILE)
+    parser.add_argument("--rebuild", action="store_true",
+                        help="rescan every file instead of only changed ones")
+    parser.add_argument("--slides", metavar="PPTX",
+                        help="write the appendix index slides to PPTX")
+    args = parser.parse_args()
+
+    conn = connect(args.db)
+    scanned, unchanged, removed = update(conn, args.root, args.rebuild)
+    print(f"Index: {scanned} scanned, {unchanged} unchanged, {removed} removed",
+          file=sys.stderr)
+
+    for pattern in args.names or ([] if args.slides else ["*"]):
+        rows = lookup(conn, pattern, args.kind)
+        if not rows:
+            print(f"{pattern}: not found", file=sys.stderr)
+        for name, kind, path, line, scope in rows:
+            where = f" in {scope}" if scope else ""
+            print(f"{path}:{line}: {kind} {name}{where}")
+
+    if args.slides:
+        prs = gp.new_presentation()
+        build_slides(prs, conn, kinds=args.kind or APPENDIX_KINDS)
+        prs.save(args.slides)
+        print(f"Index slides saved to: {args.slides} ({len(prs.slides)} slides)")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+"""
+Streaming VCD reader and timing-diagram layout for waveform slides
+
+read_vcd() streams a value change dump line by line and keeps only the
+selected signals inside a time window, as NumPy arrays per signal, so
+memory depends on what is plotted rather than on the size of the dump;
+reading stops at the end of the window. layout_waves() clips the signals
+to the window and coalesces them into segments: repeated values merge into
+one segment, and runs of changes too short to see merge into one "busy"
+segment, so generate_pptx.add_waveform_slide() draws a bounded number of
+native shapes however dense the dump is.
+
+write_stub_vcd() writes a deterministic dump of the Section 4.5 pipeline
+(pipe_a <= 8'hAA; pipe_b <= pipe_a) for trying this out without a
+simulator; --cycles makes it as large as needed.
+
+Usage:
+    python vcd_waves.py dump.vcd -s top.clk -s top.pipe_a --window 0:200
+    python vcd_waves.py --stub stub.vcd --cycles 1000000
+"""
+
+import sys
+import argparse
+from array import array
+
+import numpy as np
+
+# Per-change flags alongside the value.
+KNOWN, UNKNOWN, HIGHZ = 0, 1, 2
+
+_SCALAR = {
+    b"0": (0, KNOWN), b"1": (1, KNOWN),
+    b"x": (0, UNKNOWN), b"X": (0, UNKNOWN),
+    b"z": (0, HIGHZ), b"Z": (0, HIGHZ),
+}
+
+
+class Wave:
+    """Value changes of one signal: times, values and KNOWN/UNKNOWN/HIGHZ flags."""
+
+    def __init__(self, name, width, times, values, flags):
+        self.name = name
+        self.width = width
+        self.times = times
+        self.values = values
+        self.flags = flags
+
+    def __len__(self):
+        return len(self.times)
+
+
+class _Buffer:
+    def __init__(self):
+        self.times = array("q")
+        self.values = array("Q")
+        self.flags = array("B")
+        self.last = None
+
+    def add(self, t, change):
+        if self.times and self.times[-1] == t:
+            # Several changes in one time step: the last one wins.
+            self.times.pop()
+            self.values.pop()
+            self.flags.pop()
+            self.last = (self.values[-1], self.flags[-1]) if self.times else None
+        if change == self.last:
+            return
+        self.last = change
+        self.times.append(t)
+        self.values.append(change[0])
+        self.flags.append(change[1])
+
+
+def _vector(tok):
+    bits = tok[1:]
+    if tok[:1] in b"rR":
+        return 0, UNKNOWN
+    if bits.strip(b"01") == b"":
+        return int(bits, 2) & 0xFFFFFFFFFFFFFFFF, KNOWN
+    if bits.strip(b"zZ") == b"":
+        return 0, HIGHZ
+    return 0, UNKNOWN
+
+
+def read_header(f):
+    """Parse the declarations of the open VCD `f`.
+
+    Returns (timescale, [(id code, hierarchical name, width)]) and leaves
+    `f` positioned at the first value change.
+    """
+    timescale, variables, scopes = "", [], []
+    tokens = []
+    for line in f:
+        tokens.extend(line.split())
+        while b"$end" in tokens:
+            stop = tokens.index(b"$end")
+            keyword, body = tokens[0], tokens[1:stop]
+            tokens = tokens[stop + 1:]
+            if keyword == b"$scope":
+                scopes.append(body[1].decode())
+            elif keyword == b"$upscope":
+                scopes.pop()
+            elif keyword == b"$var":
+                _, width, code, ref = body[:4]
+                variables.append((code, ".".join(scopes + [ref.decode()]),
+                                  int(width)))
+            elif keyword == b"$timescale":
+                timescale = b"".join(body).decode()
+            elif keyword == b"$enddefinitions":
+                return timescale, variables
+    return timescale, variables
+
+
+def read_vcd(path, signals=None, start=None, end=None):
+    """Read the changes of `signals` between `start` and `end` from a VCD.
+
+    `signals` are hierarchical names ("top.clk") or leaf names ("clk");
+    None reads every signal. The value at `start` is recorded as a change
+    at `start`. Vectors wider than 64 bits keep their low 64 bits.
+    Returns (timescale, {name: Wave}).
+    """
+    with open(path, "rb") as f:
+        timescale, variables = read_header(f)
+        wanted = set(signals) if signals else None
+        names, widths, buffers = {}, {}, {}
+        for code, name, width in variables:
+            if wanted is None or name in wanted or name.rsplit(".", 1)[-1] in wanted:
+                names[name] = code
+                widths[name] = width
+                buffers.setdefault(code, _Buffer())
+
+        t = 0
+        pending = {} if start else None
+        vector = None
+        comment = False
+        for line in f:
+            for tok in line.split():
+                if comment:
+                    comment = tok != b"$end"
+                    continue
+                if vector is not None:
+                    # Only decode the bits of signals being kept.
+                    buf = buffers.get(tok)
+                    if buf is not None:
+                        change = _vector(vector)
+                        if pending is not None:
+                            pending[tok] = change
+                        else:
+                            buf.add(t, change)
+                    vector = None
+                    continue
+                c = tok[:1]
+                if c == b"#":
+                    t = int(tok[1:])
+                    if end is not None and t > end:
+                        break
+                    if pending is not None and t >= start:
+                        for code, change in pending.items():
+                            buffers[code].add(start, change)
+                        pending = None
+                elif c in b"bBrR":
+                    vector = tok
+                elif c == b"$":
+                    comment = tok == b"$comment"
+                else:
+                    change = _SCALAR.get(c)
+                    buf = buffers.get(tok[1:])
+                    if change is not None and buf is not None:
+                        if pending is not None:
+                            pending[tok[1:]] = change
+                        else:
+                            buf.add(t, change)
+            else:
+                continue
+            break
+        if pending:
+            # The dump ended before the window started.
+            for code, change in pending.items():
+                buffers[code].add(start, change)
+
+    waves = {}
+    for name, code in names.items():
+        buf = buffers[code]
+        waves[name] = Wave(
+            name, widths[name],
+            np.frombuffer(buf.times, dtype=np.int64),
+            np.frombuffer(buf.values, dtype=np.uint64),
+            np.frombuffer(buf.flags, dtype=np.uint8))
+    return timescale, waves
+
+
+def _label(width, value, flag):
+    if flag == UNKNOWN:
+        return "x"
+    if flag == HIGHZ:
+        return "z"
+    if width == 1:
+        return str(value)
+    return format(value, "X")
+
+
+def layout_waves(waves, start, end, min_frac=0.005):
+    """Coalesce each Wave into drawable segments over [start, end].
+
+    Returns one row per wave: {"name", "width", "segments"}, where a
+    segment is (t0, t1, label) and label None marks a busy run of changes
+    each shorter than min_frac of the window.
+    """
+    min_dt = (end - start) * min_frac
+    rows = []
+    for wave in waves:
+        times = wave.times
+        lo = max(np.searchsorted(times, start, "right") - 1, 0)
+        hi = np.searchsorted(times, end, "left")
+        t = times[lo:hi].copy()
+        values = wave.values[lo:hi]
+        flags = wave.flags[lo:hi]
+        if len(t) == 0 or t[0] > start:
+            # Nothing known before the first change.
+            t = np.concatenate(([start], t))
+            values = np.concatenate(([0], values)).astype(np.uint64)
+            flags = np.concatenate(([UNKNOWN], flags)).astype(np.uint8)
+        t[0] = start
+
+        keep = np.ones(len(t), dtype=bool)
+        keep[1:] = (values[1:] != values[:-1]) | (flags[1:] != flags[:-1])
+        t, values, flags = t[keep], values[keep], flags[keep]
+        ends = np.append(t[1:], end)
+
+        narrow = (ends - t) < min_dt
+        prev_narrow = np.concatenate(([False], narrow[:-1]))
+        group_start = ~narrow | ~prev_narrow
+        firsts = np.flatnonzero(group_start)
+        lasts = np.append(firsts[1:], len(t)) - 1
+
+        segments = []
+        for first, last in zip(firsts, lasts):
+            label = (None if last > first
+                     else _label(wave.width, int(values[first]), flags[first]))
+            segments.append((int(t[first]), int(ends[last]), label))
+        rows.append({"name": wave.name, "width": wave.width, "segments": segments})
+    return rows
+
+
+def write_stub_vcd(path, cycles=20, period=10):
+    """Write a VCD of the 4.5 pipeline: clk, rst_n, pipe_a and pipe_b."""
+    half = period // 2
+    with open(path, "w", encoding="ascii", buffering=1 << 20) as f:
+        f.write("$timescale 1ns $end\n$scope module top $end\n"
+                "$var wire 1 ! clk $end\n$var wire 1 \" rst_n $end\n"
+                "$var reg 8 # pipe_a [7:0] $end\n$var reg 8 $ pipe_b [7:0] $end\n"
+                "$upscope $end\n$enddefinitions $end\n"
+                "#0\n$dumpvars\n0!\n0\"\nbx #\nbx $\n$end\n")
+        pipe_a = pipe_b = None
+        for cycle in range(cycles):
+            t = cycle * period
+            f.write(f"#{t + half}\n1!\n")
+            if cycle == 1:
+                f.write("1\"\n")
+            if cycle >= 1:
+                # Non-blocking: both flops sample before either updates.
+                data = 0xAA if cycle % 4 else cycle & 0xFF
+                pipe_a, pipe_b = data, pipe_a
+                f.write(f"b{pipe_a:b} #\n")
+                if pipe_b is not None:
+                    f.write(f"b{pipe_b:b} $\n")
+            f.write(f"#{t + period}\n0!\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("vcd", nargs="?")
+    parser.add_argument("-s", "--signal", action="append", default=None,
+                        help="signal to plot (repeatable; default: all)")
+    parser.add_argument("--window", default=None, help="START:END in VCD time units")
+    parser.add_argument("--title", default="Waveform")
+    parser.add_argument("-o", "--output", default="waves.pptx")
+    parser.add_argument("--stub", metavar="PATH",
+                        help="write a stub VCD of the 4.5 pipeline and exit")
+    parser.add_argument("--cycles", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.stub:
+        write_stub_vcd(args.stub, args.cycles)
+        print(f"Stub VCD saved to: {args.stub}")
+        return
+    if not args.vcd:
+        parser.error("a VCD file is required")
+
+    start, end = None, None
+    if args.window:
+        start, end = (int(x) for x in args.window.split(":"))
+    timescale, waves = read_vcd(args.vcd, args.signal, start, end)
+    if not waves:
+        print("No matching signals", file=sys.stderr)
+        sys.exit(1)
+    if end is None:
+        end = max(int(w.times[-1]) for w in waves.values() if len(w))
+    start = start or 0
+
+    import generate_pptx as gp
+
+    prs = gp.new_presentation()
+    ordered = [w for n in (args.signal or waves) for w in waves.values()
+               if n in (w.name, w.name.rsplit(".", 1)[-1])]
+    rows = layout_waves(ordered, start, end)
+    digits = timescale.rstrip("afpnumsec ")
+    unit = timescale[len(digits):].strip()
+    if digits not in ("", "1"):
+        unit = f"×{digits}{unit}"
+    gp.add_waveform_slide(prs, args.title, rows, 1, (start, end), unit)
+    prs.save(args.output)
+    print(f"Waveform slide saved to: {args.output} "
+          f"({sum(len(r['segments']) for r in rows)} segments)")
+
+
+if __name__ == "__main__":
+    main()
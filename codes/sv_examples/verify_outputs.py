@@ -0,0 +1,288 @@
+"""
+Check the simulation output printed on code slides against a simulator
+
+Collects the `output` text of every code slide in build_deck(), maps each
+slide to its example .sv files by LRM section (as slide_deps does), runs
+each example once through a simulator command and checks that the values
+the slide claims appear in the normalized transcript. Examples run in
+parallel on a process pool, so the whole deck takes about as long as its
+slowest example, and each transcript is cached under the SHA-256 of the
+simulator command and the source, so unchanged examples are not rerun.
+
+A slide output line is split into comma-separated claims; a claim such
+as "byte 127+1 = -128" or "pop_front: '{2,4,8}" must occur as whole
+tokens (ignoring spacing around punctuation, case and a trailing
+parenthetical remark) in some transcript line, so "size = 3" does not
+match "size = 30". Claims with no value in them, such as "Use = in comb",
+are notes: they are counted (and listed with --json), not checked.
+
+--sim takes a preset (questa, icarus, model) or a shell command with
+{src} and {work} placeholders; "model" runs sched_model.py in-process.
+It only covers the Section 4 subset, so examples outside it are reported
+as unsupported (skipped) rather than as errors.
+
+Usage:
+    python verify_outputs.py                          # Questa, as sim_all.do
+    python verify_outputs.py --sim icarus --json
+    python verify_outputs.py --sim "xrun -sv {src}" --no-cache
+"""
+
+import os
+import re
+import sys
+import json
+import shutil
+import hashlib
+import argparse
+import tempfile
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+
+import generate_pptx as gp
+import slide_deps
+import build_trace
+
+CACHE_DIR = os.path.join(gp.OUTPUT_DIR, ".verify_cache")
+TIMEOUT = 120
+
+SIMULATORS = {
+    "questa": 'vlib work && vlog -sv {src} && vsim -c work.top -do "run -all; quit -f"',
+    "icarus": "iverilog -g2012 -o sim.vvp {src} && vvp -n sim.vvp",
+    "model": "model",
+}
+
+# Simulator chatter that is not part of what the example prints.
+_NOISE_RE = re.compile(
+    r"^(\*\*|Loading |vsim |Reading |Start time|End time|Time: |//|"
+    r"VCD info|Errors: |.*\$finish called|run -all|quit )")
+_CLAIM_RE = re.compile(r"[=:]\s*(-?\d|'\{|[0-9a-fA-FxXzZ]+\b|[A-Z][A-Z_0-9]*\b)|\d|\"")
+_REMARK_RE = re.compile(r"\s*\([^()]*\)$")
+_PUNCT_SPACE_RE = re.compile(r"\s*([^\w\s])\s*")
+_SPACE_RE = re.compile(r"\s+")
+
+
+class OutputCollector:
+    """Stand-in deck that records (slide_num, title, output) of code slides."""
+
+    def __init__(self):
+        self.slides = []
+
+    def add_code_slide(self, title, code, output, slide_num, *args, **kwargs):
+        if output:
+            self.slides.append((slide_num, title, output))
+
+    def __getattr__(self, name):
+        if name.startswith("add_"):
+            return lambda *args, **kwargs: None
+        raise AttributeError(name)
+
+
+def _key(text):
+    text = _PUNCT_SPACE_RE.sub(r"\1", text.strip())
+    return _SPACE_RE.sub(" ", text).lower()
+
+
+def _token_re(claim):
+    """Match `claim` only where it is not part of a longer word or number."""
+    return re.compile((r"(?<!\w)" if claim[:1].isalnum() or claim[:1] == "_" else "")
+                      + re.escape(claim)
+                      + (r"(?!\w)" if claim[-1:].isalnum() or claim[-1:] == "_" else ""))
+
+
+def normalize_transcript(text):
+    """Return the printed lines of a transcript, without prefixes and chatter."""
+    lines = []
+    for line in text.splitlines():
+        if line.startswith("# "):
+            line = line[2:]
+        elif line == "#":
+            continue
+        line = line.strip()
+        if line and not _NOISE_RE.match(line):
+            lines.append(line)
+    return lines
+
+
+def split_claims(line):
+    """Split a slide output line on commas outside brackets and quotes."""
+    parts, depth, start = [], 0, 0
+    for i, ch in enumerate(line):
+        if ch in "([{":
+            depth += 1
+        elif ch in ")]}":
+            depth -= 1
+        elif ch == "," and depth == 0 and line[i + 1:i + 2] in (" ", ""):
+            parts.append(line[start:i].strip())
+            start = i + 1
+    parts.append(line[start:].strip())
+    return [p for p in parts if p]
+
+
+def check_output(output, transcript):
+    """Return (claims checked, claims missing from the `transcript` lines, notes)."""
+    keys = [_key(line) for line in transcript]
+    checked, missing, notes = 0, [], []
+    for line in output.splitlines():
+        line = line.strip().removeprefix("// ")
+        for claim in split_claims(line):
+            if not _CLAIM_RE.search(claim):
+                notes.append(claim)
+                continue
+            checked += 1
+            candidates = {_key(claim), _key(_REMARK_RE.sub("", claim))}
+            if not any(_token_re(c).search(k) for c in candidates if c for k in keys):
+                missing.append(claim)
+    return checked, missing, notes
+
+
+def source_hash(src, command):
+    with open(src, "rb") as f:
+        data = f.read()
+    return hashlib.sha256(command.encode() + b"\0" + data).hexdigest()
+
+
+def simulate(src, command):
+    """Run `src` through `command`; return (status, transcript text).
+
+    status is "ok", "failed", or "unsupported" when the in-process model
+    cannot parse the example (it only covers the Section 4 subset).
+    """
+    if command == "model":
+        import sched_model
+        with open(src, encoding="utf-8") as f:
+            source = f.read()
+        try:
+            sim = sched_model.Simulator(source)
+        except ValueError as e:
+            return "unsupported", str(e)
+        try:
+            sim.run()
+        except Exception as e:
+            return "failed", f"{type(e).__name__}: {e}"
+        return "ok", "\n".join(sim.output)
+    work = tempfile.mkdtemp(prefix="sv_verify_")
+    try:
+        proc = subprocess.run(command.format(src=os.path.abspath(src), work=work),
+                              shell=True, cwd=work, capture_output=True, text=True,
+                              timeout=TIMEOUT)
+        return ("ok" if proc.returncode == 0 else "failed"), proc.stdout + proc.stderr
+    except subprocess.TimeoutExpired as e:
+        return "failed", f"timed out after {TIMEOUT}s\n{e.stdout or ''}"
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+def _run_job(args):
+    src, command, cache = args
+    with build_trace.span("simulate", "sim", src=os.path.basename(src)):
+        status, text = simulate(src, command)
+    if status == "ok" and cache:
+        os.makedirs(os.path.dirname(cache), exist_ok=True)
+        with open(cache, "w", encoding="utf-8") as f:
+            f.write(text)
+    build_trace.flush(f"simulator worker {os.getpid()}")
+    return status, text
+
+
+def run_examples(sources, command, cache_dir=CACHE_DIR, workers=None):
+    """Return {src: (status, transcript text, cache hit)}, simulating misses in parallel."""
+    results, jobs = {}, []
+    for src in sources:
+        cache = (os.path.join(cache_dir, source_hash(src, command) + ".txt")
+                 if cache_dir else None)
+        if cache and os.path.exists(cache):
+            with open(cache, encoding="utf-8") as f:
+                results[src] = ("ok", f.read(), True)
+        else:
+            jobs.append((src, command, cache))
+    if jobs:
+        workers = min(len(jobs), workers or max(os.cpu_count() or 1, 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for (src, _, _), (status, text) in zip(jobs, pool.map(_run_job, jobs)):
+                results[src] = (status, text, False)
+    return results
+
+
+def verify(command, cache_dir=CACHE_DIR, workers=None):
+    """Return one result dict per code slide with printed output."""
+    collector = OutputCollector()
+    with build_trace.span("collect outputs", "sim"):
+        gp.build_deck(collector)
+    index = slide_deps.example_index()
+    sources = {}
+    for slide_num, title, _ in collector.slides:
+        sources[slide_num] = [os.path.join(slide_deps.REPO_ROOT, p)
+                              for p in slide_deps.examples_for_title(title, index)
+                              if p.endswith(".sv")]
+    runs = run_examples(sorted({s for srcs in sources.values() for s in srcs}),
+                        command, cache_dir, workers)
+
+    rows = []
+    for slide_num, title, output in collector.slides:
+        srcs = sources[slide_num]
+        row = {"id": slide_num, "title": title,
+               "examples": [slide_deps._rel(s) for s in srcs],
+               "checked": 0, "missing": [], "notes": [],
+               "cached": all(runs[s][2] for s in srcs)}
+        failed = [s for s in srcs if runs[s][0] == "failed"]
+        unsupported = [s for s in srcs if runs[s][0] == "unsupported"]
+        if not srcs:
+            row["status"] = "no-example"
+        elif failed or unsupported:
+            row["status"] = "error" if failed else "unsupported"
+            tail = runs[(failed or unsupported)[0]][1].strip().splitlines()
+            row["error"] = tail[-1] if tail else "simulator failed"
+        else:
+            transcript = []
+            for s in srcs:
+                transcript += normalize_transcript(runs[s][1])
+            row["checked"], row["missing"], row["notes"] = check_output(output, transcript)
+            row["status"] = "fail" if row["missing"] else "pass"
+        rows.append(row)
+    return rows
+
+
+def format_report(rows):
+    lines = []
+    for row in rows:
+        if row["status"] in ("pass", "fail"):
+            detail = f"{row['checked']} claims"
+            if row["notes"]:
+                detail += f", {len(row['notes'])} notes not checked"
+        else:
+            detail = row.get("error", "")
+        lines.append(f"{row['id']:4d}  {row['status'].upper():11s} "
+                     f"{row['title'][:48]:48s} {detail}")
+        for claim in row["missing"]:
+            lines.append(f"{'':16s}not in transcript: {claim}")
+    counts = {}
+    for row in rows:
+        counts[row["status"]] = counts.get(row["status"], 0) + 1
+    lines.append(", ".join(f"{n} {status}" + (" (skipped)" if status == "unsupported" else "")
+                           for status, n in sorted(counts.items()))
+                 + f" ({len(rows)} code slides with output)")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sim", default="questa",
+                        help="preset (%s) or command with {src}/{work}"
+                             % ", ".join(SIMULATORS))
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--json", action="store_true",
+                        help="print the per-slide rows as JSON")
+    args = parser.parse_args()
+
+    command = SIMULATORS.get(args.sim, args.sim)
+    rows = verify(command, None if args.no_cache else CACHE_DIR, args.workers)
+    if args.json:
+        print(json.dumps(rows, indent=1))
+    else:
+        print(format_report(rows))
+    sys.exit(1 if any(row["status"] in ("fail", "error") for row in rows) else 0)
+
+
+if __name__ == "__main__":
+    main()